@@ -0,0 +1,86 @@
+# ai_scheduler.py
+import time
+from constants import TICK_RATE, AI_LOD_TIERS, AI_TIME_BUDGET_MS, AI_MAX_STEP_FRAMES
+
+
+class AIScheduler:
+    """Spreads enemy AI updates across frames based on distance to the player"""
+
+    def __init__(self, tiers=AI_LOD_TIERS, budget_ms=AI_TIME_BUDGET_MS,
+                 max_step_frames=AI_MAX_STEP_FRAMES):
+        # Tiers are (max distance, update every N frames), nearest first
+        self.tiers = sorted(tiers)
+        self.budget_ms = budget_ms
+        self.max_step_frames = max_step_frames
+        self.frame_delta = 1 / TICK_RATE
+
+        self.frame = 0
+        self.last_update = {}  # Enemy -> frame it was last updated
+        self.next_phase = 0
+
+        # Stats from the last frame, for tuning
+        self.updated_count = 0
+        self.deferred_count = 0
+        self.elapsed_ms = 0.0
+
+    def reset(self):
+        """Forget all enemies, e.g. when a new game starts"""
+        self.frame = 0
+        self.last_update = {}
+        self.next_phase = 0
+
+    def get_tier(self, enemy, target_x, target_y):
+        """Get the (tier index, update interval) for an enemy"""
+        dx = enemy.x + enemy.size/2 - target_x
+        dy = enemy.y + enemy.size/2 - target_y
+        distance_sq = dx*dx + dy*dy
+
+        for index, (max_distance, interval) in enumerate(self.tiers):
+            if distance_sq <= max_distance * max_distance:
+                return index, interval
+        return len(self.tiers) - 1, self.tiers[-1][1]
+
+    def run(self, enemies, target, update_enemy):
+        """Call update_enemy(enemy, delta_time) for every enemy due this frame"""
+        self.frame += 1
+        target_x = target.x + target.size/2
+        target_y = target.y + target.size/2
+
+        # Collect the enemies that are due, keeping state only for live ones
+        last_update = {}
+        due = []
+        for enemy in enemies:
+            tier, interval = self.get_tier(enemy, target_x, target_y)
+            last = self.last_update.get(enemy)
+            if last is None:
+                # Stagger new enemies so each tier's updates spread evenly over frames
+                last = self.frame - 1 - self.next_phase % interval
+                self.next_phase += 1
+            last_update[enemy] = last
+
+            elapsed = self.frame - last
+            if elapsed >= interval:
+                due.append((tier, -elapsed, len(due), enemy))
+
+        # Nearest tiers first, then the most overdue enemies
+        due.sort()
+
+        start = time.perf_counter()
+        budget = self.budget_ms / 1000
+        updated = 0
+        deferred = 0
+        for tier, negative_elapsed, _, enemy in due:
+            # The nearest tier always runs; the rest wait once the budget is spent
+            if tier > 0 and time.perf_counter() - start > budget:
+                deferred += 1
+                continue
+
+            frames = min(-negative_elapsed, self.max_step_frames)
+            update_enemy(enemy, frames * self.frame_delta)
+            last_update[enemy] = self.frame
+            updated += 1
+
+        self.last_update = last_update
+        self.updated_count = updated
+        self.deferred_count = deferred
+        self.elapsed_ms = (time.perf_counter() - start) * 1000
@@ -0,0 +1,249 @@
+# asset_bundle.py
+"""Precompiled asset bundle: images packed as raw pixels in one file
+
+Build or refresh the bundle with:
+
+    python asset_bundle.py
+
+The bundle holds a JSON manifest followed by the pixel data. Each image
+entry records a hash of what it was made from (the file's bytes, or the
+recipe of a generated placeholder), so a rebuild only decodes or redraws
+the images whose source changed. At runtime the file is memory-mapped and
+surfaces are built straight from its buffers, with no decoding. Entries
+made from files also record the file's size and modification time, so an
+image edited since the last build is loaded from its file instead.
+"""
+import hashlib
+import json
+import mmap
+import os
+import struct
+import sys
+import pygame
+from constants import IMAGE_DIR, IMAGE_EXTENSIONS, ASSET_BUNDLE_PATH
+from surface_format import display_ready
+
+# Bump when the file layout changes; older bundles are ignored and rebuilt
+BUNDLE_FORMAT_VERSION = 2
+BUNDLE_MAGIC = b"PGBUNDLE"
+# Magic, format version, manifest length
+_HEADER = struct.Struct("<8sII")
+# Pixel data starts on a multiple of this
+_ALIGN = 16
+
+
+def _aligned(offset):
+    return (offset + _ALIGN - 1) // _ALIGN * _ALIGN
+
+
+def hash_bytes(data):
+    """Get the content hash used for bundle entries"""
+    return hashlib.sha256(data).hexdigest()
+
+
+class AssetBundle:
+    """A memory-mapped bundle file, giving surfaces for the images in it"""
+
+    def __init__(self, path):
+        self.path = path
+        self.file = open(path, "rb")
+        try:
+            self.map = mmap.mmap(self.file.fileno(), 0, access=mmap.ACCESS_READ)
+            magic, version, manifest_length = _HEADER.unpack_from(self.map, 0)
+            if magic != BUNDLE_MAGIC or version != BUNDLE_FORMAT_VERSION:
+                raise ValueError(f"{path} is not a version {BUNDLE_FORMAT_VERSION} asset bundle")
+            manifest = self.map[_HEADER.size:_HEADER.size + manifest_length]
+            self.manifest = json.loads(manifest.decode("utf-8"))
+            self.data_start = _aligned(_HEADER.size + manifest_length)
+            self.current = {}  # Image name -> whether the bundled copy is up to date
+        except Exception:
+            self.close()
+            raise
+
+    @classmethod
+    def open(cls, path=ASSET_BUNDLE_PATH):
+        """Open a bundle, or get None if it's missing or unreadable"""
+        if not os.path.exists(path):
+            return None
+        try:
+            return cls(path)
+        except (OSError, ValueError, struct.error) as e:
+            print(f"Ignoring asset bundle {path}: {e}")
+            return None
+
+    def __contains__(self, name):
+        return name in self.manifest["images"]
+
+    def __len__(self):
+        return len(self.manifest["images"])
+
+    def entry(self, name):
+        """Get the manifest entry for an image, or None"""
+        return self.manifest["images"].get(name)
+
+    def is_current(self, name, path):
+        """Check if a bundled image is up to date with its file (path, or None if there is none)
+
+        Without a file the bundled copy stands - games can ship the bundle
+        alone. A file that changed, or that appeared since a placeholder was
+        bundled, makes it stale. Files that only got a new modification time
+        (e.g. from a fresh checkout) are checked by their hash.
+        """
+        current = self.current.get(name)
+        if current is not None:
+            return current
+        entry = self.manifest["images"][name]
+        if path is None:
+            current = True
+        elif entry["source"] != path:
+            current = False
+        else:
+            try:
+                stat = os.stat(path)
+            except OSError:
+                stat = None
+            if stat is None:
+                current = True
+            elif stat.st_size != entry["file_size"]:
+                current = False
+            elif stat.st_mtime_ns == entry["mtime_ns"]:
+                current = True
+            else:
+                with open(path, "rb") as source:
+                    current = hash_bytes(source.read()) == entry["hash"]
+        if not current:
+            print(f"Asset bundle copy of image '{name}' is out of date, loading {path}")
+        self.current[name] = current
+        return current
+
+    def pixels(self, entry):
+        """Get a read-only view of an entry's raw pixels in the mapped file"""
+        start = self.data_start + entry["offset"]
+        return memoryview(self.map)[start:start + entry["length"]]
+
+    def get_image(self, name):
+        """Build the surface for a bundled image
+
+        The pixels are copied out of the mapping - straight into the
+        display's format once there is a display - so the surface stays
+        valid after the bundle is closed.
+        """
+        entry = self.manifest["images"][name]
+        view = self.pixels(entry)
+        try:
+            surface = pygame.image.frombuffer(view, tuple(entry["size"]), entry["format"])
+            if not display_ready():
+                image = surface.copy()
+            elif entry["format"] == "RGBA":
+                image = surface.convert_alpha()
+            else:
+                image = surface.convert()
+            del surface
+        finally:
+            view.release()
+        return image
+
+    def close(self):
+        """Unmap and close the bundle file"""
+        if getattr(self, "map", None) is not None:
+            self.map.close()
+            self.map = None
+        self.file.close()
+
+
+def _source_files(image_dir, extensions):
+    """Get image name -> file path for every image file, the first extension winning"""
+    files = {}
+    if not os.path.isdir(image_dir):
+        return files
+    for extension in reversed(extensions):
+        for entry in os.scandir(image_dir):
+            if entry.is_file() and entry.name.endswith(extension):
+                files[entry.name[:-len(extension)]] = entry.path
+    return files
+
+
+def compile_bundle(path=ASSET_BUNDLE_PATH, assets=None, image_dir=IMAGE_DIR,
+                   extensions=IMAGE_EXTENSIONS, verbose=True):
+    """Pack every image file and generated placeholder into a bundle file
+
+    Entries whose source hash matches the existing bundle are copied over
+    without being decoded or redrawn. Returns (built, reused, removed)
+    lists of image names.
+    """
+    if assets is None:
+        # Only the placeholder recipes and generators are needed
+        from assets import AssetManager
+        assets = AssetManager(use_bundle=False)
+
+    # Files take precedence over placeholders, as when loading without a bundle
+    sources = {}
+    for name, recipe in assets.generator_recipes.items():
+        sources[name] = (None, hash_bytes(repr(recipe).encode("utf-8")))
+    for name, file_path in _source_files(image_dir, extensions).items():
+        with open(file_path, "rb") as source:
+            sources[name] = (file_path, hash_bytes(source.read()))
+
+    old = AssetBundle.open(path)
+    images = {}
+    blobs = []
+    built, reused = [], []
+    offset = 0
+    try:
+        for name in sorted(sources):
+            file_path, source_hash = sources[name]
+            previous = old.entry(name) if old is not None else None
+            if previous is not None and previous["hash"] == source_hash:
+                entry = dict(previous)
+                data = bytes(old.pixels(previous))
+                reused.append(name)
+            else:
+                if file_path is not None:
+                    surface = pygame.image.load(file_path)
+                else:
+                    surface = assets.generators[name]()
+                pixel_format = "RGBA" if surface.get_flags() & pygame.SRCALPHA else "RGB"
+                data = pygame.image.tobytes(surface, pixel_format)
+                entry = {"source": file_path or "generated", "hash": source_hash,
+                         "size": list(surface.get_size()), "format": pixel_format}
+                built.append(name)
+
+            if file_path is not None:
+                # Lets loading spot files edited after this build
+                stat = os.stat(file_path)
+                entry["mtime_ns"] = stat.st_mtime_ns
+                entry["file_size"] = stat.st_size
+            entry["offset"] = offset
+            entry["length"] = len(data)
+            images[name] = entry
+            blobs.append(data)
+            offset = _aligned(offset + len(data))
+        removed = sorted(set(old.manifest["images"]) - set(images)) if old is not None else []
+    finally:
+        if old is not None:
+            old.close()
+
+    manifest = json.dumps({"images": images}, sort_keys=True).encode("utf-8")
+    data_start = _aligned(_HEADER.size + len(manifest))
+
+    # Write beside the bundle, then swap it in so a failed build leaves the old one
+    temp_path = path + ".tmp"
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    with open(temp_path, "wb") as bundle:
+        bundle.write(_HEADER.pack(BUNDLE_MAGIC, BUNDLE_FORMAT_VERSION, len(manifest)))
+        bundle.write(manifest)
+        for name, data in zip(sorted(sources), blobs):
+            bundle.seek(data_start + images[name]["offset"])
+            bundle.write(data)
+    os.replace(temp_path, path)
+
+    if verbose:
+        print(f"Asset bundle {path}: {len(images)} images, {len(built)} built, "
+              f"{len(reused)} reused, {len(removed)} removed")
+    return built, reused, removed
+
+
+if __name__ == "__main__":
+    pygame.init()
+    compile_bundle(sys.argv[1] if len(sys.argv) > 1 else ASSET_BUNDLE_PATH)
+    pygame.quit()
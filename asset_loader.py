@@ -0,0 +1,62 @@
+# asset_loader.py
+from concurrent.futures import ThreadPoolExecutor
+import pygame
+from constants import ASSET_LOADER_WORKERS
+
+
+def decode_asset(kind, path):
+    """Read and decode an image or sound file; safe off the main thread
+
+    Images come back in the file's own pixel format, since converting them for
+    the display has to happen on the main thread.
+    """
+    if kind == "image":
+        return pygame.image.load(path)
+    if kind == "sound":
+        return pygame.mixer.Sound(path)
+    raise ValueError(f"Unknown asset kind: {kind}")
+
+
+class AssetLoader:
+    """Decodes asset files on a thread pool, keyed by (kind, name)
+
+    The main thread submits files, then collects each result with wait() -
+    which blocks only if the file hasn't finished decoding yet.
+    """
+
+    def __init__(self, workers=ASSET_LOADER_WORKERS):
+        self.workers = workers
+        self.executor = None  # Started on the first submit
+        self.jobs = {}  # (kind, name) -> Future
+
+    def __len__(self):
+        return len(self.jobs)
+
+    def submit(self, kind, name, path):
+        """Start decoding a file in the background, unless it already is"""
+        key = (kind, name)
+        if key in self.jobs:
+            return
+        if self.executor is None:
+            self.executor = ThreadPoolExecutor(self.workers, thread_name_prefix="asset")
+        self.jobs[key] = self.executor.submit(decode_asset, kind, path)
+
+    def pending(self, kind, name):
+        """Check if a file was submitted and not yet collected"""
+        return (kind, name) in self.jobs
+
+    def done(self, kind, name):
+        """Check if a submitted file has finished decoding"""
+        job = self.jobs.get((kind, name))
+        return job is not None and job.done()
+
+    def wait(self, kind, name):
+        """Collect a decoded file, blocking until it's ready; decoding errors are raised here"""
+        return self.jobs.pop((kind, name)).result()
+
+    def shutdown(self):
+        """Stop the worker threads, dropping files not started yet"""
+        if self.executor is not None:
+            self.executor.shutdown(wait=True, cancel_futures=True)
+            self.executor = None
+        self.jobs = {}
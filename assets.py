@@ -1,14 +1,58 @@
 # assets.py
 import pygame
 import os
-from constants import IMAGE_DIR, SOUND_DIR, FONT_DIR
+import time
+from constants import (
+    IMAGE_DIR, SOUND_DIR, FONT_DIR, IMAGE_EXTENSIONS, SOUND_EXTENSIONS,
+    ASSET_FINISH_BUDGET_MS, USE_ASSET_BUNDLE, GLYPH_ATLAS_MIN_HEIGHT
+)
+from asset_loader import AssetLoader
+from asset_bundle import AssetBundle
+from texture_atlas import TextureAtlas, slice_sheet
+from font_registry import font_registry
+from text_cache import TextCache
+from glyph_atlas import GlyphAtlas
+from surface_format import display_ready, display_formats, normalize_surface
+
+# Bump when the placeholder drawing code changes, so asset bundles redraw them
+PLACEHOLDER_VERSION = 1
 
 class AssetManager:
-    def __init__(self):
+    def __init__(self, use_bundle=USE_ASSET_BUNDLE):
         self.images = {}
         self.sounds = {}
         self.fonts = {}
         
+        # Rendered text reused across frames, keyed by font name
+        self.text_cache = TextCache()
+        
+        # Glyph atlases for fast-changing labels, keyed by (font name, color);
+        # False for fonts too small to gain from one
+        self.glyph_atlases = {}
+        
+        # Shown in place of images that don't exist, made on first use
+        self.missing_image = None
+        
+        # Assets are loaded on first use, or ahead of time by prefetch()
+        self.loader = AssetLoader()
+        self.generators = {}  # Image name -> function making its placeholder
+        self.generator_recipes = {}  # Image name -> what its placeholder is made from
+        self.font_specs = {}  # Font name -> (system font name, size)
+        self.paths = {}  # (directory, name) -> file path, or None if there's no file
+        self.outstanding = {}  # (kind, name) prefetched but not finished, in order
+        
+        # Sprite sheets (kept without RLE, since their frames are subsurfaces)
+        # and their sliced frames, keyed by image name
+        self.sheets = {}
+        self.sheet_frames = {}
+        
+        # Sprites packed into atlas pages on request, and the names packed
+        self.atlas = None
+        self.atlas_names = []
+        
+        # Images precompiled into the asset bundle are used before any file
+        self.bundle = AssetBundle.open() if use_bundle else None
+        
         # Create asset directories if they don't exist
         os.makedirs(IMAGE_DIR, exist_ok=True)
         os.makedirs(SOUND_DIR, exist_ok=True)
@@ -18,7 +62,7 @@ class AssetManager:
     
     # Fixed indentation - this should be at the class level, not nested in __init__    
     def _load_default_assets(self):
-        """Load essential game assets on initialization"""
+        """Register the essential game assets, which are made or loaded on first use"""
         # Create placeholder images if files don't exist
         self._ensure_image("player", (50, 50), (0, 0, 255))  # Blue player
         self._ensure_image("background", (800, 600), (50, 50, 50))  # Dark gray background
@@ -28,79 +72,157 @@ class AssetManager:
         self.load_enemy_assets()
         
         # Load default system font instead of custom fonts
-        self.fonts["main"] = pygame.font.SysFont("Arial", 36)
-        self.fonts["title"] = pygame.font.SysFont("Arial", 72)
-        self.fonts["small"] = pygame.font.SysFont("Arial", 24)
-        
-        # Create empty sounds (will be silent)
-        self.sounds["click"] = None
-        self.sounds["game_over"] = None
+        self.font_specs["main"] = ("Arial", 36)
+        self.font_specs["title"] = ("Arial", 72)
+        self.font_specs["small"] = ("Arial", 24)
 
     def _ensure_image(self, name, size, color):
-        """Create a placeholder image if the file doesn't exist"""
-        file_path = os.path.join(IMAGE_DIR, f"{name}.png")
-        try:
-            # Try to load the image if it exists
-            if os.path.exists(file_path):
-                self.images[name] = pygame.image.load(file_path).convert_alpha()
-            else:
-                # Create a placeholder image
-                surf = pygame.Surface(size)
-                surf.fill(color)
-                
-                # Add some visual indication that this is a placeholder
-                if size[0] > 20 and size[1] > 20:
-                    pygame.draw.rect(surf, (255, 255, 255), 
-                                    (5, 5, size[0]-10, size[1]-10), 2)
-                    
-                    # Add text if the image is large enough
-                    if size[0] >= 80 and size[1] >= 20:
-                        font = pygame.font.SysFont("Arial", min(24, size[1]//2))
-                        text = font.render(name, True, (255, 255, 255))
-                        text_rect = text.get_rect(center=(size[0]//2, size[1]//2))
-                        surf.blit(text, text_rect)
-                
-                self.images[name] = surf
-                print(f"Created placeholder for missing image: {name}")
-        except Exception as e:
-            print(f"Error loading image {name}: {e}")
-            # Create a simple colored rectangle as fallback
-            surf = pygame.Surface(size)
-            surf.fill((255, 0, 255))  # Magenta for errors
-            self.images[name] = surf
+        """Register a placeholder image, used if the file doesn't exist"""
+        self.generators[name] = lambda: self._make_placeholder(name, size, color)
+        self.generator_recipes[name] = ("placeholder", PLACEHOLDER_VERSION, name, size, color)
+
+    def _make_placeholder(self, name, size, color):
+        """Create a placeholder image"""
+        surf = pygame.Surface(size)
+        surf.fill(color)
+        
+        # Add some visual indication that this is a placeholder
+        if size[0] > 20 and size[1] > 20:
+            pygame.draw.rect(surf, (255, 255, 255), 
+                            (5, 5, size[0]-10, size[1]-10), 2)
+            
+            # Add text if the image is large enough
+            if size[0] >= 80 and size[1] >= 20:
+                font = font_registry.get("Arial", min(24, size[1]//2))
+                text = font.render(name, True, (255, 255, 255))
+                text_rect = text.get_rect(center=(size[0]//2, size[1]//2))
+                surf.blit(text, text_rect)
+        
+        print(f"Created placeholder for missing image: {name}")
+        return surf
+        
+    def find_file(self, directory, name, extensions):
+        """Get the path of an asset file tried with each extension, or None"""
+        key = (directory, name)
+        if key not in self.paths:
+            self.paths[key] = None
+            for extension in extensions:
+                path = os.path.join(directory, name + extension)
+                if os.path.exists(path):
+                    self.paths[key] = path
+                    break
+        return self.paths[key]
+        
+    def _store_image(self, name, image):
+        """Keep an image, in the display's pixel format once there is a display"""
+        if display_ready():
+            image = normalize_surface(image)
+        self.images[name] = image
+        return image
+        
+    def _error_image(self, name, size=(100, 100)):
+        """Store a magenta stand-in for an image that failed to load"""
+        surf = pygame.Surface(size)
+        surf.fill((255, 0, 255))  # Magenta for errors
+        return self._store_image(name, surf)
             
     def load_image(self, name, path):
         """Load an image and store it with the given name"""
         try:
             if os.path.exists(path):
-                image = pygame.image.load(path).convert_alpha()
-                self.images[name] = image
-                return image
+                image = pygame.image.load(path)
+                if display_ready():
+                    image = image.convert_alpha()
+                return self._store_image(name, image)
             else:
                 print(f"Image file not found: {path}")
                 # Create a placeholder
-                placeholder = pygame.Surface((100, 100))
-                placeholder.fill((255, 0, 255))  # Magenta for missing textures
-                self.images[name] = placeholder
-                return placeholder
+                return self._error_image(name)
         except pygame.error as e:
             print(f"Failed to load image {path}: {e}")
             # Create a placeholder
-            placeholder = pygame.Surface((100, 100))
-            placeholder.fill((255, 0, 255))  # Magenta for missing textures
-            self.images[name] = placeholder
-            return placeholder
+            return self._error_image(name)
+            
+    def _bundled(self, name):
+        """Check if the asset bundle holds an up-to-date copy of an image"""
+        if self.bundle is None or name not in self.bundle:
+            return False
+        return self.bundle.is_current(name, self.find_file(IMAGE_DIR, name, IMAGE_EXTENSIONS))
+        
+    def _load_image(self, name):
+        """Finish, load or make an image on first use, or None if there is none"""
+        if self._bundled(name):
+            # Raw pixels, nothing to decode
+            return self._store_image(name, self.bundle.get_image(name))
+        
+        if self.loader.pending("image", name):
+            # Decoded in the background; only the conversion is left
+            try:
+                image = self.loader.wait("image", name)
+            except (pygame.error, OSError) as e:
+                print(f"Error loading image {name}: {e}")
+                return self._error_image(name)
+            if display_ready():
+                image = image.convert_alpha()
+            return self._store_image(name, image)
+        
+        path = self.find_file(IMAGE_DIR, name, IMAGE_EXTENSIONS)
+        if path is not None:
+            return self.load_image(name, path)
+        
+        generator = self.generators.get(name)
+        if generator is not None:
+            return self._store_image(name, generator())
+        return None
+        
+    def has_image(self, name):
+        """Check if an image exists, loaded or not"""
+        return (name in self.images or name in self.generators or
+                (self.bundle is not None and name in self.bundle) or
+                self.loader.pending("image", name) or
+                self.find_file(IMAGE_DIR, name, IMAGE_EXTENSIONS) is not None)
             
     def get_image(self, name):
-        """Get a loaded image by name"""
-        if name in self.images:
-            return self.images[name]
+        """Get an image by name, loading it on first use"""
+        image = self.images.get(name)
+        if image is None:
+            image = self._load_image(name)
+        if image is not None:
+            return image
         else:
             print(f"Warning: Image '{name}' not found")
-            # Return a placeholder
-            placeholder = pygame.Surface((100, 100))
-            placeholder.fill((255, 0, 255))  # Magenta for missing textures
-            return placeholder
+            # Return a placeholder, shared by every missing image
+            if self.missing_image is None:
+                self.missing_image = pygame.Surface((100, 100))
+                self.missing_image.fill((255, 0, 255))  # Magenta for missing textures
+            return self.missing_image
+            
+    def normalize_images(self, formats=None):
+        """Convert every stored image to the display's pixel format, returning how many changed"""
+        if not display_ready():
+            return 0
+        formats = formats or display_formats()
+        
+        changed = 0
+        for name, image in self.images.items():
+            normalized = normalize_surface(image, formats)
+            if normalized is not image:
+                self.images[name] = normalized
+                changed += 1
+        if self.missing_image is not None:
+            self.missing_image = normalize_surface(self.missing_image, formats)
+        
+        # Sheets are sliced again and the atlas repacked from the converted images
+        for name, (sheet, slicing) in self.sheets.items():
+            self.sheets[name] = (normalize_surface(sheet, formats, rle=False), slicing)
+            self.sheet_frames[name] = slice_sheet(self.sheets[name][0], *slicing)
+        if self.atlas is not None:
+            self.build_atlas(self.atlas_names)
+        
+        # Rendered text is remade lazily in the new format
+        self.text_cache.clear()
+        self.glyph_atlases.clear()
+        return changed
             
     def load_sound(self, name, path):
         """Load a sound and store it with the given name"""
@@ -116,10 +238,34 @@ class AssetManager:
             print(f"Failed to load sound {path}: {e}")
             return None
             
+    def _load_sound(self, name):
+        """Finish or load a sound on first use, or None if there is none"""
+        if self.loader.pending("sound", name):
+            try:
+                sound = self.loader.wait("sound", name)
+            except (pygame.error, OSError) as e:
+                print(f"Failed to load sound {name}: {e}")
+                return None
+            self.sounds[name] = sound
+            return sound
+        
+        path = self.find_file(SOUND_DIR, name, SOUND_EXTENSIONS)
+        if path is not None:
+            return self.load_sound(name, path)
+        return None
+        
+    def has_sound(self, name):
+        """Check if a sound exists, loaded or not"""
+        return (name in self.sounds or self.loader.pending("sound", name) or
+                self.find_file(SOUND_DIR, name, SOUND_EXTENSIONS) is not None)
+            
     def get_sound(self, name):
-        """Get a loaded sound by name"""
-        if name in self.sounds:
-            return self.sounds[name]
+        """Get a sound by name, loading it on first use"""
+        sound = self.sounds.get(name)
+        if sound is None:
+            sound = self._load_sound(name)
+        if sound is not None:
+            return sound
         else:
             print(f"Warning: Sound '{name}' not found")
             return None
@@ -132,78 +278,227 @@ class AssetManager:
             
     def load_font(self, name, path, size):
         """Load a font and store it with the given name"""
+        # Text rendered with a previous font of this name is out of date
+        self.text_cache.forget_font(name)
+        for key in [key for key in self.glyph_atlases if key[0] == name]:
+            del self.glyph_atlases[key]
         try:
             if os.path.exists(path):
-                font = pygame.font.Font(path, size)
+                font = font_registry.font(path, size)
             else:
                 print(f"Font file not found: {path}, using system font")
-                font = pygame.font.SysFont("Arial", size)
+                font = font_registry.get("Arial", size)
             self.fonts[name] = font
             return font
         except pygame.error as e:
             print(f"Failed to load font {path}: {e}")
             # Use system font as fallback
-            font = pygame.font.SysFont("Arial", size)
+            font = font_registry.get("Arial", size)
             self.fonts[name] = font
             return font
             
     def get_font(self, name):
-        """Get a loaded font by name"""
+        """Get a font by name, creating it on first use"""
         if name in self.fonts:
             return self.fonts[name]
+        elif name in self.font_specs:
+            font_name, size = self.font_specs[name]
+            font = self.fonts[name] = font_registry.get(font_name, size)
+            return font
         else:
             print(f"Warning: Font '{name}' not found, using default")
             # Return a default font
-            return pygame.font.SysFont("Arial", 36)
+            return font_registry.get("Arial", 36)
+        
+    def render_text(self, font_name, text, color, antialias=True):
+        """Render text with a named font, reusing the surface from earlier calls"""
+        surface = self.text_cache.get(font_name, text, color, antialias)
+        if surface is None:
+            surface = self.get_font(font_name).render(text, antialias, color)
+            self.text_cache.add(font_name, text, color, antialias, surface)
+        return surface
+        
+    def get_glyph_atlas(self, font_name, color):
+        """Get the glyph atlas for a named font and color, building it on first use
+
+        Returns None for fonts under GLYPH_ATLAS_MIN_HEIGHT, whose labels draw
+        faster from the text cache. The game's own HUD fonts are all under it.
+        """
+        key = (font_name, tuple(color))
+        atlas = self.glyph_atlases.get(key)
+        if atlas is None:
+            # False marks a font too small for an atlas, so it's only checked once
+            font = self.get_font(font_name)
+            if font.get_height() < GLYPH_ATLAS_MIN_HEIGHT:
+                atlas = False
+            else:
+                atlas = GlyphAtlas(font, color)
+            self.glyph_atlases[key] = atlas
+        return atlas or None
+        
+    def load_sprite_sheet(self, name, frame_size, count=None, margin=0, spacing=0):
+        """Get the frames of a sprite sheet image as subsurfaces, slicing it on first use
+
+        The sheet is loaded like any image (see get_image) and cut left to
+        right, top to bottom into frame_size frames.
+        """
+        frames = self.sheet_frames.get(name)
+        if frames is None:
+            # A copy without RLE: subsurfaces of an RLE surface are decoded on every blit
+            sheet = self.get_image(name).copy()
+            if display_ready():
+                sheet = normalize_surface(sheet, rle=False)
+            slicing = (frame_size, count, margin, spacing)
+            self.sheets[name] = (sheet, slicing)
+            frames = self.sheet_frames[name] = slice_sheet(sheet, *slicing)
+        return frames
+        
+    def _atlas_source(self, name):
+        """Get the surface for an atlas name: an image, or "sheet:index" for a sprite sheet frame"""
+        sheet, _, index = name.rpartition(":")
+        if sheet in self.sheet_frames and index.isdigit():
+            return self.sheet_frames[sheet][int(index)]
+        return self.get_image(name)
+        
+    def build_atlas(self, names):
+        """Pack images and sprite sheet frames ("sheet:index") into a new texture atlas, returning its regions
+
+        Regions from an earlier atlas stay drawable, but no longer share pages
+        with the new ones.
+        """
+        names = list(dict.fromkeys(names))
+        atlas = TextureAtlas()
+        atlas.build({name: self._atlas_source(name) for name in names})
+        self.atlas = atlas
+        self.atlas_names = names
+        return atlas.regions
+        
+    def get_region(self, name):
+        """Get the atlas region for an image or sprite sheet frame, repacking the atlas to add it if needed"""
+        if self.atlas is None or name not in self.atlas:
+            self.build_atlas(self.atlas_names + [name])
+        return self.atlas.regions[name]
+        
+    def prefetch(self, manifest):
+        """Start loading a manifest's images, sounds and fonts, returning how many were queued
+
+        Files are decoded on the loader's threads; finish_loaded() then converts
+        them and makes placeholders and fonts on the main thread.
+        """
+        queued = 0
+        for name in manifest.get("images", ()):
+            if name in self.images or ("image", name) in self.outstanding:
+                continue
+            if not self._bundled(name):
+                # Bundled images are built on the main thread; files decode on the loader's
+                path = self.find_file(IMAGE_DIR, name, IMAGE_EXTENSIONS)
+                if path is not None:
+                    self.loader.submit("image", name, path)
+                elif name not in self.generators:
+                    continue  # Nothing to load
+            self.outstanding[("image", name)] = True
+            queued += 1
+        
+        for name in manifest.get("sounds", ()):
+            if name in self.sounds or ("sound", name) in self.outstanding:
+                continue
+            path = self.find_file(SOUND_DIR, name, SOUND_EXTENSIONS)
+            if path is None:
+                continue
+            self.loader.submit("sound", name, path)
+            self.outstanding[("sound", name)] = True
+            queued += 1
+        
+        for name in manifest.get("fonts", ()):
+            if name in self.fonts or name not in self.font_specs:
+                continue
+            self.outstanding[("font", name)] = True
+            queued += 1
+        return queued
+        
+    def finish_loaded(self, budget_ms=ASSET_FINISH_BUDGET_MS):
+        """Finish prefetched assets that are ready, for up to budget_ms, returning how many are left
+
+        Assets are finished in the order they were prefetched, skipping files
+        still being decoded. At least one asset is finished per call when one is ready.
+        """
+        start = time.perf_counter()
+        for kind, name in list(self.outstanding):
+            if self.loader.pending(kind, name) and not self.loader.done(kind, name):
+                continue
+            self._finish(kind, name)
+            if (time.perf_counter() - start) * 1000 >= budget_ms:
+                break
+        return len(self.outstanding)
+        
+    def load_manifest(self, manifest):
+        """Load everything in a manifest now, blocking until it's done"""
+        self.prefetch(manifest)
+        for kind, name in list(self.outstanding):
+            self._finish(kind, name)
+        
+    def _finish(self, kind, name):
+        """Finish a prefetched asset on the main thread, waiting for its file if needed"""
+        if kind == "image":
+            self.get_image(name)
+        elif kind == "sound":
+            self._load_sound(name)
+        else:
+            self.get_font(name)
+        del self.outstanding[(kind, name)]
         
     def load_enemy_assets(self):
-        """Load assets for different enemy types"""
+        """Register assets for different enemy types, made or loaded on first use"""
         from constants import ENEMY_TYPES, ENEMY_COLORS
         
         for enemy_type in ENEMY_TYPES:
             # Generate name like "enemy_basic", "enemy_fast", etc.
+            # (a custom enemy image file is found and loaded before this is used)
             name = f"enemy_{enemy_type}"
-            file_path = os.path.join(IMAGE_DIR, f"{name}.png")
+            self.generators[name] = (lambda enemy_type=enemy_type:
+                                     self._make_enemy_placeholder(enemy_type))
+            self.generator_recipes[name] = ("enemy", PLACEHOLDER_VERSION, enemy_type,
+                                            ENEMY_COLORS.get(enemy_type, (255, 0, 0)))
             
-            # Check if custom enemy image exists
-            if os.path.exists(file_path):
-                self.load_image(name, file_path)
-            else:
-                # Create placeholder with appropriate color
-                color = ENEMY_COLORS.get(enemy_type, (255, 0, 0))  # Default to red
-                size = (40, 40)
-                
-                # Create a more distinctive enemy shape based on type
-                surf = pygame.Surface(size, pygame.SRCALPHA)
-                
-                if enemy_type == "basic":
-                    # Basic enemy: filled circle
-                    pygame.draw.circle(surf, color, (size[0]//2, size[1]//2), size[0]//2)
-                elif enemy_type == "fast":
-                    # Fast enemy: triangle
-                    points = [(size[0]//2, 0), (size[0], size[1]), (0, size[1])]
-                    pygame.draw.polygon(surf, color, points)
-                elif enemy_type == "tank":
-                    # Tank enemy: square with details
-                    pygame.draw.rect(surf, color, (0, 0, size[0], size[1]))
-                    pygame.draw.rect(surf, (0, 0, 0), (size[0]//4, size[1]//4, 
-                                                    size[0]//2, size[1]//2))
-                else:
-                    # Default: diamond shape
-                    points = [(size[0]//2, 0), (size[0], size[1]//2), 
-                            (size[0]//2, size[1]), (0, size[1]//2)]
-                    pygame.draw.polygon(surf, color, points)
-                
-                # Add outline
-                if enemy_type == "basic":
-                    pygame.draw.circle(surf, (255, 255, 255), 
-                                    (size[0]//2, size[1]//2), size[0]//2, 2)
-                elif enemy_type == "fast":
-                    pygame.draw.polygon(surf, (255, 255, 255), points, 2)
-                elif enemy_type == "tank":
-                    pygame.draw.rect(surf, (255, 255, 255), (0, 0, size[0], size[1]), 2)
-                else:
-                    pygame.draw.polygon(surf, (255, 255, 255), points, 2)
-                
-                self.images[name] = surf
-                print(f"Created placeholder for enemy type: {enemy_type}")
+    def _make_enemy_placeholder(self, enemy_type):
+        """Create a placeholder enemy image with a shape for its type"""
+        from constants import ENEMY_COLORS
+        
+        # Create placeholder with appropriate color
+        color = ENEMY_COLORS.get(enemy_type, (255, 0, 0))  # Default to red
+        size = (40, 40)
+        
+        # Create a more distinctive enemy shape based on type
+        surf = pygame.Surface(size, pygame.SRCALPHA)
+        
+        if enemy_type == "basic":
+            # Basic enemy: filled circle
+            pygame.draw.circle(surf, color, (size[0]//2, size[1]//2), size[0]//2)
+        elif enemy_type == "fast":
+            # Fast enemy: triangle
+            points = [(size[0]//2, 0), (size[0], size[1]), (0, size[1])]
+            pygame.draw.polygon(surf, color, points)
+        elif enemy_type == "tank":
+            # Tank enemy: square with details
+            pygame.draw.rect(surf, color, (0, 0, size[0], size[1]))
+            pygame.draw.rect(surf, (0, 0, 0), (size[0]//4, size[1]//4, 
+                                            size[0]//2, size[1]//2))
+        else:
+            # Default: diamond shape
+            points = [(size[0]//2, 0), (size[0], size[1]//2), 
+                    (size[0]//2, size[1]), (0, size[1]//2)]
+            pygame.draw.polygon(surf, color, points)
+        
+        # Add outline
+        if enemy_type == "basic":
+            pygame.draw.circle(surf, (255, 255, 255), 
+                            (size[0]//2, size[1]//2), size[0]//2, 2)
+        elif enemy_type == "fast":
+            pygame.draw.polygon(surf, (255, 255, 255), points, 2)
+        elif enemy_type == "tank":
+            pygame.draw.rect(surf, (255, 255, 255), (0, 0, size[0], size[1]), 2)
+        else:
+            pygame.draw.polygon(surf, (255, 255, 255), points, 2)
+        
+        print(f"Created placeholder for enemy type: {enemy_type}")
+        return surf
@@ -0,0 +1,948 @@
+# benchmark.py
+# Standalone timing checks for the hot paths of the game.
+# Run with: python benchmark.py [name ...]
+import math
+import random
+import sys
+import time
+
+from constants import ENEMY_SIZE, ENEMY_TYPES, ENEMY_GRID_CELL_SIZE
+
+
+def _time_call(func, repeats=3):
+    """Return the best wall time in seconds over several runs of func"""
+    best = float("inf")
+    for _ in range(repeats):
+        start = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def _spawn_enemies(count, density=0.0004):
+    """Spawn enemies over an area that grows with count so density stays constant"""
+    from enemy import Enemy
+
+    side = math.sqrt(count / density)
+    rng = random.Random(1234)
+    enemies = []
+    for _ in range(count):
+        enemy_type = rng.choice(ENEMY_TYPES)
+        x = rng.uniform(0, side - ENEMY_SIZE)
+        y = rng.uniform(0, side - ENEMY_SIZE)
+        enemies.append(Enemy(x, y, enemy_type=enemy_type))
+    return enemies
+
+
+def bench_avoidance(counts=(250, 500, 1000, 2000, 5000), brute_force_limit=1000):
+    """Compare brute-force and grid-based avoidance passes over all enemies"""
+    from spatial_grid import SpatialGrid
+
+    print("Enemy avoidance (one full pass over all enemies)")
+    print(f"{'enemies':>8} {'brute ms':>10} {'grid ms':>10} {'grid us/enemy':>14}")
+
+    for count in counts:
+        enemies = _spawn_enemies(count)
+        grid = SpatialGrid(ENEMY_GRID_CELL_SIZE)
+
+        def grid_pass():
+            grid.rebuild(enemies)
+            for enemy in enemies:
+                neighbours = grid.query(enemy.x + enemy.size/2, enemy.y + enemy.size/2,
+                                        enemy.detection_radius)
+                enemy.calculate_avoidance(neighbours)
+
+        def brute_pass():
+            for enemy in enemies:
+                enemy.calculate_avoidance(enemies)
+
+        grid_time = _time_call(grid_pass)
+        if count <= brute_force_limit:
+            brute_ms = f"{_time_call(brute_pass, repeats=1) * 1000:10.2f}"
+        else:
+            brute_ms = f"{'-':>10}"
+
+        print(f"{count:8d} {brute_ms} {grid_time * 1000:10.2f} "
+              f"{grid_time / count * 1e6:14.2f}")
+
+
+# Largest relative difference allowed between the swarm's and the per-object
+# path's average movement stats
+SWARM_PARITY_TOLERANCE = 0.1
+# Smallest per-frame speedup the swarm must give over the per-object path
+SWARM_TARGET_SPEEDUP = 10
+
+
+def _spawn_on_screen(count, seed=1234):
+    """Spawn enemies across the playfield around a stationary target"""
+    from enemy import Enemy
+    from player import Player
+    from constants import SCREEN_WIDTH, SCREEN_HEIGHT
+
+    target = Player(SCREEN_WIDTH // 2, SCREEN_HEIGHT // 2)
+    rng = random.Random(seed)
+    enemies = []
+    for _ in range(count):
+        enemy_type = rng.choice(ENEMY_TYPES)
+        x = rng.uniform(0, SCREEN_WIDTH - ENEMY_SIZE)
+        y = rng.uniform(0, SCREEN_HEIGHT - ENEMY_SIZE)
+        enemies.append(Enemy(x, y, target=target, enemy_type=enemy_type))
+    return enemies, target
+
+
+def _movement_stats(enemies, start_positions, target, frames):
+    """Summarize how far enemies moved and how close they got to the target"""
+    moved = 0.0
+    to_target = 0.0
+    for enemy, (x, y) in zip(enemies, start_positions):
+        moved += math.hypot(enemy.x - x, enemy.y - y)
+        to_target += math.hypot(enemy.x + enemy.size/2 - target.x - target.size/2,
+                                enemy.y + enemy.size/2 - target.y - target.size/2)
+    return moved / len(enemies) / frames, to_target / len(enemies)
+
+
+def bench_swarm(count=2000, frames=10, repeats=3):
+    """Compare per-object and NumPy swarm enemy updates, with movement stats"""
+    from spatial_grid import SpatialGrid
+    from enemy_swarm import EnemySwarm
+
+    if not EnemySwarm.available():
+        print("Enemy swarm benchmark skipped (numpy not installed)")
+        return
+
+    print(f"Enemy movement ({count} enemies, {frames} frames, best of {repeats} runs)")
+
+    def run_objects():
+        # Per-object path, the same way PlayingState.update runs it
+        enemies, target = _spawn_on_screen(count)
+        start = [(enemy.x, enemy.y) for enemy in enemies]
+        grid = SpatialGrid(ENEMY_GRID_CELL_SIZE)
+        begin = time.perf_counter()
+        for _ in range(frames):
+            grid.rebuild(enemies)
+            for enemy in enemies:
+                enemy.update(enemies, grid=grid)
+                grid.move(enemy, enemy.x + enemy.size/2, enemy.y + enemy.size/2)
+        return (time.perf_counter() - begin) / frames, _movement_stats(enemies, start, target, frames)
+
+    def run_swarm():
+        # Swarm path from the same starting state
+        enemies, target = _spawn_on_screen(count)
+        start = [(enemy.x, enemy.y) for enemy in enemies]
+        swarm = EnemySwarm(seed=1234)
+        swarm.load(enemies)
+        begin = time.perf_counter()
+        for _ in range(frames):
+            swarm.update(enemies, target)
+        return (time.perf_counter() - begin) / frames, _movement_stats(enemies, start, target, frames)
+
+    # Each path keeps its fastest run, like _time_call; the runs alternate so
+    # both paths see the same spells of machine load
+    object_runs = []
+    swarm_runs = []
+    for _ in range(repeats):
+        object_runs.append(run_objects())
+        swarm_runs.append(run_swarm())
+    object_time, object_stats = min(object_runs)
+    swarm_time, swarm_stats = min(swarm_runs)
+
+    print(f"{'path':>8} {'ms/frame':>10} {'px/frame':>10} {'dist to target':>15}")
+    print(f"{'object':>8} {object_time * 1000:10.2f} {object_stats[0]:10.3f} {object_stats[1]:15.1f}")
+    print(f"{'swarm':>8} {swarm_time * 1000:10.2f} {swarm_stats[0]:10.3f} {swarm_stats[1]:15.1f}")
+    speedup = object_time / swarm_time
+    print(f"speedup: {speedup:.1f}x")
+
+    # The swarm must move enemies like the per-object path does; the random
+    # turns differ, so compare the averages within a tolerance
+    for name, object_value, swarm_value in (("px/frame", object_stats[0], swarm_stats[0]),
+                                            ("dist to target", object_stats[1], swarm_stats[1])):
+        difference = abs(swarm_value - object_value) / object_value
+        assert difference <= SWARM_PARITY_TOLERANCE, (
+            f"swarm {name} {swarm_value:.3f} is {difference:.0%} off the per-object "
+            f"{object_value:.3f} (tolerance {SWARM_PARITY_TOLERANCE:.0%})")
+    print(f"parity: within {SWARM_PARITY_TOLERANCE:.0%} of the per-object path")
+    assert speedup >= SWARM_TARGET_SPEEDUP, (
+        f"swarm speedup {speedup:.1f}x is under the {SWARM_TARGET_SPEEDUP}x target")
+
+
+def bench_enemy_memory(count=5000):
+    """Measure per-enemy memory and per-frame rect allocations of Enemy objects"""
+    import tracemalloc
+    import enemy  # Import up front so module setup isn't counted
+
+    print(f"Enemy memory ({count} enemies)")
+
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    enemies = _spawn_enemies(count)
+    created = tracemalloc.get_traced_memory()[0] - before
+
+    # Hold on to one frame's worth of collision rects to see what they cost
+    before = tracemalloc.get_traced_memory()[0]
+    rects = [enemy.get_rect() for enemy in enemies]
+    rect_bytes = max(0, tracemalloc.get_traced_memory()[0] - before - sys.getsizeof(rects))
+    tracemalloc.stop()
+
+    def frame():
+        for enemy in enemies:
+            enemy.update()
+            enemy.get_rect()
+
+    frame_time = _time_call(frame)
+    print(f"bytes per enemy:          {created / count:10.1f}")
+    print(f"rect bytes per frame:     {rect_bytes:10d}")
+    print(f"update + get_rect:        {frame_time / count * 1e9:10.1f} ns/enemy")
+
+
+def bench_collision(projectiles=1000, enemies=1000):
+    """Time one broad phase collision pass for projectiles and enemies"""
+    import pygame
+    from collision import CollisionWorld
+    from constants import (
+        SCREEN_WIDTH, SCREEN_HEIGHT, COLLISION_CELL_SIZE,
+        LAYER_PLAYER, LAYER_ENEMY, LAYER_PROJECTILE
+    )
+
+    rng = random.Random(1234)
+    enemy_rects = [pygame.Rect(rng.uniform(0, SCREEN_WIDTH - 52), rng.uniform(0, SCREEN_HEIGHT - 52),
+                               rng.choice((32, 40, 52)), 0) for _ in range(enemies)]
+    for rect in enemy_rects:
+        rect.height = rect.width
+    projectile_rects = [pygame.Rect(rng.uniform(0, SCREEN_WIDTH), rng.uniform(0, SCREEN_HEIGHT), 5, 5)
+                        for _ in range(projectiles)]
+    player_rect = pygame.Rect(SCREEN_WIDTH // 2, SCREEN_HEIGHT // 2, 50, 50)
+
+    world = CollisionWorld(COLLISION_CELL_SIZE)
+    world.set_mask(LAYER_PROJECTILE, LAYER_ENEMY)
+    world.set_mask(LAYER_PLAYER, LAYER_ENEMY)
+
+    contacts = {}
+
+    def broad_phase():
+        world.clear()
+        world.add(player_rect, player_rect, LAYER_PLAYER)
+        for rect in enemy_rects:
+            world.add(rect, rect, LAYER_ENEMY)
+        for rect in projectile_rects:
+            world.add(rect, rect, LAYER_PROJECTILE)
+        contacts.update(world.find_contacts())
+
+    def brute_force():
+        for projectile in projectile_rects:
+            for enemy in enemy_rects:
+                if enemy.colliderect(projectile):
+                    break
+
+    grid_time = _time_call(broad_phase)
+    brute_time = _time_call(brute_force, repeats=1)
+    print(f"Collision ({projectiles} projectiles, {enemies} enemies)")
+    print(f"brute force loop:  {brute_time * 1000:8.2f} ms")
+    print(f"broad phase pass:  {grid_time * 1000:8.2f} ms "
+          f"({len(contacts[(LAYER_PROJECTILE, LAYER_ENEMY)])} projectile hits)")
+    print(f"60 FPS frame budget: {1000 / 60:6.2f} ms")
+
+
+def bench_projectiles(count=3000, frames=60):
+    """Compare updating and drawing a projectile list against the array buffer"""
+    import pygame
+    from projectile import Projectile
+    from projectile_buffer import ProjectileBuffer
+    from constants import SCREEN_WIDTH, SCREEN_HEIGHT
+
+    if not ProjectileBuffer.available():
+        print("Projectiles: numpy is not installed, skipping")
+        return
+
+    rng = random.Random(1234)
+    shots = [(rng.uniform(0, SCREEN_WIDTH), rng.uniform(0, SCREEN_HEIGHT),
+              rng.uniform(0, SCREEN_WIDTH), rng.uniform(0, SCREEN_HEIGHT))
+             for _ in range(count)]
+    screen = pygame.Surface((SCREEN_WIDTH, SCREEN_HEIGHT))
+
+    def run_list():
+        projectiles = [Projectile(x, y, tx, ty, speed=4) for x, y, tx, ty in shots]
+        for _ in range(frames):
+            live = []
+            for projectile in projectiles:
+                if projectile.update():
+                    continue
+                if (projectile.x < 0 or projectile.x > SCREEN_WIDTH or
+                        projectile.y < 0 or projectile.y > SCREEN_HEIGHT):
+                    continue
+                live.append(projectile)
+            projectiles = live
+            for projectile in projectiles:
+                projectile.draw(screen)
+        return len(projectiles)
+
+    def run_buffer():
+        buffer = ProjectileBuffer(capacity=count)
+        for x, y, tx, ty in shots:
+            buffer.add(Projectile(x, y, tx, ty, speed=4))
+        for _ in range(frames):
+            buffer.update(SCREEN_WIDTH, SCREEN_HEIGHT)
+            buffer.draw(screen)
+        return len(buffer)
+
+    remaining = {}
+    list_time = _time_call(lambda: remaining.update(list=run_list()))
+    buffer_time = _time_call(lambda: remaining.update(buffer=run_buffer()))
+    print(f"Projectiles ({count} fired, {frames} frames)")
+    print(f"object list:  {list_time / frames * 1000:8.2f} ms/frame ({remaining['list']} left)")
+    print(f"array buffer: {buffer_time / frames * 1000:8.2f} ms/frame ({remaining['buffer']} left)")
+    print(f"speedup:      {list_time / buffer_time:8.1f}x")
+
+
+def bench_particles(live=50000, frames=30):
+    """Time emitting, updating and drawing a full particle system"""
+    import pygame
+    from particles import ParticleSystem
+    from constants import SCREEN_WIDTH, SCREEN_HEIGHT
+
+    if not ParticleSystem.available():
+        print("Particles: numpy is not installed, skipping")
+        return
+
+    bursts = live // 20
+    system = ParticleSystem(capacity=live, seed=1234)
+
+    def emit_all():
+        for index in range(bursts):
+            system.emit(index % 800, index % 600, 20, (255, 0, 0), lifetime=(5, 6))
+
+    def update_frames():
+        for _ in range(frames):
+            system.update()
+
+    screen = pygame.Surface((SCREEN_WIDTH, SCREEN_HEIGHT))
+
+    def draw_frames():
+        for _ in range(frames):
+            system.draw(screen)
+
+    emit_time = _time_call(emit_all)
+    system.clear()
+    emit_all()
+    update_time = _time_call(update_frames, repeats=1)
+    cache = system.sprite_cache
+    cache.reset_stats()
+    draw_time = _time_call(draw_frames, repeats=1)
+    print(f"Particles ({live} live, capacity {system.capacity})")
+    print(f"emit {bursts} bursts of 20: {emit_time * 1000:8.2f} ms")
+    print(f"update:                {update_time / frames * 1000:8.2f} ms/frame "
+          f"({len(system)} live, {system.evicted_count} evicted)")
+    print(f"draw:                  {draw_time / frames * 1000:8.2f} ms/frame "
+          f"({len(cache)} sprites, {cache.hits} hits, {cache.misses} misses)")
+    print(f"60 FPS frame budget:   {1000 / 60:8.2f} ms")
+
+
+def bench_surface_pool(frames=90):
+    """Count new scratch surfaces per frame while paused with click indicators"""
+    from game import Game
+    from constants import STATE_PLAYING, STATE_PAUSED
+
+    game = Game()
+    game.set_state(STATE_PLAYING)
+    playing = game.states[STATE_PLAYING]
+    game.set_state(STATE_PAUSED)
+
+    allocations = []
+    for frame in range(frames):
+        # Overlapping indicators keep several growing sizes on screen at once
+        if frame % 10 == 0:
+            playing.create_click_indicator((100 + frame * 5, 300))
+        playing.update_click_indicators()
+        game.draw()
+        allocations.append(game.surface_pool.last_frame_allocations)
+
+    print(f"Surface pool ({frames} paused frames with click indicators)")
+    print(f"new surfaces, first 30 frames: {allocations[:30]}")
+    print(f"total: {game.surface_pool.total_allocations}, "
+          f"after the first indicator faded: {sum(allocations[30:])}")
+
+
+def bench_dirty_rects(enemies=20, frames=120):
+    """Compare full-frame and dirty-rect drawing of the playing state"""
+    from game import Game
+    from constants import STATE_PLAYING
+
+    game = Game()
+    game.set_state(STATE_PLAYING)
+    game.player.health = 10**6
+    game.create_enemies(enemies)
+
+    def run_frames(dirty):
+        game.compositor.enabled = dirty
+        game.compositor.invalidate()
+        partial = 0
+        total = 0.0
+        for _ in range(frames):
+            game.update()
+            start = time.perf_counter()
+            game.draw()
+            total += time.perf_counter() - start
+            if not game.compositor.full and game.compositor.dirty_fraction <= game.compositor.max_fraction:
+                partial += 1
+        return total / frames, partial
+
+    print(f"Dirty rects ({enemies} enemies, {frames} frames)")
+    for fullscreen in (False, True):
+        if fullscreen:
+            game.toggle_fullscreen()
+        full_time, _ = run_frames(False)
+        dirty_time, partial = run_frames(True)
+        size = game.screen.get_size()
+        print(f"{size[0]}x{size[1]} full frames:  {full_time * 1000:8.2f} ms/frame")
+        print(f"{size[0]}x{size[1]} dirty rects:  {dirty_time * 1000:8.2f} ms/frame "
+              f"({partial}/{frames} partial, last dirty share {game.compositor.dirty_fraction:.0%})")
+    game.toggle_fullscreen()
+
+
+def bench_presentation(screen_sizes=((800, 600), (1600, 1200), (1920, 1080), (2560, 1440)), frames=60):
+    """Time presenting a full frame with each presentation mode at several screen sizes"""
+    import pygame
+    from presentation import PRESENTERS, choose_present_mode
+    from constants import (
+        SCREEN_WIDTH, SCREEN_HEIGHT, QUALITY_FAST, QUALITY_SHARP, QUALITY_SMOOTH
+    )
+
+    design_size = (SCREEN_WIDTH, SCREEN_HEIGHT)
+    render_surface = pygame.Surface(design_size)
+    rng = random.Random(1234)
+    for _ in range(200):
+        pygame.draw.circle(render_surface, (rng.randrange(256), rng.randrange(256), rng.randrange(256)),
+                           (rng.randrange(SCREEN_WIDTH), rng.randrange(SCREEN_HEIGHT)), rng.randint(3, 30))
+
+    print(f"Presentation ({frames} frames from {design_size[0]}x{design_size[1]}; "
+          f"'scaled' leaves the scaling to SDL, which isn't timed)")
+    for screen_size in screen_sizes:
+        screen = pygame.Surface(screen_size)
+        timings = []
+        for mode, presenter_class in PRESENTERS.items():
+            presenter = presenter_class()
+            presenter.setup(screen_size, design_size)
+
+            def present():
+                for _ in range(frames):
+                    presenter.present_full(render_surface, screen)
+
+            timings.append(f"{mode} {_time_call(present, repeats=1) / frames * 1000:.2f}")
+        chosen = ", ".join(f"{quality}->{choose_present_mode(quality, screen_size, design_size)}"
+                           for quality in (QUALITY_FAST, QUALITY_SHARP, QUALITY_SMOOTH))
+        print(f"{screen_size[0]}x{screen_size[1]} ms/frame: {', '.join(timings)}  (picks {chosen})")
+
+
+def bench_text_cache(frames=120):
+    """Time menu, HUD and end screen frames with and without the rendered text cache"""
+    from game import Game
+    from constants import STATE_MENU, STATE_PLAYING, STATE_GAME_OVER, TEXT_CACHE_MAX_BYTES
+
+    game = Game()
+    game.player.health = 10**6
+    text_cache = game.assets.text_cache
+
+    def run_frames(state, max_bytes):
+        game.set_state(state)
+        # The menu and end screens draw through a retained panel, which only
+        # renders its text when composed, so compose it every frame
+        if state == STATE_MENU:
+            panel = game.menu.panel
+        else:
+            panel = getattr(game.states[state], "panel", None)
+        text_cache.clear()
+        text_cache.reset_stats()
+        text_cache.max_bytes = max_bytes
+        total = 0.0
+        for _ in range(frames):
+            game.update()
+            game.compositor.invalidate()  # Time whole frames
+            if panel is not None:
+                panel.invalidate()
+            start = time.perf_counter()
+            game.draw()
+            total += time.perf_counter() - start
+        return total / frames
+
+    print(f"Text cache ({frames} frames per state)")
+    for state in (STATE_MENU, STATE_PLAYING, STATE_GAME_OVER):
+        # A zero byte budget keeps nothing, so every string is rendered each frame
+        uncached = run_frames(state, 0)
+        cached = run_frames(state, TEXT_CACHE_MAX_BYTES)
+        print(f"{state:9s} uncached: {uncached * 1000:6.2f} ms/frame, cached: {cached * 1000:6.2f} ms/frame "
+              f"({text_cache.hits} hits, {text_cache.misses} misses, "
+              f"{len(text_cache)} surfaces, {text_cache.bytes / 1024:.1f} KiB)")
+
+
+def bench_glyph_atlas(sizes=(24, 36, 72), updates=5000):
+    """Compare rendering a changing score label with drawing it from a glyph atlas"""
+    import pygame
+    from glyph_atlas import GlyphAtlas
+    from font_registry import font_registry
+
+    pygame.font.init()
+    target = pygame.Surface((800, 600))
+    color = (255, 255, 255)
+
+    print(f"Glyph atlas ({updates} score changes, one draw each)")
+    for size in sizes:
+        font = font_registry.get("Arial", size)
+        atlas = GlyphAtlas(font, color)
+
+        def render():
+            for score in range(updates):
+                target.blit(font.render(f"Score: {score * 10}", True, color), (20, 60))
+
+        def from_atlas():
+            for score in range(updates):
+                atlas.draw(target, f"Score: {score * 10}", (20, 60))
+
+        render_time = _time_call(render, repeats=1) / updates
+        atlas_time = _time_call(from_atlas, repeats=1) / updates
+        print(f"size {size:3d}: render {render_time * 1e6:7.2f} us, "
+              f"atlas {atlas_time * 1e6:7.2f} us ({render_time / atlas_time:.1f}x)")
+
+
+def bench_retained_ui(frames=300):
+    """Compare composing the menu every frame with the retained panel"""
+    from game import Game
+
+    game = Game()
+    menu = game.menu
+    panel = menu.panel
+    # Move over a different button every 30 frames, otherwise hold still
+    positions = [menu.buttons[(frame // 30) % len(menu.buttons)].rect.center for frame in range(frames)]
+
+    def run_frames(retained):
+        redraws = panel.redraw_count
+        start = time.perf_counter()
+        for position in positions:
+            menu.update(position)
+            if not retained:
+                panel.invalidate()
+            menu.draw(game.render_surface)
+        return (time.perf_counter() - start) / frames, panel.redraw_count - redraws
+
+    full_time, full_redraws = run_frames(False)
+    retained_time, retained_redraws = run_frames(True)
+    print(f"Retained UI (menu, {frames} frames, hover change every 30)")
+    print(f"compose every frame: {full_time * 1000:6.3f} ms/frame, {full_redraws} widget draws")
+    print(f"retained panel:      {retained_time * 1000:6.3f} ms/frame, {retained_redraws} widget draws")
+
+
+def bench_render_queue(counts=(1000, 5000), frames=20):
+    """Compare drawing enemies one call at a time with the batched render queue"""
+    import pygame
+    from enemy import SHAPE_DRAWERS
+    from render_queue import RenderQueue
+    from constants import RENDER_LAYER_ENEMY, SCREEN_WIDTH, SCREEN_HEIGHT
+
+    target = pygame.Surface((SCREEN_WIDTH, SCREEN_HEIGHT))
+    queue = RenderQueue(sort_textures=False)
+    rng = random.Random(1234)
+
+    print(f"Render queue ({frames} frames, enemies without images on a {SCREEN_WIDTH}x{SCREEN_HEIGHT} frame)")
+    for count in counts:
+        enemies = _spawn_enemies(count)
+        # Crowd them onto one screen, like a real frame
+        for enemy in enemies:
+            enemy.x = rng.uniform(0, SCREEN_WIDTH - enemy.size)
+            enemy.y = rng.uniform(0, SCREEN_HEIGHT - enemy.size)
+
+        def primitives():
+            # What Enemy.draw used to do: a pygame.draw call per enemy
+            for _ in range(frames):
+                for enemy in enemies:
+                    archetype = enemy.archetype
+                    SHAPE_DRAWERS[archetype.shape](target, archetype.color, enemy.x, enemy.y, enemy.size)
+
+        def per_entity():
+            for _ in range(frames):
+                for enemy in enemies:
+                    enemy.draw(target)
+
+        def batched():
+            for _ in range(frames):
+                queue.submit_many([enemy.get_draw_entry() for enemy in enemies],
+                                  RENDER_LAYER_ENEMY)
+                queue.flush(target)
+
+        def batched_sorted():
+            queue.sort_textures = True
+            batched()
+            queue.sort_textures = False
+
+        timings = [(name, _time_call(func, repeats=1) / (frames * count))
+                   for name, func in (("primitives", primitives), ("per-entity blit", per_entity),
+                                      ("render queue", batched), ("sorted queue", batched_sorted))]
+        print(f"{count:5d} enemies: " +
+              ", ".join(f"{name} {per * 1e6:.2f} us" for name, per in timings) + " per enemy")
+
+
+def bench_transform_cache(count=2000, frames=30):
+    """Compare per-enemy image scaling with the shared transform cache, and time facing rotation"""
+    import pygame
+    import enemy as enemy_module
+    from transform_cache import transform_cache
+    from constants import ENEMY_TYPES
+
+    pygame.display.init()
+    sources = {enemy_type: pygame.Surface((64, 64), pygame.SRCALPHA) for enemy_type in ENEMY_TYPES}
+    enemies = _spawn_enemies(count)
+
+    def scale_each():
+        for enemy in enemies:
+            enemy.image = pygame.transform.scale(sources[enemy.enemy_type], (enemy.size, enemy.size))
+
+    def shared():
+        for enemy in enemies:
+            enemy.set_image(sources[enemy.enemy_type])
+
+    transform_cache.clear()
+    transform_cache.reset_stats()
+    scale_time = _time_call(scale_each, repeats=1)
+    scaled_bytes = sum(e.image.get_width() * e.image.get_height() * e.image.get_bytesize() for e in enemies)
+    shared_time = _time_call(shared, repeats=1)
+    print(f"Transform cache ({count} enemies)")
+    print(f"scale per enemy: {scale_time * 1000:7.2f} ms, {scaled_bytes / 1024:8.1f} KiB of images")
+    print(f"shared cache:    {shared_time * 1000:7.2f} ms, {transform_cache.bytes / 1024:8.1f} KiB "
+          f"({len(transform_cache)} surfaces, {transform_cache.hits} hits, {transform_cache.misses} misses)")
+
+    # Facing lookups every frame as directions change
+    enemy_module.ENEMY_FACE_DIRECTION = True
+    rng = random.Random(1234)
+
+    def facing():
+        for _ in range(frames):
+            for enemy in enemies:
+                enemy.direction = rng.uniform(-math.pi, math.pi)
+                enemy.get_draw_entry()
+
+    transform_cache.reset_stats()
+    facing_time = _time_call(facing, repeats=1)
+    enemy_module.ENEMY_FACE_DIRECTION = False
+    print(f"facing lookups:  {facing_time / (frames * count) * 1e6:7.2f} us per enemy per frame "
+          f"({transform_cache.misses} rotations made, {transform_cache.bytes / 1024:.1f} KiB cached)")
+
+
+def bench_surface_formats(blits=5000, repeats=5):
+    """Time blitting the loaded images before and after display-format normalization"""
+    import pygame
+    from game import Game
+    from surface_format import normalize_surface
+    from constants import STATE_MANIFESTS
+
+    game = Game()
+    for manifest in STATE_MANIFESTS.values():
+        game.assets.load_manifest(manifest)
+    target = game.render_surface
+    rng = random.Random(1234)
+    positions = [(rng.randrange(target.get_width() - 50), rng.randrange(target.get_height() - 50))
+                 for _ in range(blits)]
+
+    print(f"Surface formats ({blits} blits per image onto the render surface)")
+    for name, image in game.assets.images.items():
+        if image.get_width() > 100:
+            continue  # Backgrounds are blitted once a frame
+
+        # A copy like an unconverted load: 24-bit if opaque, alpha without RLE
+        flags = image.get_flags() & pygame.SRCALPHA
+        raw = pygame.Surface(image.get_size(), flags, 32 if flags else 24)
+        raw.blit(image, (0, 0))
+        normalized = normalize_surface(raw.copy())
+
+        def blit_all(surface):
+            target.blits([(surface, position) for position in positions], doreturn=False)
+
+        raw_time = _time_call(lambda: blit_all(raw), repeats) / blits
+        normalized_time = _time_call(lambda: blit_all(normalized), repeats) / blits
+        print(f"{name:12s} raw {raw_time * 1e6:6.2f} us, normalized {normalized_time * 1e6:6.2f} us")
+    game.report_slow_surfaces()
+
+
+def bench_fixed_timestep(enemies=50, seconds=30):
+    """Time stepping the playing state without drawing, against real time"""
+    from game import Game
+    from constants import STATE_PLAYING, TICK_RATE
+
+    game = Game()
+    game.set_state(STATE_PLAYING)
+    game.player.health = 10**6
+    game.create_enemies(enemies)
+
+    ticks = seconds * TICK_RATE
+    start = time.perf_counter()
+    game.step_simulation(ticks)
+    elapsed = time.perf_counter() - start
+    print(f"Fixed timestep ({enemies} enemies, {ticks} ticks at {TICK_RATE}/s)")
+    print(f"simulated {seconds} s in {elapsed:.2f} s ({seconds / elapsed:.0f}x real time, "
+          f"{elapsed / ticks * 1000:.3f} ms per tick)")
+
+def bench_quality_governor(seconds=60):
+    """Feed the quality governor a load spike and show how it steps down and back up"""
+    from quality_governor import QualityGovernor
+    from constants import FPS
+
+    # Work time per frame: light, then a heavy spike, then light again
+    rng = random.Random(1)
+    frames = seconds * FPS
+    spike = range(frames // 4, frames // 2)
+    governor = QualityGovernor(verbose=False)
+    for frame in range(frames):
+        base = 22.0 if frame in spike else 6.0
+        # Lower levels take some of the load off
+        work = base * (1 - 0.2 * governor.index) + rng.uniform(-1.5, 1.5)
+        governor.record(work, now_ms=frame * 1000 / FPS)
+
+    print(f"Quality governor ({seconds} s at {FPS} fps, spike from "
+          f"{spike.start / FPS:.0f} s to {spike.stop / FPS:.0f} s)")
+    for when, old, new, reason in governor.changes:
+        print(f"{when:6.1f} s  {old} -> {new}: {reason}")
+    print(f"{len(governor.changes)} changes, ending at {governor.level['name']}")
+
+def bench_asset_loading(counts=(20, 100), size=256):
+    """Compare loading image files one by one with decoding them on the asset loader's threads"""
+    import os
+    import tempfile
+    import pygame
+    from asset_loader import AssetLoader
+    from constants import ASSET_LOADER_WORKERS
+
+    pygame.init()
+    pygame.display.set_mode((size, size))
+    image = pygame.Surface((size, size), pygame.SRCALPHA)
+    rng = random.Random(1)
+    for _ in range(200):
+        color = (rng.randrange(256), rng.randrange(256), rng.randrange(256), rng.randrange(256))
+        pygame.draw.circle(image, color, (rng.randrange(size), rng.randrange(size)), rng.randrange(4, 40))
+
+    print(f"Asset loading ({size}x{size} PNGs, {ASSET_LOADER_WORKERS} loader threads)")
+    with tempfile.TemporaryDirectory() as directory:
+        for count in counts:
+            paths = [os.path.join(directory, f"image{index}.png") for index in range(count)]
+            for path in paths:
+                pygame.image.save(image, path)
+
+            start = time.perf_counter()
+            for path in paths:
+                pygame.image.load(path).convert_alpha()
+            blocking = time.perf_counter() - start
+
+            # Decode in the background, converting on this thread as files arrive
+            loader = AssetLoader()
+            start = time.perf_counter()
+            for index, path in enumerate(paths):
+                loader.submit("image", index, path)
+            main_thread = 0.0
+            for index in range(count):
+                decoded = loader.wait("image", index)
+                convert_start = time.perf_counter()
+                decoded.convert_alpha()
+                main_thread += time.perf_counter() - convert_start
+            threaded = time.perf_counter() - start
+            loader.shutdown()
+
+            # Main thread time is what a loading screen's frames actually lose
+            print(f"{count:4d} files: one by one {blocking * 1000:7.1f} ms, "
+                  f"threaded {threaded * 1000:7.1f} ms total, "
+                  f"{main_thread * 1000:6.1f} ms of it on the main thread")
+
+def bench_asset_bundle(count=100, size=256):
+    """Compare decoding image files with building them from the memory-mapped bundle, and time rebuilds"""
+    import os
+    import tempfile
+    import pygame
+    from assets import AssetManager
+    from asset_bundle import AssetBundle, compile_bundle
+
+    pygame.init()
+    pygame.display.set_mode((size, size))
+    image = pygame.Surface((size, size), pygame.SRCALPHA)
+    rng = random.Random(1)
+    for _ in range(200):
+        color = (rng.randrange(256), rng.randrange(256), rng.randrange(256), rng.randrange(256))
+        pygame.draw.circle(image, color, (rng.randrange(size), rng.randrange(size)), rng.randrange(4, 40))
+
+    assets = AssetManager(use_bundle=False)
+    print(f"Asset bundle ({count} {size}x{size} PNGs plus {len(assets.generators)} placeholders)")
+    with tempfile.TemporaryDirectory() as directory:
+        names = [f"image{index}" for index in range(count)]
+        for name in names:
+            pygame.image.save(image, os.path.join(directory, name + ".png"))
+        path = os.path.join(directory, "bundle.bin")
+
+        start = time.perf_counter()
+        compile_bundle(path, assets, image_dir=directory, verbose=False)
+        full_build = time.perf_counter() - start
+        # Change one file's contents
+        image.set_at((0, 0), (1, 2, 3, 4))
+        pygame.image.save(image, os.path.join(directory, names[0] + ".png"))
+        start = time.perf_counter()
+        built, reused, _ = compile_bundle(path, assets, image_dir=directory, verbose=False)
+        rebuild = time.perf_counter() - start
+        print(f"full build {full_build * 1000:.1f} ms, rebuild after changing one file "
+              f"{rebuild * 1000:.1f} ms ({len(built)} built, {len(reused)} reused)")
+
+        start = time.perf_counter()
+        for name in names:
+            pygame.image.load(os.path.join(directory, name + ".png")).convert_alpha()
+        decoded = time.perf_counter() - start
+
+        start = time.perf_counter()
+        bundle = AssetBundle(path)
+        for name in names:
+            bundle.get_image(name)
+        bundle.close()
+        mapped = time.perf_counter() - start
+        print(f"load {count} images: decode PNGs {decoded * 1000:.1f} ms, "
+              f"from bundle {mapped * 1000:.1f} ms ({decoded / mapped:.1f}x)")
+
+def bench_texture_atlas(sprites=200, blits=5000, repeats=5):
+    """Compare drawing separate RLE sprites with drawing texture atlas regions, and show packing"""
+    import pygame
+    from texture_atlas import TextureAtlas
+    from render_queue import RenderQueue
+    from surface_format import normalize_surface
+
+    pygame.init()
+    pygame.display.set_mode((800, 600))
+    target = pygame.Surface((800, 600)).convert()
+    rng = random.Random(1)
+
+    # Animation-frame sized sprites with transparent corners
+    surfaces = {}
+    for index in range(sprites):
+        size = rng.randint(24, 64)
+        surface = pygame.Surface((size, size), pygame.SRCALPHA)
+        pygame.draw.circle(surface, (rng.randrange(256), rng.randrange(256), 200),
+                           (size // 2, size // 2), size // 2)
+        surfaces[f"frame{index}"] = normalize_surface(surface)
+
+    start = time.perf_counter()
+    atlas = TextureAtlas()
+    atlas.build(surfaces)
+    build = time.perf_counter() - start
+    separate_bytes = sum(surface.get_pitch() * surface.get_height() for surface in surfaces.values())
+    print(f"Texture atlas ({sprites} sprites, {blits} blits)")
+    print(f"packed into {len(atlas.pages)} page(s) in {build * 1000:.1f} ms, "
+          f"{atlas.fill_ratio():.0%} filled; {atlas.page_bytes() // 1024} KiB of pages vs "
+          f"{separate_bytes // 1024} KiB of pixels in {sprites} surfaces (before RLE copies)")
+
+    names = list(surfaces)
+    draws = [(rng.choice(names), (rng.randrange(740), rng.randrange(540))) for _ in range(blits)]
+    queue = RenderQueue()
+
+    def draw_separate():
+        queue.submit_many([(surfaces[name], position) for name, position in draws], 0)
+        queue.flush(target)
+
+    def draw_regions():
+        for name, position in draws:
+            queue.submit_region(atlas.regions[name], position, 0)
+        queue.flush(target)
+
+    separate = _time_call(draw_separate, repeats)
+    regions = _time_call(draw_regions, repeats)
+    queue.sort_textures = True
+    sorted_regions = _time_call(draw_regions, repeats)
+    print(f"separate RLE sprites {separate * 1000:.2f} ms, atlas regions {regions * 1000:.2f} ms, "
+          f"atlas regions sorted by page {sorted_regions * 1000:.2f} ms")
+
+
+# Makes the font calls the game used to make at startup, then launches the game
+# to its first menu frame, printing the seconds spent on each. argv[1] is
+# "sysfont" or "registry" and argv[2] the font cache file
+_STARTUP_SCRIPT = """
+import sys, time
+start = time.perf_counter()
+import pygame
+pygame.init()
+from font_registry import font_registry
+font_registry.cache_path = sys.argv[2]
+# The baseline sends every font request in the launch, the game's included, to SysFont
+font_registry.use_sysfont = sys.argv[1] == "sysfont"
+
+# The three named fonts, the placeholder labels and the health bar fallback
+calls = [("Arial", 36), ("Arial", 72), ("Arial", 24), ("Arial", 24), ("Arial", 24), ("Arial", 16)]
+fonts_start = time.perf_counter()
+for family, size in calls:
+    font_registry.get(family, size)
+fonts = time.perf_counter() - fonts_start
+
+from game import Game
+from constants import STATE_MENU
+game = Game()
+while game.current_state != STATE_MENU:
+    game.update()
+    game.draw()
+game.draw()
+print(fonts, time.perf_counter() - start)
+"""
+
+
+def bench_font_startup(launches=5):
+    """Time startup font resolution and launch to the first menu frame: SysFont, cold and warm font cache"""
+    import os
+    import statistics
+    import subprocess
+    import tempfile
+
+    env = dict(os.environ)
+    env.setdefault("SDL_VIDEODRIVER", "dummy")
+    env.setdefault("SDL_AUDIODRIVER", "dummy")
+    env["PYGAME_HIDE_SUPPORT_PROMPT"] = "1"
+
+    def launch(mode, cache_path):
+        result = subprocess.run([sys.executable, "-W", "ignore", "-c", _STARTUP_SCRIPT, mode, cache_path],
+                                capture_output=True, text=True, env=env, check=True)
+        return [float(value) for value in result.stdout.strip().splitlines()[-1].split()]
+
+    with tempfile.TemporaryDirectory() as directory:
+        cache_path = os.path.join(directory, "font_cache.json")
+        sysfont = [launch("sysfont", cache_path) for _ in range(launches)]
+        cold = []
+        for _ in range(launches):
+            if os.path.exists(cache_path):
+                os.remove(cache_path)
+            cold.append(launch("registry", cache_path))
+        warm = [launch("registry", cache_path) for _ in range(launches)]
+
+    print(f"Font startup (median of {launches} launches)")
+    for name, times in (("SysFont every call", sysfont), ("registry, cold cache", cold),
+                        ("registry, warm cache", warm)):
+        fonts = statistics.median(fonts for fonts, _ in times)
+        total = statistics.median(total for _, total in times)
+        print(f"{name:22s} fonts {fonts * 1000:7.2f} ms, launch to first menu frame {total * 1000:7.1f} ms")
+
+BENCHMARKS = {
+    "avoidance": bench_avoidance,
+    "swarm": bench_swarm,
+    "enemy_memory": bench_enemy_memory,
+    "collision": bench_collision,
+    "projectiles": bench_projectiles,
+    "particles": bench_particles,
+    "surface_pool": bench_surface_pool,
+    "dirty_rects": bench_dirty_rects,
+    "presentation": bench_presentation,
+    "text_cache": bench_text_cache,
+    "glyph_atlas": bench_glyph_atlas,
+    "retained_ui": bench_retained_ui,
+    "render_queue": bench_render_queue,
+    "transform_cache": bench_transform_cache,
+    "surface_formats": bench_surface_formats,
+    "fixed_timestep": bench_fixed_timestep,
+    "quality_governor": bench_quality_governor,
+    "asset_loading": bench_asset_loading,
+    "asset_bundle": bench_asset_bundle,
+    "texture_atlas": bench_texture_atlas,
+    "font_startup": bench_font_startup,
+}
+
+
+if __name__ == "__main__":
+    names = sys.argv[1:] or list(BENCHMARKS)
+    for name in names:
+        if name not in BENCHMARKS:
+            print(f"Unknown benchmark: {name} (choose from {', '.join(BENCHMARKS)})")
+            continue
+        BENCHMARKS[name]()
+        print()
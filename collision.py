@@ -0,0 +1,167 @@
+# collision.py
+
+
+class CollisionWorld:
+    """Grid broad phase that finds overlapping rects between interacting layers
+
+    Each frame: clear(), add() every body with its rect and layer bit, then
+    find_contacts(). Layers only collide if set_mask() says they interact.
+    """
+
+    def __init__(self, cell_size):
+        self.cell_size = cell_size
+        self.masks = {}  # Layer -> bitmask of layers it collides with
+        self.layer_pairs = []
+        self.layers = {}  # Layer -> {cell: (objects, rects, add orders)}
+        self.body_count = 0
+
+    def set_mask(self, layer, mask):
+        """Set which layers a layer collides with"""
+        self.masks[layer] = mask
+
+        # Rebuild the list of (layer_a, layer_b) pairs to test, each only once
+        pairs = []
+        for layer_a, layer_mask in sorted(self.masks.items()):
+            bit = 1
+            while bit <= layer_mask:
+                if layer_mask & bit and (bit, layer_a) not in pairs:
+                    pairs.append((layer_a, bit))
+                bit <<= 1
+        self.layer_pairs = pairs
+
+    def clear(self):
+        """Remove every body"""
+        self.layers = {}
+        self.body_count = 0
+
+    def add(self, obj, rect, layer):
+        """Add a body to every grid cell its rect overlaps"""
+        size = self.cell_size
+        order = self.body_count
+        self.body_count += 1
+
+        cells = self.layers.get(layer)
+        if cells is None:
+            cells = self.layers[layer] = {}
+
+        left = rect.left // size
+        right = (rect.right - 1) // size
+        top = rect.top // size
+        bottom = (rect.bottom - 1) // size
+        for cx in range(left, right + 1):
+            for cy in range(top, bottom + 1):
+                bucket = cells.get((cx, cy))
+                if bucket is None:
+                    cells[(cx, cy)] = ([obj], [rect], [order])
+                else:
+                    bucket[0].append(obj)
+                    bucket[1].append(rect)
+                    bucket[2].append(order)
+
+    def find_contacts(self):
+        """Get overlapping bodies as {(layer_a, layer_b): [(obj_a, obj_b), ...]}
+
+        Each pair is reported once, even when both bodies span several cells,
+        and pairs are sorted by the order bodies were added.
+        """
+        size = self.cell_size
+        contacts = {}
+
+        for layer_pair in self.layer_pairs:
+            found = []
+            cells_a = self.layers.get(layer_pair[0])
+            cells_b = self.layers.get(layer_pair[1])
+            if cells_a and cells_b:
+                same_layer = cells_a is cells_b
+                for (cx, cy), (objs_a, rects_a, order_a) in cells_a.items():
+                    bucket_b = cells_b.get((cx, cy))
+                    if bucket_b is None:
+                        continue
+
+                    objs_b, rects_b, order_b = bucket_b
+                    for index_a, rect_a in enumerate(rects_a):
+                        for index_b in rect_a.collidelistall(rects_b):
+                            if same_layer and index_b <= index_a:
+                                continue
+
+                            # Report the pair only in the cell holding the top-left
+                            # corner of the overlap, so it's never found twice
+                            rect_b = rects_b[index_b]
+                            if (max(rect_a.left, rect_b.left) // size != cx or
+                                    max(rect_a.top, rect_b.top) // size != cy):
+                                continue
+
+                            found.append((order_a[index_a], order_b[index_b],
+                                          objs_a[index_a], objs_b[index_b]))
+
+            # Orders are unique per pair, so the objects are never compared
+            found.sort()
+            contacts[layer_pair] = [(obj_a, obj_b) for _, _, obj_a, obj_b in found]
+        return contacts
+
+
+def segment_hit_time(start_x, start_y, end_x, end_y, left, top, right, bottom):
+    """Get the earliest time in [0, 1] a point moving along a segment is inside a box
+
+    Uses the slab method; returns None if the segment misses the box.
+    """
+    t_enter = 0.0
+    t_exit = 1.0
+
+    for start, end, low, high in ((start_x, end_x, left, right),
+                                  (start_y, end_y, top, bottom)):
+        delta = end - start
+        if delta == 0:
+            # Moving parallel to this slab - must already be between its sides
+            if start < low or start > high:
+                return None
+            continue
+
+        t_low = (low - start) / delta
+        t_high = (high - start) / delta
+        if t_low > t_high:
+            t_low, t_high = t_high, t_low
+        if t_low > t_enter:
+            t_enter = t_low
+        if t_high < t_exit:
+            t_exit = t_high
+        if t_enter > t_exit:
+            return None
+
+    return t_enter
+
+
+def sweep_contacts(contacts, get_segment=None):
+    """Narrow phase for moving bodies against boxes, in one pass over all candidates
+
+    contacts is a list of (mover, other) pairs from the broad phase, where each
+    mover has get_segment() -> (start x, start y, end x, end y, half size) and each
+    other has get_rect(). Movers that aren't objects (e.g. buffer slots) can pass
+    get_segment(mover) instead. Returns [(mover, [other, ...])] in first-seen mover order,
+    with each mover's hits sorted by time of impact (earliest first).
+    """
+    hits = {}
+    for order, (mover, other) in enumerate(contacts):
+        if get_segment is None:
+            start_x, start_y, end_x, end_y, half_size = mover.get_segment()
+        else:
+            start_x, start_y, end_x, end_y, half_size = get_segment(mover)
+        rect = other.get_rect()
+
+        # Grow the box by the mover's half size so the mover can be treated as a point
+        hit_time = segment_hit_time(start_x, start_y, end_x, end_y,
+                                    rect.left - half_size, rect.top - half_size,
+                                    rect.right + half_size, rect.bottom + half_size)
+        if hit_time is None:
+            continue
+
+        mover_hits = hits.get(mover)
+        if mover_hits is None:
+            mover_hits = hits[mover] = []
+        mover_hits.append((hit_time, order, other))
+
+    result = []
+    for mover, mover_hits in hits.items():
+        mover_hits.sort(key=lambda hit: (hit[0], hit[1]))
+        result.append((mover, [other for _, _, other in mover_hits]))
+    return result
@@ -0,0 +1,142 @@
+# compositor.py
+import pygame
+from constants import DIRTY_TILE_SIZE, DIRTY_MAX_FRACTION
+
+# NumPy is optional - only needed by mark_points for array-backed effects
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+
+class Compositor:
+    """Redraws and presents only the parts of the frame that changed
+
+    Each frame: begin_frame(), draw with draw_background() first and mark()
+    every other area drawn, then end_frame() gives the dirty rects to present,
+    or None when the whole frame should be presented.
+    """
+
+    def __init__(self, width, height, tile_size=DIRTY_TILE_SIZE, max_fraction=DIRTY_MAX_FRACTION):
+        self.bounds = pygame.Rect(0, 0, width, height)
+        self.tile_size = tile_size
+        self.max_fraction = max_fraction  # Dirty share of the frame before a full redraw
+        self.enabled = True
+
+        # Cached static background
+        self.background = pygame.Surface((width, height))
+        self.background.fill((0, 0, 0))
+
+        self.full = True  # Drawing the whole frame this frame
+        self.valid = False  # Last frame's rects cover everything drawn over the background
+        self.rects = []  # Areas drawn this frame
+        self.previous_rects = []  # Areas drawn last frame
+
+        # Stats from the last frame, for tuning
+        self.dirty_fraction = 1.0
+        self.dirty_rect_count = 0
+
+    def set_background(self, surface):
+        """Cache the static background, drawn at the top-left over black"""
+        self.background.fill((0, 0, 0))
+        if surface is not None:
+            self.background.blit(surface, (0, 0))
+        self.invalidate()
+
+    def invalidate(self):
+        """Force the next frame to be drawn and presented in full"""
+        self.valid = False
+
+    def begin_frame(self, tracked=True):
+        """Start a frame; untracked frames (states that don't mark rects) are always full"""
+        self.full = not (self.enabled and tracked and self.valid)
+        self.valid = tracked
+        self.rects = []
+
+    def draw_background(self, target):
+        """Draw the background, or just restore it under last frame's rects"""
+        if self.full:
+            target.blit(self.background, (0, 0))
+        else:
+            background = self.background
+            target.blits([(background, rect, rect) for rect in self.previous_rects],
+                         doreturn=False)
+
+    def mark(self, rect):
+        """Record an area drawn over the background this frame"""
+        self.rects.append(pygame.Rect(rect))
+
+    def mark_all(self, rects):
+        """Record several drawn areas"""
+        self.rects.extend(pygame.Rect(rect) for rect in rects)
+
+    def mark_points(self, xs, ys, radius):
+        """Record the areas of many small sprites centered on NumPy coordinate arrays
+
+        Points are grouped into tiles so thousands of sprites add at most a
+        few hundred rects.
+        """
+        if len(xs) == 0:
+            return
+        tile = self.tile_size
+        # Off-screen points are pulled onto the edge tiles, which their sprites may overlap
+        columns = np.clip(np.asarray(xs), 0, self.bounds.width - 1) // tile
+        rows = np.clip(np.asarray(ys), 0, self.bounds.height - 1) // tile
+        tiles = np.unique(rows.astype(np.int64) * 65536 + columns.astype(np.int64))
+        margin = int(radius) + 1
+        Rect = pygame.Rect
+        self.rects.extend(Rect((code % 65536) * tile - margin, (code // 65536) * tile - margin,
+                               tile + margin * 2, tile + margin * 2)
+                          for code in tiles.tolist())
+
+    def end_frame(self):
+        """Finish a frame, returning the dirty rects to present or None for the whole frame"""
+        rects = self.rects
+        dirty = self.previous_rects + rects
+        self.previous_rects = rects
+
+        if self.full:
+            self.dirty_fraction = 1.0
+            self.dirty_rect_count = 0
+            return None
+
+        dirty_rects, area = self._merge(dirty)
+        self.dirty_fraction = area / (self.bounds.width * self.bounds.height)
+        self.dirty_rect_count = len(dirty_rects)
+        if self.dirty_fraction > self.max_fraction:
+            return None
+        return dirty_rects
+
+    def _merge(self, rects):
+        """Snap rects to tiles and merge tiles into horizontal runs, returning (rects, area)"""
+        tile = self.tile_size
+        bounds = self.bounds
+        tiles = set()
+        for rect in rects:
+            rect = rect.clip(bounds)
+            if rect.width <= 0 or rect.height <= 0:
+                continue
+            columns = range(rect.left // tile, (rect.right - 1) // tile + 1)
+            for row in range(rect.top // tile, (rect.bottom - 1) // tile + 1):
+                for column in columns:
+                    tiles.add((row, column))
+
+        merged = []
+        area = 0
+        run = None
+        for row, column in sorted(tiles):
+            if run is not None and run[0] == row and run[2] == column:
+                run[2] += 1
+                continue
+            if run is not None:
+                merged.append(run)
+            run = [row, column, column + 1]
+        if run is not None:
+            merged.append(run)
+
+        dirty_rects = []
+        for row, start, end in merged:
+            rect = pygame.Rect(start * tile, row * tile, (end - start) * tile, tile).clip(bounds)
+            area += rect.width * rect.height
+            dirty_rects.append(rect)
+        return dirty_rects, area
@@ -1,3 +1,5 @@
+import math
+
 #Initialize Display
 #Game settings
 SCREEN_WIDTH = 800
@@ -13,6 +15,139 @@ PLAYER_SPEED = 5
 ENEMY_SIZE = 40
 ENEMY_SPEED = 1
 
+#Spatial grid used for enemy neighbour lookups
+#Cells are as wide as the largest detection radius (tank size * 2)
+ENEMY_GRID_CELL_SIZE = int(ENEMY_SIZE * 1.3) * 2
+
+#Move enemies with the NumPy swarm engine instead of per-object updates
+#(ignored if numpy is not installed)
+USE_ENEMY_SWARM = False
+
+#Steer chasing enemies with a shared flow field toward the player
+#instead of a straight line (pays off once there are obstacles)
+USE_FLOW_FIELD = False
+FLOW_FIELD_CELL_SIZE = 25
+
+#Enemy AI level of detail: (max distance to player, update every N frames)
+#Enemies updated less often get a proportionally longer time step
+AI_LOD_TIERS = [(300, 1), (600, 2), (float("inf"), 3)]
+#Milliseconds of enemy AI per frame before distant enemies are deferred
+AI_TIME_BUDGET_MS = 6
+#Longest time step (in frames) a deferred enemy may catch up in one update
+AI_MAX_STEP_FRAMES = 8
+
+#Collision layers (bit flags) and broad phase cell size
+LAYER_PLAYER = 1
+LAYER_ENEMY = 2
+LAYER_PROJECTILE = 4
+LAYER_PLAYER_ATTACK = 8
+COLLISION_CELL_SIZE = 64
+
+#Keep projectiles in a fixed-size NumPy buffer instead of a list of objects
+#(ignored if numpy is not installed)
+USE_PROJECTILE_BUFFER = False
+PROJECTILE_CAPACITY = 4096
+#Who fired a projectile
+PROJECTILE_OWNER_PLAYER = 0
+PROJECTILE_OWNER_ENEMY = 1
+
+#Most particles alive at once; past this, new particles replace the oldest
+PARTICLE_CAPACITY = 50000
+
+#Cached fading-circle sprites: most kept, and alpha steps per sprite
+SPRITE_CACHE_SIZE = 512
+SPRITE_ALPHA_LEVELS = 16
+
+#Spare scratch surfaces kept per (size, flags) between frames
+SURFACE_POOL_MAX_FREE = 16
+
+#Redraw and present only changed areas of the frame (dirty rectangles),
+#tracked in tiles of this size; past this share of the frame, redraw it all
+USE_DIRTY_RECTS = True
+DIRTY_TILE_SIZE = 32
+DIRTY_MAX_FRACTION = 0.5
+
+#Fixed-timestep simulation: ticks per second (player and projectile speeds
+#are per tick), the most ticks run in one frame to catch up, and whether
+#drawing interpolates positions between the last two ticks
+TICK_RATE = FPS
+MAX_CATCH_UP_TICKS = 5
+INTERPOLATE_RENDERING = True
+
+#Print surfaces left in slow pixel formats each time they are normalized
+#for the display (at startup and after toggling fullscreen)
+REPORT_SLOW_SURFACES = False
+
+#Render queue layers, drawn lowest first
+RENDER_LAYER_PROJECTILE = 0
+RENDER_LAYER_PLAYER = 1
+RENDER_LAYER_ENEMY = 2
+#Sort each layer by surface before blitting; pygame's software blitter
+#gains nothing from it, but a GPU-backed renderer would
+RENDER_QUEUE_SORT_TEXTURES = False
+
+#Presentation modes for getting the render surface onto the screen
+PRESENT_NATIVE = "native"    # 1:1, no scaling
+PRESENT_SCALED = "scaled"    # pygame.SCALED, SDL scales the display
+PRESENT_INTEGER = "integer"  # Nearest-neighbour by a whole-number factor
+PRESENT_SMOOTH = "smooth"    # Bilinear smoothscale to fill the screen
+#Presentation quality: the cheapest mode meeting it is used
+QUALITY_FAST = "fast"      # Cheapest, may leave wider borders
+QUALITY_SHARP = "sharp"    # Whole pixels only
+QUALITY_SMOOTH = "smooth"  # Fill the screen with filtered scaling
+PRESENT_QUALITY = QUALITY_SMOOTH
+
+#Adaptive quality: step down through QUALITY_LEVELS when the given percentile
+#of recent frame times (work time, not counting the frame-rate wait) goes over
+#the lower threshold, and back up once it stays under the raise threshold.
+#The gap between thresholds and the longer wait before raising keep the level
+#from flipping back and forth
+ADAPTIVE_QUALITY = True
+QUALITY_WINDOW_FRAMES = 120
+QUALITY_PERCENTILE = 95
+QUALITY_LOWER_MS = 1000 / FPS * 0.9
+QUALITY_RAISE_MS = 1000 / FPS * 0.5
+QUALITY_LOWER_COOLDOWN_FRAMES = 120
+QUALITY_RAISE_COOLDOWN_FRAMES = 600
+#Quality levels, best first: share of particles emitted per effect, most
+#particles alive, presentation quality and whether clicks leave indicators
+QUALITY_LEVELS = [
+    {"name": "high", "particle_scale": 1.0, "particle_cap": PARTICLE_CAPACITY,
+     "present_quality": PRESENT_QUALITY, "click_indicators": True},
+    {"name": "medium", "particle_scale": 0.5, "particle_cap": 10000,
+     "present_quality": PRESENT_QUALITY, "click_indicators": True},
+    {"name": "low", "particle_scale": 0.25, "particle_cap": 2000,
+     "present_quality": QUALITY_SHARP, "click_indicators": False},
+    {"name": "lowest", "particle_scale": 0.1, "particle_cap": 500,
+     "present_quality": QUALITY_FAST, "click_indicators": False},
+]
+
+#Most memory (bytes) kept by the shared scaled/rotated sprite cache, and the
+#number of rotation buckets per full turn
+TRANSFORM_CACHE_MAX_BYTES = 16 * 1024 * 1024
+TRANSFORM_ANGLE_STEPS = 32
+#Rotate enemy sprites to face their movement direction (art faces up)
+ENEMY_FACE_DIRECTION = False
+ENEMY_SPRITE_FORWARD_DEGREES = -90
+
+#Texture atlas page size and the gap left between packed sprites. In pygame's
+#software renderer, blitting a region out of a page is slower than blitting an
+#RLE encoded sprite of its own, so the atlas is for sprites where fewer, larger
+#surfaces matter more, e.g. many small animation frames
+ATLAS_PAGE_SIZE = (1024, 1024)
+ATLAS_PADDING = 1
+
+#Most memory (bytes) kept by the rendered text cache
+TEXT_CACHE_MAX_BYTES = 4 * 1024 * 1024
+
+#Characters pre-rendered into each HUD glyph atlas
+GLYPH_ATLAS_CHARSET = ("0123456789 :.,-+/%!()"
+                       "abcdefghijklmnopqrstuvwxyzABCDEFGHIJKLMNOPQRSTUVWXYZ")
+
+#Smallest font line height (pixels) drawn from a glyph atlas; below it one
+#cached surface per label blits faster than a blit per glyph
+GLYPH_ATLAS_MIN_HEIGHT = 48
+
 #Preset colors
 WHITE = (255, 255, 255)
 RED = (255, 0, 0)
@@ -25,6 +160,7 @@ STATE_PLAYING= "PLAYING"
 STATE_PAUSED = "PAUSED"
 STATE_GAME_OVER = "GAME_OVER"
 STATE_VICTORY = "VICTORY"
+STATE_LOADING = "LOADING"
 
 #Asset paths
 ASSET_DIR = "assets"
@@ -32,6 +168,39 @@ IMAGE_DIR = f"{ASSET_DIR}/images"
 SOUND_DIR = f"{ASSET_DIR}/sounds"
 FONT_DIR = f"{ASSET_DIR}/fonts"
 
+#Asset loading: threads decoding files, the file types tried for each asset
+#name, and milliseconds per frame the loading screen spends finishing assets
+#(display conversion and fonts) on the main thread
+ASSET_LOADER_WORKERS = 4
+IMAGE_EXTENSIONS = (".png", ".jpg", ".bmp")
+SOUND_EXTENSIONS = (".wav", ".ogg")
+ASSET_FINISH_BUDGET_MS = 8
+
+#Where the system font files found for family names are remembered between
+#launches (delete it to look fonts up again after installing new ones)
+FONT_CACHE_PATH = f"{ASSET_DIR}/font_cache.json"
+
+#Precompiled asset bundle (built with `python asset_bundle.py`): images and
+#generated placeholders as raw pixels, memory-mapped at startup. Images not
+#in it are loaded from their files as usual
+USE_ASSET_BUNDLE = True
+ASSET_BUNDLE_PATH = f"{ASSET_DIR}/bundle.bin"
+
+#Assets prefetched behind the loading screen before entering each state;
+#anything missing from these is still loaded on first use
+STATE_MANIFESTS = {
+    STATE_MENU: {
+        "images": ["menu_bg"],
+        "sounds": ["click", "menu_music"],
+        "fonts": ["title", "main"]
+    },
+    STATE_PLAYING: {
+        "images": ["player", "background", "enemy_basic", "enemy_fast", "enemy_tank"],
+        "sounds": ["shoot", "game_music", "game_over", "victory"],
+        "fonts": ["small", "main", "title"]
+    }
+}
+
 #UI settings
 MENU_BG_COLOR = (25, 25, 50)
 MENU_TEXT_COLOR = WHITE
@@ -53,3 +222,27 @@ ENEMY_COLORS = {
     "fast": (255, 165, 0),     # Orange
     "tank": (128, 0, 128)      # Purple
 }
+
+# Enemy archetype stats, shared by every enemy of a type
+# size and speed are multipliers of ENEMY_SIZE and ENEMY_SPEED,
+# turn_chance is per frame and turn_range is the max random turn in radians,
+# shape is what Enemy.draw falls back to without an image
+ENEMY_ARCHETYPES = {
+    "basic": {
+        "size": 1.0, "speed": 1.0, "health": 100, "chase_weight": 0.3,
+        "damage": 10, "score": 10, "turn_chance": 0.01, "turn_range": 0.5,
+        "shape": "rect"
+    },
+    "fast": {
+        "size": 0.8, "speed": 1.5, "health": 70, "chase_weight": 0.5,
+        "damage": 8, "score": 15, "turn_chance": 0.03, "turn_range": math.pi / 2,
+        "shape": "triangle"
+    },
+    "tank": {
+        "size": 1.3, "speed": 0.7, "health": 200, "chase_weight": 0.2,
+        "damage": 15, "score": 20, "turn_chance": 0.005, "turn_range": 0.2,
+        "shape": "circle"
+    }
+}
+# Stats used for any enemy type missing from the table
+DEFAULT_ENEMY_ARCHETYPE = ENEMY_ARCHETYPES["basic"]
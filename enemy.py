@@ -1,63 +1,140 @@
 import pygame
 import random
 import math
-from constants import ENEMY_SIZE, ENEMY_SPEED, RED, SCREEN_WIDTH, SCREEN_HEIGHT, ENEMY_COLORS, ENEMY_TYPES
+from constants import (
+    SCREEN_WIDTH, SCREEN_HEIGHT, ENEMY_TYPES, FPS,
+    ENEMY_FACE_DIRECTION, ENEMY_SPRITE_FORWARD_DEGREES
+)
+from enemy_archetypes import get_archetype
+from transform_cache import transform_cache, facing_degrees
+
+
+def _draw_rect(screen, color, x, y, size):
+    return pygame.draw.rect(screen, color, (x, y, size, size))
+
+
+def _draw_triangle(screen, color, x, y, size):
+    points = [
+        (x + size/2, y),
+        (x + size, y + size),
+        (x, y + size)
+    ]
+    return pygame.draw.polygon(screen, color, points)
+
+
+def _draw_circle(screen, color, x, y, size):
+    center = (x + size/2, y + size/2)
+    return pygame.draw.circle(screen, color, center, size/2)
+
+
+# Fallback shape drawers used when an enemy has no image, keyed by archetype shape
+SHAPE_DRAWERS = {
+    "rect": _draw_rect,
+    "triangle": _draw_triangle,
+    "circle": _draw_circle,
+}
+
+# Shapes drawn once onto sprites, keyed by (shape, color, size) and by archetype
+_SHAPE_SPRITES = {}
+_ARCHETYPE_SPRITES = {}
+
+
+def get_shape_sprite(shape, color, size):
+    """Get a sprite with a fallback shape drawn on it, so shapes can be batched with images"""
+    key = (shape, color, size)
+    sprite = _SHAPE_SPRITES.get(key)
+    if sprite is None:
+        # Shapes are solid, so a color key blits much faster than per-pixel alpha
+        colorkey = (0, 0, 0) if tuple(color) != (0, 0, 0) else (255, 0, 255)
+        # One pixel spare, since polygon edges land on x + size and y + size
+        sprite = pygame.Surface((size + 1, size + 1))
+        sprite.fill(colorkey)
+        SHAPE_DRAWERS.get(shape, _draw_rect)(sprite, color, 0, 0, size)
+        sprite.set_colorkey(colorkey, pygame.RLEACCEL)
+        _SHAPE_SPRITES[key] = sprite
+    return sprite
+
+
+def clear_shape_sprites():
+    """Forget the drawn shape sprites, e.g. after the display format changes"""
+    _SHAPE_SPRITES.clear()
+    _ARCHETYPE_SPRITES.clear()
+
 
 class Enemy:
+    # Fixed attribute layout instead of a per-instance __dict__; stats that
+    # never change live on the shared archetype
+    __slots__ = (
+        "x", "y", "prev_x", "prev_y", "size", "health", "direction", "target", "archetype",
+        "image", "rect", "animation_frame", "animation_timer", "animation_frames"
+    )
+
+    animation_speed = 0.2
+
     def __init__(self, x, y, target=None, enemy_type=None):
         self.x = x
         self.y = y
         
-        # Determine enemy type
-        self.enemy_type = enemy_type if enemy_type else random.choice(ENEMY_TYPES)
-        
-        # Set properties based on enemy type
-        if self.enemy_type == "basic":
-            self.size = ENEMY_SIZE
-            self.speed = ENEMY_SPEED
-            self.health = 100
-            self.chase_weight = 0.3
-            self.damage = 10
-        elif self.enemy_type == "fast":
-            self.size = int(ENEMY_SIZE * 0.8)  # Smaller
-            self.speed = ENEMY_SPEED * 1.5     # Faster
-            self.health = 70                   # Weaker
-            self.chase_weight = 0.5            # More aggressive chasing
-            self.damage = 8
-        elif self.enemy_type == "tank":
-            self.size = int(ENEMY_SIZE * 1.3)  # Larger
-            self.speed = ENEMY_SPEED * 0.7     # Slower
-            self.health = 200                  # Tougher
-            self.chase_weight = 0.2            # Less aggressive chasing
-            self.damage = 15
-        else:  # Default fallback
-            self.size = ENEMY_SIZE
-            self.speed = ENEMY_SPEED
-            self.health = 100
-            self.chase_weight = 0.3
-            self.damage = 10
-        
-        # Set color based on enemy type
-        self.color = ENEMY_COLORS.get(self.enemy_type, RED)
+        # Position at the start of the current tick, for interpolated drawing
+        self.prev_x = x
+        self.prev_y = y
+        
+        # Look up the shared stats for this enemy type
+        self.archetype = get_archetype(enemy_type if enemy_type else random.choice(ENEMY_TYPES))
+        self.size = self.archetype.size
+        self.health = self.archetype.health
         
         # Initialize other properties
         self.image = None
         self.direction = random.uniform(0, 2 * math.pi)  # Random direction in radians
-        self.avoid_force = 0.5  # How strongly enemies avoid each other
-        self.detection_radius = self.size * 2  # How far enemies detect each other
         self.target = target  # Store the target (player)
         
+        # Collision rect, moved in place by get_rect
+        self.rect = pygame.Rect(x, y, self.size, self.size)
+        
         # Animation properties
         self.animation_frame = 0
-        self.animation_speed = 0.2
         self.animation_timer = 0
-        self.animation_frames = []
+        self.animation_frames = ()
+        
+    # Read-only views of the archetype stats
+    @property
+    def enemy_type(self):
+        return self.archetype.name
+        
+    @property
+    def type_id(self):
+        return self.archetype.type_id
+        
+    @property
+    def speed(self):
+        return self.archetype.speed
+        
+    @property
+    def chase_weight(self):
+        return self.archetype.chase_weight
+        
+    @property
+    def damage(self):
+        return self.archetype.damage
+        
+    @property
+    def color(self):
+        return self.archetype.color
+        
+    @property
+    def avoid_force(self):
+        return self.archetype.avoid_force
+        
+    @property
+    def detection_radius(self):
+        return self.archetype.detection_radius
         
     def set_image(self, image):
         """Set the enemy's image"""
         if image:
-            # Resize image to match enemy size
-            self.image = pygame.transform.scale(image, (self.size, self.size))
+            # Resize image to match enemy size, sharing the copy with same-size enemies
+            self.image = transform_cache.get(image, (self.size, self.size))
         else:
             self.image = None
             
@@ -65,35 +142,49 @@ class Enemy:
         """Set animation frames for the enemy"""
         if frames and len(frames) > 0:
             self.animation_frames = [
-                pygame.transform.scale(frame, (self.size, self.size))
+                transform_cache.get(frame, (self.size, self.size))
                 for frame in frames
             ]
             if self.animation_frames:
                 self.image = self.animation_frames[0]
         
-    def update(self, enemies=None, delta_time=1/60):
+    def update_animation(self, delta_time=1/60):
+        """Advance the animation frame"""
+        self.animation_timer += delta_time
+        if self.animation_timer >= self.animation_speed:
+            self.animation_timer = 0
+            self.animation_frame = (self.animation_frame + 1) % len(self.animation_frames)
+            self.image = self.animation_frames[self.animation_frame]
+            
+    def update(self, enemies=None, delta_time=1/60, grid=None, flow_field=None):
         """Update enemy position and handle collisions"""
         # Update animation
         if self.animation_frames:
-            self.animation_timer += delta_time
-            if self.animation_timer >= self.animation_speed:
-                self.animation_timer = 0
-                self.animation_frame = (self.animation_frame + 1) % len(self.animation_frames)
-                self.image = self.animation_frames[self.animation_frame]
+            self.update_animation(delta_time)
+        
+        archetype = self.archetype
+        speed = archetype.speed
         
         # Calculate movement based on direction
-        dx = math.cos(self.direction) * self.speed
-        dy = math.sin(self.direction) * self.speed
+        dx = math.cos(self.direction) * speed
+        dy = math.sin(self.direction) * speed
         
         # Apply target chasing behavior if target exists
         if self.target:
-            chase_dx, chase_dy = self.calculate_chase_vector()
-            dx = dx * (1 - self.chase_weight) + chase_dx * self.chase_weight
-            dy = dy * (1 - self.chase_weight) + chase_dy * self.chase_weight
+            chase_dx, chase_dy = self.calculate_chase_vector(flow_field)
+            chase_weight = archetype.chase_weight
+            dx = dx * (1 - chase_weight) + chase_dx * chase_weight
+            dy = dy * (1 - chase_weight) + chase_dy * chase_weight
         
         # Apply avoidance behavior if enemies list is provided
         if enemies:
-            avoid_x, avoid_y = self.calculate_avoidance(enemies)
+            # Only look at neighbours in nearby grid cells when a grid is provided
+            if grid is not None:
+                neighbours = grid.query(self.x + self.size/2, self.y + self.size/2,
+                                        archetype.detection_radius)
+            else:
+                neighbours = enemies
+            avoid_x, avoid_y = self.calculate_avoidance(neighbours)
             dx += avoid_x
             dy += avoid_y
             
@@ -101,9 +192,12 @@ class Enemy:
             if dx != 0 or dy != 0:
                 self.direction = math.atan2(dy, dx)
         
+        # Movement is tuned per frame, so scale it when a longer time step is passed in
+        steps = delta_time * FPS
+        
         # Update position
-        self.x += dx
-        self.y += dy
+        self.x += dx * steps
+        self.y += dy * steps
         
         # Bounce off screen edges
         if self.x <= 0 or self.x + self.size >= SCREEN_WIDTH:
@@ -116,25 +210,25 @@ class Enemy:
             # Keep within bounds
             self.y = max(0, min(self.y, SCREEN_HEIGHT - self.size))
             
-        # Enemy type-specific behavior
-        if self.enemy_type == "fast":
-            # Fast enemies occasionally make sharp turns
-            if random.random() < 0.03:  # 3% chance each frame
-                self.direction += random.uniform(-math.pi/2, math.pi/2)
-        elif self.enemy_type == "tank":
-            # Tank enemies are more persistent in their direction
-            if random.random() < 0.005:  # 0.5% chance each frame
-                self.direction += random.uniform(-0.2, 0.2)
-        else:
-            # Basic enemies occasionally change direction randomly
-            if random.random() < 0.01:  # 1% chance each frame
-                self.direction += random.uniform(-0.5, 0.5)
+        # Enemy type-specific random turns (e.g. fast enemies make sharp turns,
+        # tanks are more persistent in their direction)
+        if random.random() < archetype.turn_chance * steps:
+            turn_range = archetype.turn_range
+            self.direction += random.uniform(-turn_range, turn_range)
     
-    def calculate_chase_vector(self):
+    def calculate_chase_vector(self, flow_field=None):
         """Calculate vector to chase the target"""
         if not self.target:
             return 0, 0
             
+        speed = self.archetype.speed
+        
+        # Follow the shared flow field when one is provided
+        if flow_field is not None:
+            direction = flow_field.sample(self.x + self.size/2, self.y + self.size/2)
+            if direction:
+                return direction[0] * speed, direction[1] * speed
+            
         # Get target position (assuming target has x, y attributes)
         target_x = self.target.x + self.target.size/2
         target_y = self.target.y + self.target.size/2
@@ -146,14 +240,18 @@ class Enemy:
         # Normalize the vector
         distance = math.sqrt(dx*dx + dy*dy)
         if distance > 0:
-            dx = dx / distance * self.speed
-            dy = dy / distance * self.speed
+            dx = dx / distance * speed
+            dy = dy / distance * speed
             
         return dx, dy
             
     def calculate_avoidance(self, enemies):
         """Calculate avoidance vector to prevent collisions with other enemies"""
         avoid_x, avoid_y = 0, 0
+        center_x = self.x + self.size/2
+        center_y = self.y + self.size/2
+        detection_radius = self.archetype.detection_radius
+        avoid_force = self.archetype.avoid_force
         
         for other in enemies:
             # Skip self
@@ -161,57 +259,75 @@ class Enemy:
                 continue
                 
             # Calculate distance between centers
-            dx = (other.x + other.size/2) - (self.x + self.size/2)
-            dy = (other.y + other.size/2) - (self.y + self.size/2)
+            dx = (other.x + other.size/2) - center_x
+            dy = (other.y + other.size/2) - center_y
             distance = math.sqrt(dx*dx + dy*dy)
             
             # If within detection radius, calculate avoidance force
-            if distance < self.detection_radius:
+            if distance < detection_radius:
                 # Avoid with a force inversely proportional to distance
                 if distance > 0:  # Avoid division by zero
-                    force = self.avoid_force * (self.detection_radius - distance) / distance
+                    force = avoid_force * (detection_radius - distance) / distance
                     avoid_x -= dx * force
                     avoid_y -= dy * force
                 else:
                     # If exactly overlapping (shouldn't happen), move in random direction
                     angle = random.uniform(0, 2 * math.pi)
-                    avoid_x -= math.cos(angle) * self.avoid_force
-                    avoid_y -= math.sin(angle) * self.avoid_force
+                    avoid_x -= math.cos(angle) * avoid_force
+                    avoid_y -= math.sin(angle) * avoid_force
                     
         return avoid_x, avoid_y
         
+    def get_sprite(self):
+        """Get the surface to draw: the image, or the archetype's shape if no image"""
+        image = self.image
+        if image:
+            return image
+        # Enemies of one archetype share a size, so its shape sprite is looked up once
+        sprite = _ARCHETYPE_SPRITES.get(self.archetype)
+        if sprite is None:
+            archetype = self.archetype
+            sprite = _ARCHETYPE_SPRITES[archetype] = get_shape_sprite(
+                archetype.shape, archetype.color, archetype.size)
+        return sprite
+        
+    def get_draw_entry(self, alpha=1.0):
+        """Get the (surface, position) to blit, turned to face the movement direction if enabled
+        
+        alpha blends from the tick's starting position (0) to the current one (1).
+        """
+        x, y = self.x, self.y
+        if alpha != 1.0:
+            x = self.prev_x + (x - self.prev_x) * alpha
+            y = self.prev_y + (y - self.prev_y) * alpha
+        
+        sprite = self.get_sprite()
+        if not ENEMY_FACE_DIRECTION:
+            return sprite, (x, y)
+        
+        # Pre-rotated copies come from the shared cache in fixed angle steps;
+        # rotating grows the surface, so keep it centered on the enemy
+        sprite = transform_cache.get(sprite, None,
+                                     facing_degrees(self.direction, ENEMY_SPRITE_FORWARD_DEGREES))
+        half = self.size / 2
+        return sprite, (x + half - sprite.get_width() // 2,
+                        y + half - sprite.get_height() // 2)
+        
     def draw(self, screen):
-        """Draw the enemy"""
-        if self.image:
-            screen.blit(self.image, (self.x, self.y))
-        else:
-            # Draw different shapes based on enemy type if no image
-            if self.enemy_type == "basic":
-                pygame.draw.rect(screen, self.color, (self.x, self.y, self.size, self.size))
-            elif self.enemy_type == "fast":
-                # Draw triangle for fast enemy
-                points = [
-                    (self.x + self.size/2, self.y),
-                    (self.x + self.size, self.y + self.size),
-                    (self.x, self.y + self.size)
-                ]
-                pygame.draw.polygon(screen, self.color, points)
-            elif self.enemy_type == "tank":
-                # Draw circle for tank enemy
-                center = (self.x + self.size/2, self.y + self.size/2)
-                pygame.draw.circle(screen, self.color, center, self.size/2)
-            else:
-                # Default fallback
-                pygame.draw.rect(screen, self.color, (self.x, self.y, self.size, self.size))
+        """Draw the enemy and return the area drawn"""
+        drawn = screen.blit(*self.get_draw_entry())
             
         # Uncomment to visualize detection radius (for debugging)
         # pygame.draw.circle(screen, (255, 255, 255, 50), 
         #                   (int(self.x + self.size/2), int(self.y + self.size/2)), 
         #                   int(self.detection_radius), 1)
+        return drawn
             
     def get_rect(self):
-        """Get the enemy's collision rectangle"""
-        return pygame.Rect(self.x, self.y, self.size, self.size)
+        """Get the enemy's collision rectangle (shared and updated in place)"""
+        rect = self.rect
+        rect.update(self.x, self.y, self.size, self.size)
+        return rect
         
     def take_damage(self, amount):
         """Enemy takes damage and returns True if defeated"""
@@ -0,0 +1,61 @@
+# enemy_archetypes.py
+from constants import (
+    ENEMY_SIZE, ENEMY_SPEED, ENEMY_TYPES, ENEMY_COLORS, RED,
+    ENEMY_ARCHETYPES, DEFAULT_ENEMY_ARCHETYPE
+)
+
+
+class EnemyArchetype:
+    """Stats shared by every enemy of one type (flyweight)"""
+    __slots__ = (
+        "type_id", "name", "size", "speed", "health", "chase_weight", "damage",
+        "score", "turn_chance", "turn_range", "shape", "color",
+        "avoid_force", "detection_radius"
+    )
+
+    def __init__(self, type_id, name, stats, color):
+        self.type_id = type_id
+        self.name = name
+        self.size = int(ENEMY_SIZE * stats["size"])
+        self.speed = ENEMY_SPEED * stats["speed"]
+        self.health = stats["health"]
+        self.chase_weight = stats["chase_weight"]
+        self.damage = stats["damage"]
+        self.score = stats["score"]
+        self.turn_chance = stats["turn_chance"]
+        self.turn_range = stats["turn_range"]
+        self.shape = stats["shape"]
+        self.color = color
+        self.avoid_force = 0.5  # How strongly enemies avoid each other
+        self.detection_radius = self.size * 2  # How far enemies detect each other
+
+
+# Registered archetypes, indexed by type id
+ARCHETYPES = []
+ARCHETYPES_BY_NAME = {}
+
+
+def register_archetype(name, stats, color=RED):
+    """Add an archetype to the registry and return it"""
+    archetype = EnemyArchetype(len(ARCHETYPES), name, stats, color)
+    ARCHETYPES.append(archetype)
+    ARCHETYPES_BY_NAME[name] = archetype
+    return archetype
+
+
+def get_archetype(name):
+    """Get the archetype for an enemy type name, registering unknown types with default stats"""
+    archetype = ARCHETYPES_BY_NAME.get(name)
+    if archetype is None:
+        archetype = register_archetype(name, DEFAULT_ENEMY_ARCHETYPE,
+                                       ENEMY_COLORS.get(name, RED))
+    return archetype
+
+
+# Register the built-in enemy types in ENEMY_TYPES order so ids match it
+for _name in ENEMY_TYPES:
+    register_archetype(_name, ENEMY_ARCHETYPES.get(_name, DEFAULT_ENEMY_ARCHETYPE),
+                       ENEMY_COLORS.get(_name, RED))
+for _name, _stats in ENEMY_ARCHETYPES.items():
+    if _name not in ARCHETYPES_BY_NAME:
+        register_archetype(_name, _stats, ENEMY_COLORS.get(_name, RED))
@@ -0,0 +1,291 @@
+# enemy_swarm.py
+import math
+from constants import SCREEN_WIDTH, SCREEN_HEIGHT, FPS, ENEMY_GRID_CELL_SIZE
+from enemy_archetypes import ARCHETYPES
+
+# NumPy is optional - the swarm is only used when it is installed
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+# Large stride used to pack 2D cell coordinates into one sortable key
+CELL_KEY_STRIDE = 1 << 20
+
+# The swarm buckets enemies into cells half as wide as the neighbour grid and
+# scans a 5x5 block, which covers the detection radius with fewer candidates
+CELL_SPAN = 2
+SWARM_CELL_SIZE = ENEMY_GRID_CELL_SIZE / CELL_SPAN
+
+if np is not None:
+    TWO_PI = np.float32(2 * math.pi)
+
+
+class EnemySwarm:
+    """Batch movement engine that keeps enemy state in NumPy arrays"""
+
+    def __init__(self, seed=None):
+        if np is None:
+            raise ImportError("EnemySwarm requires numpy")
+
+        self.rng = np.random.default_rng(seed)
+        self.members = []
+        self.count = 0
+
+        # Array copy of the last flow field sampled, keyed by its build count
+        self._field_builds = None
+
+        # Per-archetype stat tables, indexed by type id
+        self._archetype_count = 0
+        self._refresh_archetype_tables()
+
+        self._allocate(0)
+
+    @staticmethod
+    def available():
+        """Check if the swarm engine can be used"""
+        return np is not None
+
+    def _refresh_archetype_tables(self):
+        """Rebuild the stat tables if new archetypes were registered"""
+        if self._archetype_count == len(ARCHETYPES):
+            return
+
+        self._archetype_count = len(ARCHETYPES)
+        self.archetype_speed = np.array([a.speed for a in ARCHETYPES], dtype=float)
+        self.archetype_chase_weight = np.array([a.chase_weight for a in ARCHETYPES])
+        self.archetype_avoid_force = np.array([a.avoid_force for a in ARCHETYPES])
+        self.archetype_detection_radius = np.array([a.detection_radius for a in ARCHETYPES],
+                                                   dtype=float)
+        self.turn_chance = np.array([a.turn_chance for a in ARCHETYPES])
+        self.turn_range = np.array([a.turn_range for a in ARCHETYPES])
+
+    def _allocate(self, count):
+        """Create empty state arrays for the given number of enemies"""
+        self.x = np.zeros(count)
+        self.y = np.zeros(count)
+        self.direction = np.zeros(count)
+        self.size = np.zeros(count)
+        self.health = np.zeros(count)
+        self.type_id = np.zeros(count, dtype=np.int64)
+
+    def load(self, enemies):
+        """Copy state from a list of Enemy objects into the arrays"""
+        self.members = list(enemies)
+        self.count = len(self.members)
+        self._allocate(self.count)
+
+        for i, enemy in enumerate(self.members):
+            self.x[i] = enemy.x
+            self.y[i] = enemy.y
+            self.direction[i] = enemy.direction
+            self.size[i] = enemy.size
+            self.health[i] = enemy.health
+            self.type_id[i] = enemy.archetype.type_id
+
+        # Shared stats come from the archetype tables by type id
+        self._refresh_archetype_tables()
+        self.speed = self.archetype_speed[self.type_id]
+        self.chase_weight = self.archetype_chase_weight[self.type_id]
+        self.avoid_force = self.archetype_avoid_force[self.type_id]
+        self.detection_radius = self.archetype_detection_radius[self.type_id]
+
+    def write_back(self):
+        """Copy positions and directions back onto the Enemy objects"""
+        for enemy, x, y, direction in zip(self.members, self.x.tolist(),
+                                          self.y.tolist(), self.direction.tolist()):
+            enemy.x = x
+            enemy.y = y
+            enemy.direction = direction
+
+    def update(self, enemies, target=None, delta_time=1/60, flow_field=None):
+        """Move every enemy in one batch and sync the results onto the objects"""
+        # Reload only when enemies were added or removed since the last frame
+        if enemies != self.members:
+            self.load(enemies)
+        if self.count == 0:
+            return
+
+        self.step(target, delta_time, flow_field)
+        self.write_back()
+
+        # Animation isn't part of the batch; advance it on the enemies that have any
+        for enemy in self.members:
+            if enemy.animation_frames:
+                enemy.update_animation(delta_time)
+
+    def step(self, target=None, delta_time=1/60, flow_field=None):
+        """Advance the array state by one frame"""
+        n = self.count
+        half = self.size / 2
+
+        # Draw every per-enemy random number for this frame in one batch
+        turn_roll, turn_amount = self.rng.random((2, n))
+
+        # Movement along the current direction
+        dx = np.cos(self.direction) * self.speed
+        dy = np.sin(self.direction) * self.speed
+
+        # Blend in the chase vector toward the target
+        if target:
+            chase_dx = (target.x + target.size/2) - (self.x + half)
+            chase_dy = (target.y + target.size/2) - (self.y + half)
+            distance = np.hypot(chase_dx, chase_dy)
+            scale = np.divide(self.speed, distance, out=np.ones(n), where=distance > 0)
+            chase_dx *= scale
+            chase_dy *= scale
+
+            # Follow the shared flow field where it has a direction
+            if flow_field is not None:
+                field_dx, field_dy, has_direction = self._sample_flow_field(flow_field, half)
+                chase_dx = np.where(has_direction, field_dx * self.speed, chase_dx)
+                chase_dy = np.where(has_direction, field_dy * self.speed, chase_dy)
+            dx = dx * (1 - self.chase_weight) + chase_dx * self.chase_weight
+            dy = dy * (1 - self.chase_weight) + chase_dy * self.chase_weight
+
+        # Push away from nearby enemies
+        avoid_x, avoid_y = self.calculate_avoidance()
+        dx += avoid_x
+        dy += avoid_y
+
+        moving = (dx != 0) | (dy != 0)
+        self.direction = np.where(moving, np.arctan2(dy, dx), self.direction)
+
+        # Movement is tuned per frame, so scale it for longer time steps
+        steps = delta_time * FPS
+
+        # Update position
+        self.x += dx * steps
+        self.y += dy * steps
+
+        # Bounce off screen edges
+        hit_x = (self.x <= 0) | (self.x + self.size >= SCREEN_WIDTH)
+        self.direction = np.where(hit_x, math.pi - self.direction, self.direction)
+        self.x = np.where(hit_x, np.clip(self.x, 0, SCREEN_WIDTH - self.size), self.x)
+
+        hit_y = (self.y <= 0) | (self.y + self.size >= SCREEN_HEIGHT)
+        self.direction = np.where(hit_y, -self.direction, self.direction)
+        self.y = np.where(hit_y, np.clip(self.y, 0, SCREEN_HEIGHT - self.size), self.y)
+
+        # Enemy type-specific random turns
+        turn_range = self.turn_range[self.type_id]
+        turning = turn_roll < self.turn_chance[self.type_id] * steps
+        self.direction += np.where(turning, (turn_amount * 2 - 1) * turn_range, 0.0)
+
+    def _sample_flow_field(self, flow_field, half):
+        """Look up the flow field direction under every enemy at once"""
+        # Cache array copies of the field until it is rebuilt
+        if self._field_builds != (id(flow_field), flow_field.builds):
+            self._field_builds = (id(flow_field), flow_field.builds)
+            self._field_dir_x = np.array(flow_field.dir_x)
+            self._field_dir_y = np.array(flow_field.dir_y)
+            self._field_usable = np.isfinite(flow_field.distance)
+            if flow_field.target_cell is not None:
+                self._field_usable[flow_field.target_cell] = False
+
+        cell_size = flow_field.cell_size
+        col = np.clip(((self.x + half) // cell_size).astype(np.int64), 0, flow_field.cols - 1)
+        row = np.clip(((self.y + half) // cell_size).astype(np.int64), 0, flow_field.rows - 1)
+        index = row * flow_field.cols + col
+        return self._field_dir_x[index], self._field_dir_y[index], self._field_usable[index]
+
+    def _neighbour_pairs(self, center_x, center_y):
+        """Sort enemies by cell and get each nearby (i, j) pair once, with i < j
+
+        Pair indices refer to positions in the returned sort order, so each
+        neighbour range is contiguous and needs no extra gather.
+        """
+        n = self.count
+        cell_x = np.floor(center_x / SWARM_CELL_SIZE).astype(np.int64)
+        cell_y = np.floor(center_y / SWARM_CELL_SIZE).astype(np.int64)
+
+        keys = cell_x * CELL_KEY_STRIDE + cell_y
+        order = np.argsort(keys, kind="stable")
+        sorted_keys = keys[order]
+        # Native-size indices: take() converts any other index type on every call
+        indices = np.arange(n, dtype=np.intp)
+
+        # Cells sharing an x coordinate are contiguous in key order, so each
+        # column of the neighbourhood block is one [start, end) range.
+        # Only the own and right-hand columns are scanned - pairs with the
+        # left-hand columns are found from the other side.
+        columns = CELL_SPAN + 1
+        start = np.empty((columns, n), dtype=np.intp)
+        end = np.empty((columns, n), dtype=np.intp)
+        for offset_x in range(columns):
+            column = sorted_keys + offset_x * CELL_KEY_STRIDE
+            start[offset_x] = np.searchsorted(sorted_keys, column - CELL_SPAN, side="left")
+            end[offset_x] = np.searchsorted(sorted_keys, column + CELL_SPAN, side="right")
+        # In the own column only pair with enemies later in sort order
+        start[0] = indices + 1
+
+        # Expand every range of every column into explicit pair indices at once
+        start = start.ravel()
+        counts = np.maximum(end.ravel() - start, 0)
+        total = int(counts.sum())
+        pairs_i = np.repeat(np.tile(indices, columns), counts)
+        pairs_j = np.repeat(start - (np.cumsum(counts) - counts), counts)
+        pairs_j += np.arange(total, dtype=np.intp)
+        return order, pairs_i, pairs_j
+
+    def calculate_avoidance(self):
+        """Calculate the avoidance vector for every enemy at once"""
+        n = self.count
+        half = self.size / 2
+        order, i, j = self._neighbour_pairs(self.x + half, self.y + half)
+
+        # Work in cell-sorted order and scatter the result back at the end.
+        # Pair math runs in float32, which halves memory traffic and is
+        # still far more precise than a pixel.
+        center_x = (self.x + half)[order].astype(np.float32)
+        center_y = (self.y + half)[order].astype(np.float32)
+
+        # Only positions are gathered for every candidate pair; pairs out of
+        # range of even the largest detection radius are dropped before
+        # anything else is looked up
+        dx = center_x.take(j)
+        dx -= center_x.take(i)
+        dy = center_y.take(j)
+        dy -= center_y.take(i)
+        distance_sq = dx * dx
+        distance_sq += dy * dy
+        reach = self.detection_radius.max() if n else 0
+        close = np.flatnonzero(distance_sq < np.float32(reach * reach))
+        i, j = i.take(close), j.take(close)
+        dx, dy = dx.take(close), dy.take(close)
+        distance = np.sqrt(distance_sq.take(close))
+
+        # The direction is shared by both sides of a pair, pushing them apart;
+        # only the falloff depends on each side's own radius. Exactly
+        # overlapping pairs get a zero direction here.
+        overlapping = distance == 0
+        inverse = 1 / np.where(overlapping, np.float32(1), distance)
+        unit_x = dx * inverse
+        unit_y = dy * inverse
+        detection_radius = self.detection_radius[order].astype(np.float32)
+        falloff_i = np.maximum(detection_radius.take(i) - distance, 0)
+        falloff_j = np.maximum(detection_radius.take(j) - distance, 0)
+
+        # An enemy's avoid force scales every push it gets, so it is applied
+        # once per enemy after summing rather than once per pair
+        push_x = (np.bincount(j, weights=unit_x * falloff_j, minlength=n) -
+                  np.bincount(i, weights=unit_x * falloff_i, minlength=n))
+        push_y = (np.bincount(j, weights=unit_y * falloff_j, minlength=n) -
+                  np.bincount(i, weights=unit_y * falloff_i, minlength=n))
+
+        # Exactly overlapping enemies are each pushed in a random direction
+        overlap = np.flatnonzero(overlapping)
+        if len(overlap):
+            members = np.concatenate((i.take(overlap), j.take(overlap)))
+            # Enemies bunched against the screen edges can make many such pairs,
+            # so the angles are float32 too, where cos and sin are far cheaper
+            angles = self.rng.random(len(members), dtype=np.float32) * TWO_PI
+            push_x -= np.bincount(members, weights=np.cos(angles), minlength=n)
+            push_y -= np.bincount(members, weights=np.sin(angles), minlength=n)
+
+        avoid_force = self.avoid_force[order]
+        avoid_x = np.empty(n)
+        avoid_y = np.empty(n)
+        avoid_x[order] = push_x * avoid_force
+        avoid_y[order] = push_y * avoid_force
+        return avoid_x, avoid_y
@@ -0,0 +1,152 @@
+# flow_field.py
+import heapq
+import math
+
+# Neighbour offsets with their step costs (straight and diagonal)
+NEIGHBOURS = [
+    (1, 0, 1.0), (-1, 0, 1.0), (0, 1, 1.0), (0, -1, 1.0),
+    (1, 1, math.sqrt(2)), (1, -1, math.sqrt(2)),
+    (-1, 1, math.sqrt(2)), (-1, -1, math.sqrt(2)),
+]
+
+
+class FlowField:
+    """Grid of directions leading every cell toward a shared target"""
+
+    def __init__(self, width, height, cell_size):
+        self.cell_size = cell_size
+        self.cols = int(math.ceil(width / cell_size))
+        self.rows = int(math.ceil(height / cell_size))
+
+        cell_count = self.cols * self.rows
+        self.blocked = [False] * cell_count
+        self.distance = [math.inf] * cell_count
+        self.dir_x = [0.0] * cell_count
+        self.dir_y = [0.0] * cell_count
+
+        self.target_cell = None
+        self.dirty = True
+        self.builds = 0
+
+        # Per-cell passable neighbours, worked out again only when obstacles change
+        self.links = None
+
+    def cell_index(self, x, y):
+        """Get the flat cell index for a world position, clamped to the grid"""
+        col = min(max(int(x // self.cell_size), 0), self.cols - 1)
+        row = min(max(int(y // self.cell_size), 0), self.rows - 1)
+        return row * self.cols + col
+
+    def block_rect(self, rect):
+        """Mark every cell overlapping a rect (x, y, width, height) as impassable"""
+        x, y, width, height = rect
+        first_col = max(int(x // self.cell_size), 0)
+        last_col = min(int((x + width - 1) // self.cell_size), self.cols - 1)
+        first_row = max(int(y // self.cell_size), 0)
+        last_row = min(int((y + height - 1) // self.cell_size), self.rows - 1)
+
+        for row in range(first_row, last_row + 1):
+            for col in range(first_col, last_col + 1):
+                self.blocked[row * self.cols + col] = True
+        self.dirty = True
+        self.links = None
+
+    def clear_obstacles(self):
+        """Make every cell passable again"""
+        self.blocked = [False] * (self.cols * self.rows)
+        self.dirty = True
+        self.links = None
+
+    def update(self, target):
+        """Rebuild the field if the target moved to a new cell, returns True if rebuilt"""
+        cell = self.cell_index(target.x + target.size/2, target.y + target.size/2)
+        if cell == self.target_cell and not self.dirty:
+            return False
+
+        self.target_cell = cell
+        self.dirty = False
+        self._build()
+        return True
+
+    def _neighbours(self, index):
+        """Yield (neighbour index, offset col, offset row, cost) for passable neighbours"""
+        cols, rows = self.cols, self.rows
+        blocked = self.blocked
+        row, col = divmod(index, cols)
+
+        for offset_col, offset_row, cost in NEIGHBOURS:
+            n_col = col + offset_col
+            n_row = row + offset_row
+            if not (0 <= n_col < cols and 0 <= n_row < rows):
+                continue
+
+            n_index = n_row * cols + n_col
+            if blocked[n_index]:
+                continue
+
+            # Don't cut corners past blocked cells on diagonal steps
+            if offset_col and offset_row and (blocked[row * cols + n_col] or
+                                              blocked[n_row * cols + col]):
+                continue
+
+            yield n_index, offset_col, offset_row, cost
+
+    def _build_links(self):
+        """List each cell's passable neighbours as (index, cost, unit x, unit y) back toward the cell"""
+        links = []
+        for index in range(self.cols * self.rows):
+            cell_links = []
+            if not self.blocked[index]:
+                for n_index, offset_col, offset_row, cost in self._neighbours(index):
+                    # A neighbour reached through this cell points back at it
+                    cell_links.append((n_index, cost, -offset_col / cost, -offset_row / cost))
+            links.append(cell_links)
+        self.links = links
+
+    def _build(self):
+        """Run Dijkstra outward from the target cell, pointing each cell at the one it was reached from
+
+        Moves are symmetric, so the cell that gives a neighbour its shortest
+        distance is the next step on that neighbour's shortest path - the
+        directions come out of the same pass as the distances.
+        """
+        if self.links is None:
+            self._build_links()
+        links = self.links
+
+        cell_count = self.cols * self.rows
+        distance = [math.inf] * cell_count
+        dir_x = [0.0] * cell_count
+        dir_y = [0.0] * cell_count
+        distance[self.target_cell] = 0.0
+
+        queue = [(0.0, self.target_cell)]
+        heappop, heappush = heapq.heappop, heapq.heappush
+        while queue:
+            dist, index = heappop(queue)
+            if dist > distance[index]:
+                continue
+
+            for n_index, cost, back_x, back_y in links[index]:
+                n_dist = dist + cost
+                if n_dist < distance[n_index]:
+                    distance[n_index] = n_dist
+                    dir_x[n_index] = back_x
+                    dir_y[n_index] = back_y
+                    heappush(queue, (n_dist, n_index))
+
+        self.distance = distance
+        self.dir_x = dir_x
+        self.dir_y = dir_y
+        self.builds += 1
+
+    def sample(self, x, y):
+        """Get the unit direction toward the target from a world position
+
+        Returns None in the target's own cell or in cells that cannot reach
+        it, where callers should steer straight at the target instead.
+        """
+        index = self.cell_index(x, y)
+        if index == self.target_cell or self.distance[index] == math.inf:
+            return None
+        return self.dir_x[index], self.dir_y[index]
@@ -0,0 +1,93 @@
+# font_registry.py
+import json
+import os
+import pygame
+from constants import FONT_CACHE_PATH
+
+# Bump when the cache file layout changes; older caches are ignored
+FONT_CACHE_VERSION = 1
+
+
+class FontRegistry:
+    """Resolves font family names to files once and shares Font objects
+
+    pygame.font.SysFont scans every installed font the first time it is
+    called in a process, and makes a new Font each call. Here a family is
+    looked up once, the family -> file mapping is saved to cache_path for
+    later launches, and Fonts are shared by (path, size). Shared Fonts
+    shouldn't have their style (bold, underline...) changed.
+
+    With use_sysfont set, get() calls SysFont every time instead, for
+    comparing against the uncached behaviour.
+    """
+
+    def __init__(self, cache_path=FONT_CACHE_PATH, use_sysfont=False):
+        self.cache_path = cache_path
+        self.use_sysfont = use_sysfont
+        self.paths = None  # Family -> font file, or None for pygame's built-in font
+        self.fonts = {}  # (path, size) -> Font
+
+        # Stats, for tuning
+        self.lookups = 0  # Families resolved by scanning system fonts
+
+    def _load_cache(self):
+        """Read the saved family -> file mapping, dropping files that have gone"""
+        self.paths = {}
+        try:
+            with open(self.cache_path, "r", encoding="utf-8") as cache:
+                saved = json.load(cache)
+        except (OSError, ValueError):
+            return
+        # Font lookup results differ between pygame versions
+        if (not isinstance(saved, dict) or saved.get("version") != FONT_CACHE_VERSION or
+                saved.get("pygame") != pygame.version.ver):
+            return
+        for family, path in saved.get("fonts", {}).items():
+            if path is None or os.path.exists(path):
+                self.paths[family] = path
+
+    def _save_cache(self):
+        """Write the family -> file mapping for the next launch"""
+        saved = {"version": FONT_CACHE_VERSION, "pygame": pygame.version.ver, "fonts": self.paths}
+        temp_path = self.cache_path + ".tmp"
+        try:
+            os.makedirs(os.path.dirname(self.cache_path) or ".", exist_ok=True)
+            with open(temp_path, "w", encoding="utf-8") as cache:
+                json.dump(saved, cache, indent=1, sort_keys=True)
+            os.replace(temp_path, self.cache_path)
+        except OSError as e:
+            print(f"Could not save font cache {self.cache_path}: {e}")
+
+    def resolve(self, family):
+        """Get the font file for a family name, or None if pygame's built-in font stands in"""
+        if self.paths is None:
+            self._load_cache()
+        key = family.lower()
+        if key not in self.paths:
+            # The slow part: the first match_font in a process scans system fonts
+            self.paths[key] = pygame.font.match_font(family)
+            self.lookups += 1
+            self._save_cache()
+        return self.paths[key]
+
+    def font(self, path, size):
+        """Get the shared Font for a file (None for the built-in font) and size"""
+        key = (path, size)
+        font = self.fonts.get(key)
+        if font is None:
+            font = self.fonts[key] = pygame.font.Font(path, size)
+        return font
+
+    def get(self, family, size):
+        """Get the shared Font for a family name and size, like pygame.font.SysFont"""
+        if self.use_sysfont:
+            return pygame.font.SysFont(family, size)
+        return self.font(self.resolve(family), size)
+
+    def clear(self):
+        """Forget the shared Fonts, e.g. after pygame.font is quit and re-initialized"""
+        self.fonts = {}
+
+
+# Shared by everything that needs system fonts
+font_registry = FontRegistry()
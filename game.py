@@ -1,19 +1,44 @@
 # game.py
+import os
 import pygame
 import random
 import math
 import sys
 from player import Player
-from enemy import Enemy
+from enemy import Enemy, clear_shape_sprites
+from projectile import clear_projectile_sprites
 from assets import AssetManager
 from ui_manager import UIManager
+from spatial_grid import SpatialGrid
+from enemy_swarm import EnemySwarm
+from flow_field import FlowField
+from ai_scheduler import AIScheduler
+from collision import CollisionWorld
+from projectile_buffer import ProjectileBuffer
+from particles import ParticleSystem
+from sprite_cache import CircleSpriteCache
+from surface_pool import SurfacePool
+from compositor import Compositor
+from render_queue import RenderQueue
+from presentation import PRESENTERS, choose_present_mode
+from transform_cache import transform_cache
+from quality_governor import QualityGovernor
+from surface_format import display_formats, normalize_surface, find_slow_surfaces
 from constants import (
     SCREEN_WIDTH, SCREEN_HEIGHT, FPS, TITLE,
     STATE_MENU, STATE_PLAYING, STATE_PAUSED, 
-    STATE_GAME_OVER, STATE_VICTORY, PLAYER_SIZE, ENEMY_SIZE,
-    ENEMY_TYPES, ENEMY_COLORS
+    STATE_GAME_OVER, STATE_VICTORY, STATE_LOADING, STATE_MANIFESTS, PLAYER_SIZE, ENEMY_SIZE,
+    ENEMY_TYPES, ENEMY_COLORS, ENEMY_GRID_CELL_SIZE, USE_ENEMY_SWARM,
+    USE_FLOW_FIELD, FLOW_FIELD_CELL_SIZE, COLLISION_CELL_SIZE,
+    LAYER_PLAYER, LAYER_ENEMY, LAYER_PROJECTILE, LAYER_PLAYER_ATTACK,
+    USE_PROJECTILE_BUFFER, USE_DIRTY_RECTS, REPORT_SLOW_SURFACES,
+    TICK_RATE, MAX_CATCH_UP_TICKS, INTERPOLATE_RENDERING,
+    PRESENT_SCALED, PRESENT_QUALITY, QUALITY_SMOOTH,
+    ADAPTIVE_QUALITY
+)
+from game_state import (
+    MenuState, PlayingState, PausedState, GameOverState, VictoryState, LoadingState
 )
-from game_state import MenuState, PlayingState, PausedState, GameOverState, VictoryState
 from menu import Menu
 from ui import Button
 
@@ -41,19 +66,40 @@ class Game:
         # All game elements will be drawn to this surface, then scaled to the actual screen
         self.render_surface = pygame.Surface((self.design_width, self.design_height))
         
+        # How the render surface gets onto the screen, picked by update_scale_factors
+        self.present_quality = PRESENT_QUALITY
+        self.presenter = None
+        self.scaled_display = False  # SDL is scaling the display (pygame.SCALED)
+        
         # Calculate scaling factors and offsets
         self.update_scale_factors()
         
         pygame.display.set_caption(TITLE)
         self.clock = pygame.time.Clock()
         self.running = True
-        self.current_state = STATE_MENU
+        
+        # The simulation steps in fixed ticks, whatever the frame rate
+        self.tick_delta = 1 / TICK_RATE
+        self.tick_count = 0
+        self.render_alpha = 1.0  # How far drawing is between the last two ticks
+        self.dropped_ticks = 0  # Ticks skipped when frames were too slow to catch up
+        self.current_state = STATE_LOADING
+        
+        # Reusable scratch surfaces for overlays and effects, reclaimed every frame
+        self.surface_pool = SurfacePool()
+        
+        # Entity sprites queued while drawing and blitted in batches per layer
+        self.render_queue = RenderQueue()
         
         # Initialize UI manager
         self.ui_manager = UIManager(self)
         
         # Initizalize projectiles
         self.projectiles = []
+        
+        # Optional array-backed projectile store (None means the projectiles list)
+        self.projectile_buffer = None
+        self.set_projectile_buffer(USE_PROJECTILE_BUFFER)
 
         # Previous state
         self.previous_state = None
@@ -61,36 +107,69 @@ class Game:
         # Initialize asset manager
         self.assets = AssetManager()
         
-        # Create player
+        # Redraws only the changed parts of the frame over a cached background
+        self.compositor = Compositor(self.design_width, self.design_height)
+        self.compositor.enabled = USE_DIRTY_RECTS
+        
+        # Create player (its image is set when a game starts)
         self.player = Player(self.design_width // 2, self.design_height - 2 * PLAYER_SIZE)
-        self.player.set_image(self.assets.get_image("player"))
         
         # Create enemies list (will be populated in reset_game)
         self.enemies = []
         
-        # Particles for visual effects
+        # Spatial grid for enemy neighbour lookups
+        self.enemy_grid = SpatialGrid(ENEMY_GRID_CELL_SIZE)
+        
+        # Optional batch movement engine (None means per-object updates)
+        self.enemy_swarm = None
+        self.set_enemy_swarm(USE_ENEMY_SWARM)
+        
+        # Shared chase directions toward the player (None means straight-line chase)
+        self.flow_field = None
+        if USE_FLOW_FIELD:
+            self.flow_field = FlowField(self.design_width, self.design_height, FLOW_FIELD_CELL_SIZE)
+        
+        # Decides which enemies get an AI update each frame
+        self.ai_scheduler = AIScheduler()
+        
+        # Broad phase collision between the player, projectiles and enemies
+        self.collision_world = CollisionWorld(COLLISION_CELL_SIZE)
+        self.collision_world.set_mask(LAYER_PROJECTILE, LAYER_ENEMY)
+        self.collision_world.set_mask(LAYER_PLAYER, LAYER_ENEMY)
+        self.collision_world.set_mask(LAYER_PLAYER_ATTACK, LAYER_ENEMY)
+        
+        # Particles for visual effects, kept in NumPy arrays when available
         self.particles = []
+        self.sprite_cache = CircleSpriteCache()
+        self.particle_system = None
+        if ParticleSystem.available():
+            self.particle_system = ParticleSystem(sprite_cache=self.sprite_cache)
+        
+        # Effect quality, stepped down by the governor when frames run long
+        self.particle_scale = 1.0
+        self.particle_cap = None
+        self.click_indicators_enabled = True
+        self.quality_governor = QualityGovernor() if ADAPTIVE_QUALITY else None
         
         # Create menu
         self.menu = Menu(self)
         
         # Create pause menu buttons
-        font = self.assets.get_font("main")
         self.pause_buttons = [
             Button(
                 self.design_width // 2 - 100, 200, 200, 50,
-                "Resume", font,
-                action=lambda: self.set_state(STATE_PLAYING)
+                "Resume", "main",
+                action=lambda: self.set_state(STATE_PLAYING), assets=self.assets
             ),
             Button(
                 self.design_width // 2 - 100, 270, 200, 50,
-                "Main Menu", font,
-                action=lambda: self.set_state(STATE_MENU)
+                "Main Menu", "main",
+                action=lambda: self.load_state(STATE_MENU), assets=self.assets
             ),
             Button(
                 self.design_width // 2 - 100, 340, 200, 50,
-                "Quit", font,
-                action=lambda: self.quit_game()
+                "Quit", "main",
+                action=lambda: self.quit_game(), assets=self.assets
             )
         ]
         
@@ -100,47 +179,166 @@ class Game:
             STATE_PLAYING: PlayingState(self),
             STATE_PAUSED: PausedState(self),
             STATE_GAME_OVER: GameOverState(self),
-            STATE_VICTORY: VictoryState(self)
+            STATE_VICTORY: VictoryState(self),
+            STATE_LOADING: LoadingState(self)
         }
         
-        # Initialize the game
-        self.reset_game()
+        # The game itself is set up when play starts, loading its assets then
+        self.score = 0
+        
+        # Bring what's loaded so far to the display's pixel format; assets
+        # loaded later are converted as they arrive
+        self.normalize_surfaces()
+        
+        # Show the loading screen while the menu's assets load
+        self.load_state(STATE_MENU)
+    
+    def normalize_surfaces(self):
+        """Convert every stored surface to the display's pixel format, after any display mode change"""
+        formats = display_formats()
+        
+        # Surfaces drawn into every frame are converted but not RLE encoded
+        self.render_surface = normalize_surface(self.render_surface, formats, rle=False)
+        self.compositor.background = normalize_surface(self.compositor.background, formats, rle=False)
+        self.compositor.invalidate()
+        if hasattr(self.presenter, "target"):
+            self.presenter.target = None
+        
+        # Sprites are converted and RLE encoded where it speeds up blitting
+        self.assets.normalize_images(formats)
+        
+        # Derived surfaces are remade from the converted images on demand
+        transform_cache.clear()
+        self.sprite_cache.clear()
+        clear_shape_sprites()
+        clear_projectile_sprites()
+        if self.projectile_buffer is not None:
+            self.projectile_buffer.sprites.clear()
+        self.player.square_sprite = None
+        self.surface_pool.clear()
+        self.menu.panel.release()
+        for state in self.states.values():
+            if hasattr(state, "panel"):
+                state.panel.release()
+        
+        # Give the player and enemies the converted images
+        if self.player.image is not None:
+            self.player.set_image(self.assets.get_image("player"))
+        for enemy in self.enemies:
+            image = self.get_enemy_image(enemy.enemy_type)
+            if image is not None:
+                enemy.set_image(image)
+        
+        if REPORT_SLOW_SURFACES:
+            self.report_slow_surfaces(formats)
+    
+    def report_slow_surfaces(self, formats=None):
+        """Print and return the stored surfaces that are still in slow pixel formats"""
+        surfaces = [("render surface", self.render_surface, False),
+                    ("compositor background", self.compositor.background, False)]
+        surfaces.extend((f"image '{name}'", image, True) for name, image in self.assets.images.items())
+        surfaces.extend((f"transformed {key[1][0]}x{key[1][1]} bucket {key[2]}", entry[0], True)
+                        for key, entry in transform_cache.surfaces.items())
+        surfaces.extend((f"enemy {enemy.enemy_type} sprite", enemy.get_sprite(), True)
+                        for enemy in self.enemies)
+        
+        slow = find_slow_surfaces(surfaces, formats)
+        print(f"Slow surfaces: {len(slow)} of {len(surfaces)}")
+        for name, size, reason in slow:
+            print(f"  {name} {size[0]}x{size[1]}: {reason}")
+        return slow
     
     def update_scale_factors(self):
-        """Calculate scaling factors and offsets for rendering and mouse input"""
-        # Calculate aspect ratios
-        render_ratio = self.design_width / self.design_height
-        screen_ratio = self.screen_width / self.screen_height
-        
-        if screen_ratio > render_ratio:  # Screen is wider than game
-            # Height will match screen, width will be scaled
-            self.scaled_height = self.screen_height
-            self.scaled_width = int(self.scaled_height * render_ratio)
-            self.x_offset = (self.screen_width - self.scaled_width) // 2
-            self.y_offset = 0
-        else:  # Screen is taller than game
-            # Width will match screen, height will be scaled
-            self.scaled_width = self.screen_width
-            self.scaled_height = int(self.scaled_width / render_ratio)
-            self.x_offset = 0
-            self.y_offset = (self.screen_height - self.scaled_height) // 2
+        """Pick the presentation mode, then calculate scaling factors and offsets for rendering and mouse input"""
+        screen_size = (self.screen_width, self.screen_height)
+        design_size = (self.design_width, self.design_height)
+        
+        if self.scaled_display:
+            # SDL scales the whole display, so the game draws at design size
+            mode = PRESENT_SCALED
+        else:
+            mode = choose_present_mode(self.present_quality, screen_size, design_size)
+        
+        # Keep the presenter (and its cached scaled surface) if the mode is unchanged
+        if self.presenter is None or self.presenter.mode != mode:
+            self.presenter = PRESENTERS[mode]()
+        self.presenter.setup(screen_size, design_size)
+        
+        self.scaled_width, self.scaled_height = self.presenter.size
+        self.x_offset, self.y_offset = self.presenter.offset
         
         # Calculate scale factors for mouse input
         self.scale_factor_x = self.design_width / self.scaled_width
         self.scale_factor_y = self.design_height / self.scaled_height
     
+    def set_present_quality(self, quality):
+        """Change the presentation quality setting and re-pick the mode"""
+        self.present_quality = quality
+        self.update_scale_factors()
+        self.compositor.invalidate()
+    
+    def apply_quality_level(self, level):
+        """Apply the effect and presentation settings of a quality level"""
+        self.particle_scale = level["particle_scale"]
+        self.particle_cap = level["particle_cap"]
+        self.click_indicators_enabled = level["click_indicators"]
+        
+        if self.particle_system is not None:
+            self.particle_system.set_limit(self.particle_cap)
+        elif len(self.particles) > self.particle_cap:
+            del self.particles[:len(self.particles) - self.particle_cap]
+        
+        if level["present_quality"] != self.present_quality:
+            self.set_present_quality(level["present_quality"])
+    
+    def set_enemy_swarm(self, enabled):
+        """Switch enemy movement between the per-object and swarm paths"""
+        if enabled and EnemySwarm.available():
+            if self.enemy_swarm is None:
+                self.enemy_swarm = EnemySwarm()
+        else:
+            if enabled:
+                print("Enemy swarm needs numpy, using per-object updates")
+            self.enemy_swarm = None
+    
+    def set_projectile_buffer(self, enabled):
+        """Switch projectile storage between the projectiles list and the array buffer"""
+        if enabled and ProjectileBuffer.available():
+            if self.projectile_buffer is None:
+                self.projectile_buffer = ProjectileBuffer()
+                # Carry over projectiles already in flight
+                for projectile in self.projectiles:
+                    self.projectile_buffer.add(projectile)
+                self.projectiles = []
+        else:
+            if enabled:
+                print("Projectile buffer needs numpy, using the projectiles list")
+            self.projectile_buffer = None
+    
+    def add_projectile(self, projectile):
+        """Start tracking a newly fired projectile"""
+        if self.projectile_buffer is not None:
+            self.projectile_buffer.add(projectile)
+        else:
+            self.projectiles.append(projectile)
+    
     def reset_game(self):
         # Create player at center of screen
         self.player = Player(self.design_width // 2 - PLAYER_SIZE // 2, 
                             self.design_height // 2 - PLAYER_SIZE // 2)
         
         # Set player image if available
-        if "player" in self.assets.images:
+        if self.assets.has_image("player"):
             self.player.set_image(self.assets.get_image("player"))
+        if self.assets.has_image("background"):
+            self.compositor.set_background(self.assets.get_image("background"))
         
         # Clear any previous enemies and particles
         self.enemies = []
         self.particles = []
+        if self.particle_system is not None:
+            self.particle_system.clear()
+        self.ai_scheduler.reset()
         
         # Create new enemies
         self.create_enemies(5)  # Create 5 enemies
@@ -150,6 +348,27 @@ class Game:
 
         # Reset projectiles
         self.projectiles = [] 
+        if self.projectile_buffer is not None:
+            self.projectile_buffer.clear()
+        
+    def set_display_mode(self, size, flags=0):
+        """Set the display mode, recreating the window when SDL scaling is switched on or off"""
+        scaled_flag = getattr(pygame, "SCALED", 0)
+        wants_scaled = bool(flags & scaled_flag)
+        if wants_scaled != self.scaled_display:
+            # An existing window can't switch SDL scaling on or off
+            pygame.display.quit()
+            pygame.display.init()
+            pygame.display.set_caption(TITLE)
+        
+        if wants_scaled:
+            # Filter SDL's scaling only when the quality setting asks for it
+            os.environ["SDL_RENDER_SCALE_QUALITY"] = (
+                "linear" if self.present_quality == QUALITY_SMOOTH else "nearest")
+        
+        screen = pygame.display.set_mode(size, flags)
+        self.scaled_display = wants_scaled and bool(screen.get_flags() & scaled_flag)
+        return screen
         
     def toggle_fullscreen(self):
         """Toggle between fullscreen and windowed mode"""
@@ -158,10 +377,19 @@ class Game:
         if self.fullscreen:
             # Store current windowed size before going fullscreen
             self.windowed_size = (self.screen.get_width(), self.screen.get_height())
-            self.screen = pygame.display.set_mode((0, 0), pygame.FULLSCREEN)
+            
+            # Let SDL scale the display if that's the cheapest mode for the desktop
+            design_size = (self.design_width, self.design_height)
+            desktop_size = pygame.display.get_desktop_sizes()[0]
+            mode = choose_present_mode(self.present_quality, desktop_size, design_size,
+                                       allow_scaled=True)
+            if mode == PRESENT_SCALED:
+                self.screen = self.set_display_mode(design_size, pygame.FULLSCREEN | pygame.SCALED)
+            if not self.scaled_display:
+                self.screen = self.set_display_mode((0, 0), pygame.FULLSCREEN)
         else:
             # Return to windowed mode with previous dimensions
-            self.screen = pygame.display.set_mode(self.windowed_size)
+            self.screen = self.set_display_mode(self.windowed_size)
         
         # Update screen dimensions
         self.screen_width = self.screen.get_width()
@@ -170,6 +398,10 @@ class Game:
         # Update scaling factors and offsets
         self.update_scale_factors()
         
+        # The display format may have changed, and the new display surface
+        # starts blank, so convert everything and present the next frame in full
+        self.normalize_surfaces()
+        
     def scale_mouse_pos(self, pos):
         """Scale mouse position from screen coordinates to render surface coordinates"""
         x, y = pos
@@ -255,18 +487,30 @@ class Game:
                 enemy = Enemy(furthest_corner[0], furthest_corner[1], target=self.player, enemy_type=enemy_type)
             
             # Set enemy image based on type
-            image_name = f"enemy_{enemy_type}"
-            if hasattr(self, 'assets') and image_name in self.assets.images:
-                enemy.set_image(self.assets.get_image(image_name))
-            elif hasattr(self, 'assets') and "enemy" in self.assets.images:
-                # Fallback to generic enemy image
-                enemy.set_image(self.assets.get_image("enemy"))
+            image = self.get_enemy_image(enemy_type)
+            if image is not None:
+                enemy.set_image(image)
             
             self.enemies.append(enemy)
             
+    def get_enemy_image(self, enemy_type):
+        """Get the image for an enemy type, or None to draw its shape"""
+        image_name = f"enemy_{enemy_type}"
+        if hasattr(self, 'assets') and self.assets.has_image(image_name):
+            return self.assets.get_image(image_name)
+        elif hasattr(self, 'assets') and self.assets.has_image("enemy"):
+            # Fallback to generic enemy image
+            return self.assets.get_image("enemy")
+        return None
+            
     def create_death_effect(self, x, y, color):
         """Create particle effect when an enemy is defeated"""
-        num_particles = 20
+        # Fewer particles per effect at lower quality levels, but always some
+        num_particles = max(1, round(20 * self.particle_scale))
+        if self.particle_system is not None:
+            self.particle_system.emit(x, y, num_particles, color)
+            return
+        
         particles = []
         
         for _ in range(num_particles):
@@ -288,10 +532,19 @@ class Game:
             particles.append(particle)
         
         self.particles.extend(particles)
+        
+        # Past the cap, the oldest particles make way
+        if self.particle_cap is not None and len(self.particles) > self.particle_cap:
+            del self.particles[:len(self.particles) - self.particle_cap]
 
     def update_particles(self, delta_time=1/60):
         """Update particle effects"""
-        for particle in self.particles[:]:
+        if self.particle_system is not None:
+            self.particle_system.update(delta_time)
+            return
+        
+        live_particles = []
+        for particle in self.particles:
             # Update position
             particle['x'] += particle['dx']
             particle['y'] += particle['dy']
@@ -299,33 +552,33 @@ class Game:
             # Update lifetime
             particle['time_left'] -= delta_time
             
-            # Remove expired particles
-            if particle['time_left'] <= 0:
-                self.particles.remove(particle)
+            # Keep particles that haven't expired
+            if particle['time_left'] > 0:
+                live_particles.append(particle)
+        self.particles = live_particles
 
     def draw_particles(self, surface):
         """Draw particle effects"""
+        if self.particle_system is not None:
+            self.particle_system.draw(surface)
+            xs, ys = self.particle_system.live_positions()
+            self.compositor.mark_points(xs, ys, self.particle_system.max_radius())
+            return
+        
+        blits = []
         for particle in self.particles:
             # Calculate fade based on remaining lifetime
-            alpha = int(255 * (particle['time_left'] / particle['lifetime']))
-            color = list(particle['color'])
-            
-            # Draw particle
-            size = particle['size'] * (particle['time_left'] / particle['lifetime'])
-            
-            # Create a surface for the particle with alpha
-            surf = pygame.Surface((int(size*2), int(size*2)), pygame.SRCALPHA)
-            
-            # Draw the particle on the surface
-            pygame.draw.circle(
-                surf, 
-                (*color[:3], alpha),  # RGB + alpha
-                (int(size), int(size)), 
-                int(size)
-            )
+            fade = particle['time_left'] / particle['lifetime']
+            size = int(particle['size'] * fade)
+            if size <= 0:
+                continue
             
-            # Blit the surface to the screen
-            surface.blit(surf, (int(particle['x'] - size), int(particle['y'] - size)))
+            # Reuse a pre-drawn circle with the nearest alpha
+            sprite = self.sprite_cache.get_circle(size, particle['color'], 255 * fade)
+            blits.append((sprite, (int(particle['x']) - size, int(particle['y']) - size)))
+        
+        # Blit every particle in one call
+        self.compositor.mark_all(surface.blits(blits))
             
     def set_state(self, state_name):
         """Change the current game state"""
@@ -343,6 +596,20 @@ class Game:
         if state_name == STATE_PLAYING and self.previous_state != STATE_PAUSED:
             self.reset_game()
             
+    def load_state(self, state_name):
+        """Change state once its manifest's assets are loaded, showing the loading screen meanwhile"""
+        manifest = STATE_MANIFESTS.get(state_name, {})
+        if not self.assets.prefetch(manifest):
+            # Nothing left to load
+            self.set_state(state_name)
+            return
+        
+        self.states[STATE_LOADING].next_state = state_name
+        if self.current_state == STATE_LOADING:
+            self.states[STATE_LOADING].enter()
+        else:
+            self.set_state(STATE_LOADING)
+            
     def handle_events(self, events):
         """Process all game events"""
         # Process any events that need scaling (like mouse clicks)
@@ -403,32 +670,58 @@ class Game:
         self.states[self.current_state].handle_events(scaled_events)
         
     def update(self):
-        """Update the current game state"""
+        """Advance the current game state by one fixed tick"""
         self.states[self.current_state].update()
         
         # Update particles regardless of game state
-        delta_time = 1 / FPS
-        self.update_particles(delta_time)
+        self.update_particles(self.tick_delta)
+        self.tick_count += 1
+        
+    def step_simulation(self, ticks):
+        """Run ticks without drawing, e.g. to fast-forward far quicker than real time"""
+        for _ in range(ticks):
+            if not self.running:
+                break
+            self.update()
+        
+    def draw(self, alpha=1.0):
+        """Draw the current state, alpha of the way from the previous tick to the latest"""
+        state = self.states[self.current_state]
+        # Only PLAYING ticks the simulation, so elsewhere there is nothing to
+        # blend between - a paused game must hold still
+        interpolate = INTERPOLATE_RENDERING and self.current_state == STATE_PLAYING
+        self.render_alpha = alpha if interpolate else 1.0
+        
+        # States that mark what they draw can be redrawn and presented in part
+        compositor = self.compositor
+        compositor.begin_frame(state.tracks_dirty_rects)
         
-    def draw(self):
-        """Draw the current game state"""
         # Clear the render surface
-        self.render_surface.fill((0, 0, 0))
+        if compositor.full:
+            self.render_surface.fill((0, 0, 0))
         
         # Draw the current state to the render surface
-        self.states[self.current_state].draw(self.render_surface)
+        state.draw(self.render_surface)
         
         # Draw particles on the render surface
         self.draw_particles(self.render_surface)
         
+        dirty_rects = compositor.end_frame()
+        if dirty_rects is None:
+            self.present_full()
+        else:
+            self.present_rects(dirty_rects)
+        
+        # Scratch surfaces handed out while drawing can be reused next frame
+        self.surface_pool.end_frame()
+        
+    def present_full(self):
+        """Put the whole render surface on the screen and flip"""
         # Clear the actual screen
         self.screen.fill((0, 0, 0))
         
-        # Scale the render surface to the calculated dimensions
-        scaled_surface = pygame.transform.smoothscale(self.render_surface, (self.scaled_width, self.scaled_height))
-        
-        # Blit the scaled surface to the screen with proper centering
-        self.screen.blit(scaled_surface, (self.x_offset, self.y_offset))
+        # Scale the render surface into place using the current presentation mode
+        self.presenter.present_full(self.render_surface, self.screen)
         
         # Draw a debug cursor at the scaled mouse position (optional, for testing)
         # mouse_pos = pygame.mouse.get_pos()
@@ -442,15 +735,30 @@ class Game:
         # Update the display
         pygame.display.flip()
         
+    def present_rects(self, rects):
+        """Put only the given render surface rects on the screen and update just those"""
+        screen_rects = self.presenter.present_rects(self.render_surface, self.screen, rects)
+        pygame.display.update(screen_rects)
+        
     def quit_game(self):
         """Exit the game"""
         self.running = False
         
     def run(self):
         """Main game loop"""
+        # Real time not yet simulated
+        accumulator = 0.0
+        
         while self.running:
-            # Control frame rate
-            self.clock.tick(FPS)
+            # Control frame rate; the time since the last frame feeds the simulation
+            accumulator += self.clock.tick(FPS) / 1000
+            
+            # Judge quality on the time the last frame took to make, not
+            # counting the wait for the frame rate
+            if self.quality_governor is not None:
+                level = self.quality_governor.record(self.clock.get_rawtime())
+                if level is not None:
+                    self.apply_quality_level(level)
             
             # Get all events once per frame
             events = pygame.event.get()
@@ -472,12 +780,23 @@ class Game:
             # Then pass events to the current state
             self.handle_events(events)
             
-            # Update game state
-            self.update()
+            # Update game state in fixed ticks covering the elapsed time, capped
+            # so one slow frame can't snowball into ever more catch-up work
+            ticks = 0
+            while accumulator >= self.tick_delta and ticks < MAX_CATCH_UP_TICKS:
+                self.update()
+                accumulator -= self.tick_delta
+                ticks += 1
+            if accumulator >= self.tick_delta:
+                # Still behind after the cap - let the game slow down instead
+                behind = int(accumulator / self.tick_delta)
+                self.dropped_ticks += behind
+                accumulator -= behind * self.tick_delta
             
-            # Draw everything
-            self.draw()
+            # Draw everything, between the last two ticks
+            self.draw(accumulator / self.tick_delta)
         
         # Clean up
+        self.assets.loader.shutdown()
         pygame.quit()
         sys.exit()
@@ -1,12 +1,20 @@
 # game_state.py
 import pygame
+from collision import sweep_contacts
+from ui import TextBox, RetainedPanel
 from constants import (
     STATE_MENU, STATE_PLAYING, STATE_PAUSED, 
     STATE_GAME_OVER, STATE_VICTORY,
-    SCREEN_WIDTH, SCREEN_HEIGHT, ENEMY_COLORS
+    SCREEN_WIDTH, SCREEN_HEIGHT, MENU_BG_COLOR, MENU_TEXT_COLOR, MENU_HIGHLIGHT_COLOR,
+    LAYER_PLAYER, LAYER_ENEMY, LAYER_PROJECTILE, LAYER_PLAYER_ATTACK,
+    RENDER_LAYER_PROJECTILE, RENDER_LAYER_PLAYER, RENDER_LAYER_ENEMY
 )
 
 class GameState:
+    # Whether draw() marks everything it draws on the compositor, so frames
+    # can be redrawn in part
+    tracks_dirty_rects = False
+    
     def __init__(self, game):
         self.game = game
         
@@ -53,7 +61,7 @@ class MenuState(GameState):
         
     def enter(self):
         # Reset menu selection or do other initialization
-        if hasattr(self.game.assets, 'play_sound') and "menu_music" in self.game.assets.sounds:
+        if hasattr(self.game.assets, 'play_sound') and self.game.assets.has_sound("menu_music"):
             self.game.assets.play_sound("menu_music")
         
     def exit(self):
@@ -61,6 +69,8 @@ class MenuState(GameState):
         pass
 
 class PlayingState(GameState):
+    tracks_dirty_rects = True
+    
     def __init__(self, game):
         super().__init__(game)
         self.click_indicators = []
@@ -83,11 +93,9 @@ class PlayingState(GameState):
                         # Create projectile
                         projectile = self.game.player.shoot(mouse_pos)
                         if projectile:  # Make sure a valid projectile was returned
-                            if not hasattr(self.game, 'projectiles'):
-                                self.game.projectiles = []
-                            self.game.projectiles.append(projectile)
+                            self.game.add_projectile(projectile)
                             # Play sound effect if available
-                            if hasattr(self.game.assets, 'play_sound') and "shoot" in self.game.assets.sounds:
+                            if hasattr(self.game.assets, 'play_sound') and self.game.assets.has_sound("shoot"):
                                 self.game.assets.play_sound("shoot")
                     
             elif event.type == pygame.MOUSEBUTTONDOWN:
@@ -98,11 +106,9 @@ class PlayingState(GameState):
                         # Create projectile
                         projectile = self.game.player.shoot(event.pos)
                         if projectile:  # Make sure a valid projectile was returned
-                            if not hasattr(self.game, 'projectiles'):
-                                self.game.projectiles = []
-                            self.game.projectiles.append(projectile)
+                            self.game.add_projectile(projectile)
                             # Play sound effect if available
-                            if hasattr(self.game.assets, 'play_sound') and "shoot" in self.game.assets.sounds:
+                            if hasattr(self.game.assets, 'play_sound') and self.game.assets.has_sound("shoot"):
                                 self.game.assets.play_sound("shoot")
                     else:
                         # Fallback to attack if shoot method doesn't exist
@@ -116,6 +122,13 @@ class PlayingState(GameState):
 
                     
     def update(self):
+        # Remember where everything starts this tick, for interpolated drawing
+        player = self.game.player
+        player.prev_x, player.prev_y = player.x, player.y
+        for enemy in self.game.enemies:
+            enemy.prev_x = enemy.x
+            enemy.prev_y = enemy.y
+        
         # Update player movement
         self.game.player.update()
         
@@ -123,81 +136,48 @@ class PlayingState(GameState):
         self.game.player.x = max(0, min(self.game.player.x, self.game.design_width - self.game.player.size))
         self.game.player.y = max(0, min(self.game.player.y, self.game.design_height - self.game.player.size))
         
-        # Update projectiles if they exist
-        if hasattr(self.game, 'projectiles'):
-            for projectile in self.game.projectiles[:]:  # Use a copy for safe iteration
-                # Update projectile position
+        # Move projectiles and drop expired or off-screen ones in one pass
+        if self.game.projectile_buffer is not None:
+            self.game.projectile_buffer.update(self.game.design_width, self.game.design_height)
+        elif hasattr(self.game, 'projectiles'):
+            live_projectiles = []
+            for projectile in self.game.projectiles:
+                # Update projectile position, skip it if lifetime expired
                 if projectile.update():
-                    # Remove if lifetime expired
-                    self.game.projectiles.remove(projectile)
                     continue
                     
                 # Check for projectile going off-screen
                 if (projectile.x < 0 or projectile.x > self.game.design_width or 
                     projectile.y < 0 or projectile.y > self.game.design_height):
-                    self.game.projectiles.remove(projectile)
                     continue
                     
-                # Check for collision with enemies
-                for enemy in self.game.enemies[:]:
-                    if enemy.get_rect().colliderect(projectile.rect):
-                        # Enemy hit by projectile
-                        if enemy.take_damage(projectile.damage):
-                            # Enemy defeated
-                            enemy_color = ENEMY_COLORS.get(enemy.enemy_type, (255, 0, 0))
-                            self.game.create_death_effect(
-                                enemy.x + enemy.size/2,
-                                enemy.y + enemy.size/2,
-                                enemy_color
-                            )
-                            self.game.enemies.remove(enemy)
-                            self.game.score += 10  # Basic score for defeating enemy
-                            
-                            # Add bonus score based on enemy type
-                            if enemy.enemy_type == "fast":
-                                self.game.score += 5
-                            elif enemy.enemy_type == "tank":
-                                self.game.score += 10
-                        
-                        # Remove the projectile after hitting
-                        if projectile in self.game.projectiles:
-                            self.game.projectiles.remove(projectile)
-                        break
-        
-        # Update enemies
-        for enemy in self.game.enemies[:]:  # Use a copy of the list for safe iteration
-            enemy.update(self.game.enemies)
+                live_projectiles.append(projectile)
+            self.game.projectiles = live_projectiles
+        
+        grid = self.game.enemy_grid
+        swarm = self.game.enemy_swarm
+        flow_field = self.game.flow_field
+        if flow_field is not None:
+            # Only rebuilds when the player has moved into a new cell
+            flow_field.update(self.game.player)
+        
+        if swarm is not None:
+            # Move every enemy in one batch before the per-enemy checks
+            swarm.update(self.game.enemies, self.game.player, delta_time=self.game.tick_delta,
+                         flow_field=flow_field)
+        else:
+            # Rebuild the neighbour grid once, then keep it current as each enemy moves
+            grid.rebuild(self.game.enemies)
             
-            # Check for collision with player
-            if self.game.player.get_rect().colliderect(enemy.get_rect()):
-                # Player hit by enemy
-                self.game.player.take_damage(enemy.damage)  # Use enemy's damage value
-                
-                # Check if player is defeated
-                if self.game.player.health <= 0:
-                    self.game.set_state(STATE_GAME_OVER)
-                    
-            # Check for player attack hitting enemy
-            if self.game.player.is_attacking:
-                attack_rect = self.game.player.get_attack_rect()
-                if attack_rect and attack_rect.colliderect(enemy.get_rect()):
-                    # Enemy hit by player attack
-                    if enemy.take_damage(self.game.player.damage):
-                        # Enemy defeated
-                        enemy_color = ENEMY_COLORS.get(enemy.enemy_type, (255, 0, 0))
-                        self.game.create_death_effect(
-                            enemy.x + enemy.size/2,
-                            enemy.y + enemy.size/2,
-                            enemy_color
-                        )
-                        self.game.enemies.remove(enemy)
-                        self.game.score += 10  # Basic score for defeating enemy
-                        
-                        # Add bonus score based on enemy type
-                        if enemy.enemy_type == "fast":
-                            self.game.score += 5  # Fast enemies worth more
-                        elif enemy.enemy_type == "tank":
-                            self.game.score += 10  # Tank enemies worth even more
+            def update_enemy(enemy, delta_time):
+                enemy.update(self.game.enemies, delta_time, grid=grid, flow_field=flow_field)
+                grid.move(enemy, enemy.x + enemy.size/2, enemy.y + enemy.size/2)
+            
+            # The scheduler picks which enemies move this frame based on distance
+            self.game.ai_scheduler.run(self.game.enemies, self.game.player, update_enemy)
+        
+        # Projectile, player and attack hits on enemies all come from one pass
+        self.resolve_collisions()
         
         # Update click indicators
         self.update_click_indicators()
@@ -206,7 +186,91 @@ class PlayingState(GameState):
         if len(self.game.enemies) == 0:
             self.game.set_state(STATE_VICTORY)
             
+    def resolve_collisions(self):
+        """Find all contacts for this frame and apply their gameplay effects"""
+        player = self.game.player
+        world = self.game.collision_world
+        world.clear()
+        world.add(player, player.get_rect(), LAYER_PLAYER)
+        if player.is_attacking and hasattr(player, 'get_attack_rect'):
+            attack_rect = player.get_attack_rect()
+            if attack_rect:
+                world.add(player, attack_rect, LAYER_PLAYER_ATTACK)
+        for enemy in self.game.enemies:
+            world.add(enemy, enemy.get_rect(), LAYER_ENEMY)
+        # Projectiles cover their whole path this frame so fast ones can't skip enemies
+        buffer = self.game.projectile_buffer
+        if buffer is not None:
+            # Buffered projectiles take part as their slot numbers
+            for slot, rect in buffer.swept_rects():
+                world.add(slot, rect, LAYER_PROJECTILE)
+            get_segment = buffer.get_segment
+        else:
+            for projectile in self.game.projectiles:
+                world.add(projectile, projectile.get_swept_rect(), LAYER_PROJECTILE)
+            get_segment = None
+        contacts = world.find_contacts()
+        
+        defeated = set()
+        spent = set()
+        
+        # Each projectile hits the earliest enemy along its path and is used up
+        swept_hits = sweep_contacts(contacts[(LAYER_PROJECTILE, LAYER_ENEMY)], get_segment)
+        for projectile, enemies_hit in swept_hits:
+            for enemy in enemies_hit:
+                if enemy in defeated:
+                    continue
+                spent.add(projectile)
+                if buffer is not None:
+                    damage = float(buffer.damage[projectile])
+                else:
+                    damage = projectile.damage
+                if enemy.take_damage(damage):
+                    self.defeat_enemy(enemy)
+                    defeated.add(enemy)
+                break
+        
+        # Player hit by enemies
+        for _, enemy in contacts[(LAYER_PLAYER, LAYER_ENEMY)]:
+            if enemy not in defeated:
+                player.take_damage(enemy.damage)  # Use enemy's damage value
+        
+        # Player attack hitting enemies
+        for _, enemy in contacts[(LAYER_PLAYER_ATTACK, LAYER_ENEMY)]:
+            if enemy not in defeated and enemy.take_damage(player.damage):
+                self.defeat_enemy(enemy)
+                defeated.add(enemy)
+        
+        # Drop used projectiles and defeated enemies with one rebuild each
+        if spent:
+            if buffer is not None:
+                buffer.remove(spent)
+            else:
+                self.game.projectiles = [p for p in self.game.projectiles if p not in spent]
+        if defeated:
+            self.game.enemies = [e for e in self.game.enemies if e not in defeated]
+            for enemy in defeated:
+                self.game.enemy_grid.remove(enemy)
+        
+        # Check if player is defeated
+        if player.health <= 0:
+            self.game.set_state(STATE_GAME_OVER)
+            
+    def defeat_enemy(self, enemy):
+        """Play the death effect and award score for a defeated enemy"""
+        self.game.create_death_effect(
+            enemy.x + enemy.size/2,
+            enemy.y + enemy.size/2,
+            enemy.color
+        )
+        # Score for defeating enemy comes from its archetype
+        self.game.score += enemy.archetype.score
+            
     def create_click_indicator(self, position):
+        # Skipped at low quality levels to save drawing
+        if not self.game.click_indicators_enabled:
+            return
+        
         # Create a temporary visual effect at the clicked position
         indicator = {
             'position': position,
@@ -226,46 +290,59 @@ class PlayingState(GameState):
                 self.click_indicators.remove(indicator)
         
     def draw(self, screen):
-        # Draw background
-        if hasattr(self.game.assets, 'get_image') and "background" in self.game.assets.images:
-            screen.blit(self.game.assets.get_image("background"), (0, 0))
-        else:
-            screen.fill((0, 0, 0))  # Fallback to black background
+        compositor = self.game.compositor
+        
+        # Draw background (only under last frame's drawing when redrawing in part)
+        compositor.draw_background(screen)
         
         # Draw click indicators
         self.draw_click_indicators(screen)
         
-        # Draw projectiles if they exist
-        if hasattr(self.game, 'projectiles'):
-            for projectile in self.game.projectiles:
-                projectile.draw(screen)
-        
-        # Draw player
-        self.game.player.draw(screen)
+        # Moving things are drawn between their last two tick positions
+        alpha = self.game.render_alpha
         
-        # Draw enemies
-        for enemy in self.game.enemies:
-            enemy.draw(screen)
+        # Draw projectiles if they exist
+        queue = self.game.render_queue
+        buffer = self.game.projectile_buffer
+        if buffer is not None:
+            # The buffer already batches its own blits, below every queued layer
+            buffer.draw(screen, alpha)
+            if buffer.count:
+                xs, ys = buffer.positions(alpha)
+                compositor.mark_points(xs, ys, buffer.size[:buffer.count].max())
+        elif hasattr(self.game, 'projectiles'):
+            queue.submit_many([(projectile.get_sprite(), projectile.get_sprite_position(alpha))
+                               for projectile in self.game.projectiles], RENDER_LAYER_PROJECTILE)
+        
+        # Queue the player and enemies, then draw everything in one blits call per layer
+        player = self.game.player
+        queue.submit(player.get_sprite(), player.get_draw_position(alpha), RENDER_LAYER_PLAYER)
+        queue.submit_many([enemy.get_draw_entry(alpha) for enemy in self.game.enemies],
+                          RENDER_LAYER_ENEMY)
+        compositor.mark_all(queue.flush(screen))
+        
+        # Player markers go on top of the sprites
+        compositor.mark_all(player.draw_indicators(screen))
         
         # Draw UI elements
         if hasattr(self.game, 'ui_manager'):
-            self.game.ui_manager.draw_playing_ui(screen)
+            compositor.mark_all(self.game.ui_manager.draw_playing_ui(screen))
         else:
             # Fallback UI if ui_manager not available
-            font = self.game.assets.get_font("small")
-            score_text = font.render(f"Score: {self.game.score}", True, (255, 255, 255))
-            health_text = font.render(f"Health: {self.game.player.health}", True, (255, 255, 255))
+            score_text = self.game.assets.render_text("small", f"Score: {self.game.score}", (255, 255, 255))
+            health_text = self.game.assets.render_text("small", f"Health: {self.game.player.health}", (255, 255, 255))
             
-            screen.blit(score_text, (10, 10))
-            screen.blit(health_text, (10, 40))
+            compositor.mark(screen.blit(score_text, (10, 10)))
+            compositor.mark(screen.blit(health_text, (10, 40)))
         
     def draw_click_indicators(self, screen):
+        pool = self.game.surface_pool
         for indicator in self.click_indicators:
-            s = pygame.Surface((indicator['radius'] * 2, indicator['radius'] * 2), pygame.SRCALPHA)
+            s = pool.acquire((indicator['radius'] * 2, indicator['radius'] * 2), pygame.SRCALPHA)
             pygame.draw.circle(s, (*indicator['color'], indicator['alpha']), 
                               (indicator['radius'], indicator['radius']), indicator['radius'], 2)
-            screen.blit(s, (indicator['position'][0] - indicator['radius'], 
-                           indicator['position'][1] - indicator['radius']))
+            self.game.compositor.mark(screen.blit(s, (indicator['position'][0] - indicator['radius'], 
+                                                      indicator['position'][1] - indicator['radius'])))
 
     def enter(self):
         # Reset the player's target position when entering the playing state
@@ -281,7 +358,7 @@ class PlayingState(GameState):
             self.game.projectiles = []
         
         # Play game music if available
-        if hasattr(self.game.assets, 'play_sound') and "game_music" in self.game.assets.sounds:
+        if hasattr(self.game.assets, 'play_sound') and self.game.assets.has_sound("game_music"):
             self.game.assets.play_sound("game_music")
             
     def exit(self):
@@ -318,14 +395,13 @@ class PausedState(GameState):
         self.game.states[STATE_PLAYING].draw(screen)
         
         # Draw semi-transparent overlay
-        overlay = pygame.Surface((screen.get_width(), screen.get_height()))
+        overlay = self.game.surface_pool.acquire(screen.get_size())
         overlay.fill((0, 0, 0))
         overlay.set_alpha(150)
         screen.blit(overlay, (0, 0))
         
         # Draw pause menu
-        font = self.game.assets.get_font("main")
-        text = font.render("PAUSED", True, (255, 255, 255))
+        text = self.game.assets.render_text("main", "PAUSED", (255, 255, 255))
         text_rect = text.get_rect(center=(self.game.design_width // 2, 100))
         screen.blit(text, text_rect)
         
@@ -341,9 +417,25 @@ class PausedState(GameState):
         # Resume any sounds or music if needed
         pass
 
+def create_result_panel(game, title, title_color, background_color):
+    """Build the retained end screen panel and return it with its score text"""
+    center_x = game.design_width // 2
+    center_y = game.design_height // 2
+    panel = RetainedPanel((game.design_width, game.design_height),
+                          lambda surface: surface.fill(background_color))
+    panel.add(TextBox(center_x, center_y - 50, title, "main", title_color, assets=game.assets))
+    score_text = panel.add(TextBox(center_x, center_y + 20, "", "main", assets=game.assets))
+    panel.add(TextBox(center_x, center_y + 80, "Press any key to return to menu", "main",
+                      assets=game.assets))
+    return panel, score_text
+
 class GameOverState(GameState):
     def __init__(self, game):
         super().__init__(game)
+        # Dimmed background with red title
+        self.panel, self.score_text = create_result_panel(
+            game, "GAME OVER", (255, 0, 0), (0, 0, 0)
+        )
         
     def handle_events(self, events):
         for event in events:
@@ -358,31 +450,15 @@ class GameOverState(GameState):
         pass
         
     def draw(self, screen):
-        # Draw background (dimmed)
-        screen.fill((0, 0, 0))
-        
-        # Draw "Game Over" text
-        font = self.game.assets.get_font("main")
-        text = font.render("GAME OVER", True, (255, 0, 0))
-        text_rect = text.get_rect(center=(self.game.design_width // 2, self.game.design_height // 2 - 50))
-        screen.blit(text, text_rect)
-        
-        # Draw score if available
+        # Show the score if available; only a changed score is redrawn
         if hasattr(self.game, 'score'):
-            score_font = self.game.assets.get_font("main")
-            score_text = score_font.render(f"Final Score: {self.game.score}", True, (255, 255, 255))
-            score_rect = score_text.get_rect(center=(self.game.design_width // 2, self.game.design_height // 2 + 20))
-            screen.blit(score_text, score_rect)
-        
-        # Draw "Press any key to continue" text
-        prompt_font = self.game.assets.get_font("main")
-        prompt_text = prompt_font.render("Press any key to return to menu", True, (255, 255, 255))
-        prompt_rect = prompt_text.get_rect(center=(self.game.design_width // 2, self.game.design_height // 2 + 80))
-        screen.blit(prompt_text, prompt_rect)
+            self.score_text.update_text(f"Final Score: {self.game.score}")
+        
+        self.panel.draw(screen)
     
     def enter(self):
         # Play game over sound if available
-        if hasattr(self.game.assets, 'play_sound') and "game_over" in self.game.assets.sounds:
+        if hasattr(self.game.assets, 'play_sound') and self.game.assets.has_sound("game_over"):
             self.game.assets.play_sound("game_over")
     
     def exit(self):
@@ -392,6 +468,10 @@ class GameOverState(GameState):
 class VictoryState(GameState):
     def __init__(self, game):
         super().__init__(game)
+        # Festive dark blue background with gold text
+        self.panel, self.score_text = create_result_panel(
+            game, "VICTORY!", (255, 215, 0), (0, 0, 50)
+        )
         
     def handle_events(self, events):
         for event in events:
@@ -406,33 +486,59 @@ class VictoryState(GameState):
         pass
         
     def draw(self, screen):
-        # Draw background (festive)
-        screen.fill((0, 0, 50))  # Dark blue background
-        
-        # Draw "Victory!" text
-        font = self.game.assets.get_font("main")
-        text = font.render("VICTORY!", True, (255, 215, 0))  # Gold color
-        text_rect = text.get_rect(center=(self.game.design_width // 2, self.game.design_height // 2 - 50))
-        screen.blit(text, text_rect)
-        
-        # Draw score if available
+        # Show the score if available; only a changed score is redrawn
         if hasattr(self.game, 'score'):
-            score_font = self.game.assets.get_font("main")
-            score_text = score_font.render(f"Final Score: {self.game.score}", True, (255, 255, 255))
-            score_rect = score_text.get_rect(center=(self.game.design_width // 2, self.game.design_height // 2 + 20))
-            screen.blit(score_text, score_rect)
-        
-        # Draw "Press any key to continue" text
-        prompt_font = self.game.assets.get_font("main")
-        prompt_text = prompt_font.render("Press any key to return to menu", True, (255, 255, 255))
-        prompt_rect = prompt_text.get_rect(center=(self.game.design_width // 2, self.game.design_height // 2 + 80))
-        screen.blit(prompt_text, prompt_rect)
+            self.score_text.update_text(f"Final Score: {self.game.score}")
+        
+        self.panel.draw(screen)
     
     def enter(self):
         # Play victory sound if available
-        if hasattr(self.game.assets, 'play_sound') and "victory" in self.game.assets.sounds:
+        if hasattr(self.game.assets, 'play_sound') and self.game.assets.has_sound("victory"):
             self.game.assets.play_sound("victory")
     
     def exit(self):
         # Clean up any victory specific resources
         pass
+
+class LoadingState(GameState):
+    """Shows progress while the next state's assets are loaded"""
+    
+    def __init__(self, game):
+        super().__init__(game)
+        self.next_state = STATE_MENU
+        self.total = 1  # Assets outstanding when loading began
+        # pygame's built-in font, so the loading screen needs nothing loaded itself
+        self.font = pygame.font.Font(None, 36)
+        
+    def handle_events(self, events):
+        for event in events:
+            if event.type == pygame.QUIT:
+                self.game.running = False
+                
+    def update(self):
+        # Files decode in the background; conversion and fonts take a
+        # few milliseconds of each tick here
+        if self.game.assets.finish_loaded() == 0:
+            self.game.set_state(self.next_state)
+        
+    def draw(self, screen):
+        screen.fill(MENU_BG_COLOR)
+        
+        done = self.total - len(self.game.assets.outstanding)
+        progress = min(1.0, done / self.total)
+        
+        # Progress bar in the middle of the screen
+        bar = pygame.Rect(0, 0, 400, 30)
+        bar.center = (SCREEN_WIDTH // 2, SCREEN_HEIGHT // 2)
+        pygame.draw.rect(screen, MENU_TEXT_COLOR, bar, 2)
+        filled = bar.inflate(-8, -8)
+        filled.width = int(filled.width * progress)
+        pygame.draw.rect(screen, MENU_HIGHLIGHT_COLOR, filled)
+        
+        text = self.font.render(f"Loading... {progress:.0%}", True, MENU_TEXT_COLOR)
+        screen.blit(text, text.get_rect(midbottom=(bar.centerx, bar.top - 10)))
+        
+    def enter(self):
+        # Measure progress against everything waiting to load now
+        self.total = max(1, len(self.game.assets.outstanding))
@@ -0,0 +1,68 @@
+# glyph_atlas.py
+"""Glyph atlases for labels that change often, such as score counters
+
+Not used in-game at the current font sizes: AssetManager.get_glyph_atlas
+only builds one for fonts at least GLYPH_ATLAS_MIN_HEIGHT pixels tall.
+Below that, one blit per glyph measured slower than the text cache's one
+blit per label, and the HUD's "small" and "main" fonts are both below it.
+"""
+import pygame
+from constants import GLYPH_ATLAS_CHARSET
+
+
+class GlyphAtlas:
+    """One surface holding pre-rendered glyphs of a font and color
+
+    Labels made only of atlas characters are drawn by blitting glyph sub-rects
+    in a single blits() call, so counters that change every frame never go
+    back through SDL_ttf. Glyphs are placed by their own widths, so there is
+    no kerning - fine for digits and short HUD labels.
+    """
+
+    def __init__(self, font, color, charset=GLYPH_ATLAS_CHARSET, antialias=True):
+        glyphs = [(char, font.render(char, antialias, color)) for char in dict.fromkeys(charset)]
+        self.height = font.get_height()  # Same line height as rendering the whole string
+        width = sum(glyph.get_width() for _, glyph in glyphs)
+
+        # Lay the glyphs out in one row; MAX blending onto the clear surface
+        # copies their alpha exactly instead of blending it
+        surface = pygame.Surface((max(1, width), self.height), pygame.SRCALPHA)
+        self.rects = {}  # Character -> area of the atlas surface
+        x = 0
+        for char, glyph in glyphs:
+            surface.blit(glyph, (x, 0), special_flags=pygame.BLEND_RGBA_MAX)
+            self.rects[char] = pygame.Rect(x, 0, glyph.get_width(), self.height)
+            x += glyph.get_width()
+
+        # Premultiplied alpha takes a faster blending path where pygame has it
+        if hasattr(pygame, "BLEND_PREMULTIPLIED") and hasattr(surface, "premul_alpha"):
+            self.surface = surface.premul_alpha()
+            self.blend_flags = pygame.BLEND_PREMULTIPLIED
+        else:
+            self.surface = surface
+            self.blend_flags = 0
+
+    def supports(self, text):
+        """Check if every character of text is in the atlas"""
+        rects = self.rects
+        return all(char in rects for char in text)
+
+    def size(self, text):
+        """Get the (width, height) text takes when drawn from the atlas"""
+        rects = self.rects
+        return sum(rects[char].width for char in text), self.height
+
+    def draw(self, surface, text, pos):
+        """Draw text with its top left at pos and return the area drawn"""
+        atlas = self.surface
+        rects = self.rects
+        flags = self.blend_flags
+        left, y = int(pos[0]), int(pos[1])
+        x = left
+        sequence = []
+        for char in text:
+            rect = rects[char]
+            sequence.append((atlas, (x, y), rect, flags))
+            x += rect.width
+        surface.blits(sequence, doreturn=False)
+        return pygame.Rect(left, y, x - left, self.height)
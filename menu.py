@@ -4,7 +4,7 @@ from constants import (
     SCREEN_WIDTH, SCREEN_HEIGHT, MENU_BG_COLOR, 
     MENU_TEXT_COLOR, MENU_HIGHLIGHT_COLOR, STATE_PLAYING
 )
-from ui import Button, TextBox
+from ui import Button, TextBox, RetainedPanel
 
 class Menu:
     def __init__(self, game):
@@ -13,47 +13,51 @@ class Menu:
         self.texts = []
         self._create_menu_elements()
         
+        # Keep the menu composed, redrawing buttons only when hover changes
+        self.panel = RetainedPanel((SCREEN_WIDTH, SCREEN_HEIGHT), self._draw_background)
+        for widget in self.texts + self.buttons:
+            self.panel.add(widget)
+        
     def _create_menu_elements(self):
         """Create buttons and text elements for the menu"""
         center_x = SCREEN_WIDTH // 2
         
         # Create title
-        title_font = self.game.assets.get_font("title")
+        assets = self.game.assets
         self.texts.append(TextBox(
-            center_x, 100, "YOUR GAME", title_font, MENU_TEXT_COLOR
+            center_x, 100, "YOUR GAME", "title", MENU_TEXT_COLOR, assets=assets
         ))
         
         # Create buttons
-        button_font = self.game.assets.get_font("main")
         button_width, button_height = 200, 50
         button_x = center_x - button_width // 2
         
         # Start button
         self.buttons.append(Button(
             button_x, 250, button_width, button_height,
-            "Start Game", button_font,
-            action=lambda: self.game.set_state(STATE_PLAYING)
+            "Start Game", "main",
+            action=lambda: self.game.load_state(STATE_PLAYING), assets=assets
         ))
         
         # Options button
         self.buttons.append(Button(
             button_x, 320, button_width, button_height,
-            "Options", button_font,
-            action=self.show_options
+            "Options", "main",
+            action=self.show_options, assets=assets
         ))
         
         # Credits button
         self.buttons.append(Button(
             button_x, 390, button_width, button_height,
-            "Credits", button_font,
-            action=self.show_credits
+            "Credits", "main",
+            action=self.show_credits, assets=assets
         ))
         
         # Quit button
         self.buttons.append(Button(
             button_x, 460, button_width, button_height,
-            "Quit", button_font,
-            action=self.quit_game
+            "Quit", "main",
+            action=self.quit_game, assets=assets
         ))
         
     def update(self, mouse_pos):
@@ -61,22 +65,17 @@ class Menu:
         for button in self.buttons:
             button.update(mouse_pos)
             
-    def draw(self, screen):
-        """Draw the menu"""
-        # Draw background
-        screen.fill(MENU_BG_COLOR)
+    def _draw_background(self, surface):
+        """Draw the menu backdrop behind the widgets"""
+        surface.fill(MENU_BG_COLOR)
         
         # Optional: Draw background image
         bg_image = self.game.assets.get_image("menu_bg")
-        screen.blit(bg_image, (0, 0))
+        surface.blit(bg_image, (0, 0))
         
-        # Draw text elements
-        for text in self.texts:
-            text.draw(screen)
-            
-        # Draw buttons
-        for button in self.buttons:
-            button.draw(screen)
+    def draw(self, screen):
+        """Draw the menu"""
+        self.panel.draw(screen)
             
     def handle_events(self, event):
         """Handle menu input events"""
@@ -0,0 +1,189 @@
+# particles.py
+from constants import FPS, PARTICLE_CAPACITY
+from sprite_cache import CircleSpriteCache
+
+# NumPy is optional - Game falls back to its particle list without it
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+
+class ParticleSystem:
+    """Fixed-capacity particle store kept in NumPy arrays used as a ring buffer
+
+    New particles are written at the head of the ring, so once the buffer is
+    full each emit overwrites the oldest particles first.
+    """
+
+    def __init__(self, capacity=PARTICLE_CAPACITY, seed=None, sprite_cache=None):
+        if np is None:
+            raise ImportError("ParticleSystem requires numpy")
+
+        self.capacity = capacity
+        self.limit = capacity  # Most particles alive at once, lowered to shed load
+        self.sprite_cache = sprite_cache if sprite_cache is not None else CircleSpriteCache()
+        self.rng = np.random.default_rng(seed)
+
+        self.x = np.zeros(capacity, dtype=np.float32)
+        self.y = np.zeros(capacity, dtype=np.float32)
+        self.dx = np.zeros(capacity, dtype=np.float32)
+        self.dy = np.zeros(capacity, dtype=np.float32)
+        self.size = np.zeros(capacity, dtype=np.float32)
+        self.color = np.zeros((capacity, 3), dtype=np.uint8)
+        self.lifetime = np.ones(capacity, dtype=np.float32)
+        self.time_left = np.zeros(capacity, dtype=np.float32)
+        self.alive = np.zeros(capacity, dtype=bool)
+
+        self.head = 0  # Next slot to write
+        self.used = 0  # Slots [0, used) have ever held a particle
+        self.live_count = 0
+        self.evicted_count = 0  # Live particles overwritten by emits, for tuning the cap
+
+    @staticmethod
+    def available():
+        """Check if the particle system can be used"""
+        return np is not None
+
+    def __len__(self):
+        return self.live_count
+
+    def clear(self):
+        """Remove every particle"""
+        self.alive[:] = False
+        self.head = 0
+        self.used = 0
+        self.live_count = 0
+        self.evicted_count = 0
+
+    def set_limit(self, limit):
+        """Cap the live particles below capacity, expiring the oldest ones over it"""
+        self.limit = max(0, min(limit, self.capacity))
+        self.trim(self.limit)
+
+    def trim(self, limit):
+        """Expire the oldest live particles until at most limit are left"""
+        excess = self.live_count - limit
+        if excess <= 0:
+            return
+        self.alive[self.live_slots()[:excess]] = False
+        self.live_count -= excess
+        self.evicted_count += excess
+
+    def emit(self, x, y, count, color, speed=(1, 3), size=(2, 6), lifetime=(0.5, 1.5)):
+        """Burst count particles out of (x, y) in random directions
+
+        speed, size and lifetime are (min, max) ranges; sizes are whole pixels
+        and lifetimes are in seconds.
+        """
+        count = min(count, self.limit)
+        if count <= 0:
+            return
+
+        # Make room under the live cap by expiring the oldest particles
+        if self.limit < self.capacity:
+            self.trim(self.limit - count)
+
+        # Ring slots to write, wrapping around the end of the arrays
+        slots = (self.head + np.arange(count)) % self.capacity
+        self.head = (self.head + count) % self.capacity
+        self.used = max(self.used, min(self.capacity, int(slots.max()) + 1))
+
+        # Overwritten particles that were still alive are the evicted oldest ones
+        evicted = int(self.alive[slots].sum())
+        self.evicted_count += evicted
+        self.live_count += count - evicted
+
+        # Draw every random value for the burst at once
+        random = self.rng.random((3, count), dtype=np.float32)
+        speeds = speed[0] + random[0] * (speed[1] - speed[0])
+        angles = random[1] * (2 * np.pi)
+        lifetimes = lifetime[0] + random[2] * (lifetime[1] - lifetime[0])
+
+        self.x[slots] = x
+        self.y[slots] = y
+        self.dx[slots] = np.cos(angles) * speeds
+        self.dy[slots] = np.sin(angles) * speeds
+        self.size[slots] = self.rng.integers(size[0], size[1] + 1, count)
+        self.color[slots] = color[:3]
+        self.lifetime[slots] = lifetimes
+        self.time_left[slots] = lifetimes
+        self.alive[slots] = True
+
+    def update(self, delta_time=1/60):
+        """Move and age every particle, expiring the ones whose time is up"""
+        if self.live_count == 0:
+            return
+
+        n = self.used
+        alive = self.alive[:n]
+        steps = delta_time * FPS
+
+        # Dead slots are moved too - it's cheaper than masking and they're never drawn
+        self.x[:n] += self.dx[:n] * steps
+        self.y[:n] += self.dy[:n] * steps
+        time_left = self.time_left[:n]
+        time_left -= delta_time
+        alive &= time_left > 0
+
+        self.live_count = int(alive.sum())
+        if self.live_count == 0:
+            # Start writing from the front again so updates stay short
+            self.head = 0
+            self.used = 0
+
+    def live_slots(self):
+        """Get the slots of live particles, oldest first"""
+        n = self.used
+        if self.live_count == 0:
+            return np.empty(0, dtype=np.intp)
+        if n < self.capacity:
+            return np.flatnonzero(self.alive[:n])
+
+        # The oldest particles start at the head once the ring has wrapped
+        head = self.head
+        return np.concatenate((np.flatnonzero(self.alive[head:]) + head,
+                               np.flatnonzero(self.alive[:head])))
+
+    def live_positions(self):
+        """Get the x and y coordinates of live particles"""
+        slots = self.live_slots()
+        return self.x[slots], self.y[slots]
+
+    def max_radius(self):
+        """Get the largest radius any live particle is drawn with"""
+        if self.live_count == 0:
+            return 0
+        return int(self.size[:self.used].max())
+
+    def draw(self, surface):
+        """Draw every live particle, shrinking and fading with age, in one blits call"""
+        slots = self.live_slots()
+        if len(slots) == 0:
+            return
+
+        cache = self.sprite_cache
+        fade = self.time_left[slots] / self.lifetime[slots]
+        radius = np.minimum(self.size[slots] * fade, 255).astype(np.int64)
+        bucket = np.rint(fade * (cache.alpha_levels - 1)).astype(np.int64)
+
+        # Fully shrunk or faded particles draw nothing
+        visible = (radius > 0) & (bucket > 0)
+        slots, radius, bucket = slots[visible], radius[visible], bucket[visible]
+        if len(slots) == 0:
+            return
+
+        # Pack (color, radius, bucket) into one number so each sprite is looked up once
+        color = self.color[slots].astype(np.int64)
+        codes = ((color[:, 0] << 32) | (color[:, 1] << 24) | (color[:, 2] << 16) |
+                 (radius << 8) | bucket)
+        unique_codes, sprite_index = np.unique(codes, return_inverse=True)
+        sprites = [cache.get((code >> 8) & 255,
+                             ((code >> 32) & 255, (code >> 24) & 255, (code >> 16) & 255),
+                             code & 255)
+                   for code in unique_codes.tolist()]
+
+        left = (self.x[slots].astype(np.int64) - radius).tolist()
+        top = (self.y[slots].astype(np.int64) - radius).tolist()
+        surface.blits([(sprites[index], position) for index, position in
+                       zip(sprite_index.tolist(), zip(left, top))], doreturn=False)
@@ -5,10 +5,14 @@ class Player:
     def __init__(self, x, y):
         self.x = x
         self.y = y
+        self.prev_x = x  # Position at the start of the current tick, for interpolated drawing
+        self.prev_y = y
         self.size = PLAYER_SIZE
         self.speed = PLAYER_SPEED
         self.color = BLUE
         self.image = None
+        self.square_sprite = None  # Drawn when there's no image
+        self.square_sprite_key = None
         self.health = 100
         self.score = 0
         self.target_position = None
@@ -69,24 +73,46 @@ class Player:
             if self.attack_cooldown <= 0:
                 self.is_attacking = False
         
-    def draw(self, screen):
-        """Draw the player"""
+    def get_draw_position(self, alpha=1.0):
+        """Get where to draw the player, alpha of the way from the tick's start to now"""
+        if alpha == 1.0:
+            return self.x, self.y
+        return (self.prev_x + (self.x - self.prev_x) * alpha,
+                self.prev_y + (self.y - self.prev_y) * alpha)
+        
+    def get_sprite(self):
+        """Get the surface to draw: the image, or a plain square if no image"""
         if self.image:
-            screen.blit(self.image, (self.x, self.y))
-        else:
-            pygame.draw.rect(screen, self.color, (self.x, self.y, self.size, self.size))
-            
+            return self.image
+        key = (self.size, self.color)
+        if self.square_sprite is None or self.square_sprite_key != key:
+            self.square_sprite = pygame.Surface((self.size, self.size))
+            self.square_sprite.fill(self.color)
+            self.square_sprite_key = key
+        return self.square_sprite
+        
+    def draw(self, screen):
+        """Draw the player and return the list of areas drawn"""
+        drawn = [screen.blit(self.get_sprite(), (self.x, self.y))]
+        drawn.extend(self.draw_indicators(screen))
+        return drawn
+        
+    def draw_indicators(self, screen):
+        """Draw the movement target and attack markers and return the list of areas drawn"""
+        drawn = []
+        
         # Optionally draw a small indicator at the target position if moving
         if self.target_position:
-            pygame.draw.circle(screen, (255, 255, 0), self.target_position, 3, 1)
+            drawn.append(pygame.draw.circle(screen, (255, 255, 0), self.target_position, 3, 1))
             
         # Optionally draw attack indicator
         if self.is_attacking:
             # Draw a simple attack animation (e.g., a circle around the player)
             attack_radius = self.size * 1.5
-            pygame.draw.circle(screen, (255, 100, 100), 
+            drawn.append(pygame.draw.circle(screen, (255, 100, 100), 
                               (int(self.x + self.size/2), int(self.y + self.size/2)), 
-                              int(attack_radius), 2)
+                              int(attack_radius), 2))
+        return drawn
             
     def get_rect(self):
         """Get the player's collision rectangle"""
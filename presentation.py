@@ -0,0 +1,190 @@
+# presentation.py
+import pygame
+from constants import (
+    PRESENT_NATIVE, PRESENT_INTEGER, PRESENT_SCALED, PRESENT_SMOOTH,
+    QUALITY_FAST, QUALITY_SHARP
+)
+
+
+class Presenter:
+    """Copies the render surface to the screen 1:1 (native resolution)"""
+    mode = PRESENT_NATIVE
+
+    def __init__(self):
+        self.offset = (0, 0)
+        self.size = (0, 0)  # Size of the picture on screen
+
+    def fit(self, screen_size, design_size):
+        """Get the on-screen picture size for this mode"""
+        return design_size
+
+    def setup(self, screen_size, design_size):
+        """Work out the picture size and offset for a screen"""
+        self.size = self.fit(screen_size, design_size)
+        self.offset = ((screen_size[0] - self.size[0]) // 2,
+                       (screen_size[1] - self.size[1]) // 2)
+
+    def present_full(self, render_surface, screen):
+        """Draw the whole render surface onto the screen"""
+        screen.blit(render_surface, self.offset)
+
+    def present_rects(self, render_surface, screen, rects):
+        """Draw parts of the render surface onto the screen, returning the screen rects changed"""
+        screen_rects = [rect.move(self.offset) for rect in rects]
+        screen.blits(list(zip([render_surface] * len(rects), screen_rects, rects)),
+                     doreturn=False)
+        return screen_rects
+
+
+class ScaledPresenter(Presenter):
+    """Native-size display surface that SDL scales to the window (pygame.SCALED)"""
+    mode = PRESENT_SCALED
+
+
+class IntegerPresenter(Presenter):
+    """Nearest-neighbour scaling by the largest whole-number factor that fits"""
+    mode = PRESENT_INTEGER
+
+    def __init__(self):
+        super().__init__()
+        self.factor = 1
+        self.target = None  # Cached scaled surface, reused every frame
+
+    def fit(self, screen_size, design_size):
+        self.factor = max(1, min(screen_size[0] // design_size[0],
+                                 screen_size[1] // design_size[1]))
+        return (design_size[0] * self.factor, design_size[1] * self.factor)
+
+    def present_full(self, render_surface, screen):
+        if self.factor == 1:
+            # Screen too small to double - just center it
+            return super().present_full(render_surface, screen)
+        pygame.transform.scale(render_surface, self.size, self.get_target(render_surface))
+        screen.blit(self.target, self.offset)
+
+    def get_target(self, render_surface):
+        """Get the cached scaled surface, remade only when the picture size changes"""
+        if self.target is None or self.target.get_size() != self.size:
+            self.target = pygame.Surface(self.size, 0, render_surface)
+        return self.target
+
+    def present_rects(self, render_surface, screen, rects):
+        factor = self.factor
+        if factor == 1:
+            return super().present_rects(render_surface, screen, rects)
+        target = self.get_target(render_surface)
+        screen_rects = []
+        for rect in rects:
+            # Whole-number scaling maps each rect to an exact area of the
+            # cached target, so scale straight into it instead of a new surface
+            scaled_rect = pygame.Rect(rect.left * factor, rect.top * factor,
+                                      rect.width * factor, rect.height * factor)
+            pygame.transform.scale(render_surface.subsurface(rect), scaled_rect.size,
+                                   target.subsurface(scaled_rect))
+            screen_rects.append(screen.blit(target, scaled_rect.move(self.offset), scaled_rect))
+        return screen_rects
+
+
+class SmoothPresenter(Presenter):
+    """Bilinear smoothscale to the largest size that keeps the aspect ratio"""
+    mode = PRESENT_SMOOTH
+
+    def __init__(self):
+        super().__init__()
+        self.target = None  # Cached scaled surface, reused every frame
+
+    def fit(self, screen_size, design_size):
+        # Calculate aspect ratios
+        render_ratio = design_size[0] / design_size[1]
+        screen_ratio = screen_size[0] / screen_size[1]
+        if screen_ratio > render_ratio:  # Screen is wider than game
+            # Height will match screen, width will be scaled
+            return (int(screen_size[1] * render_ratio), screen_size[1])
+        # Screen is taller than game - width will match screen, height will be scaled
+        return (screen_size[0], int(screen_size[0] / render_ratio))
+
+    def present_full(self, render_surface, screen):
+        pygame.transform.smoothscale(render_surface, self.size, self.get_target(render_surface))
+        screen.blit(self.target, self.offset)
+
+    def get_target(self, render_surface):
+        """Get the cached scaled surface, remade only when the picture size changes"""
+        if self.target is None or self.target.get_size() != self.size:
+            self.target = pygame.Surface(self.size, 0, render_surface)
+        return self.target
+
+    def scale_rect(self, rect, design_size):
+        """Map a render surface rect to the screen, snapping edges so neighbouring rects meet exactly"""
+        scale_x = self.size[0] / design_size[0]
+        scale_y = self.size[1] / design_size[1]
+        left = self.offset[0] + round(rect.left * scale_x)
+        top = self.offset[1] + round(rect.top * scale_y)
+        right = self.offset[0] + round(rect.right * scale_x)
+        bottom = self.offset[1] + round(rect.bottom * scale_y)
+        return pygame.Rect(left, top, right - left, bottom - top)
+
+    def present_rects(self, render_surface, screen, rects):
+        bounds = render_surface.get_rect()
+        design_size = bounds.size
+        target = self.get_target(render_surface)
+        screen_rects = []
+        for rect in rects:
+            # Smoothscale blends each pixel with its neighbours, so scale a padded
+            # area and update one pixel past the rect to refresh the fringe too
+            padded = rect.inflate(4, 4).clip(bounds)
+            inner = rect.inflate(2, 2).clip(bounds)
+            padded_dest = self.scale_rect(padded, design_size)
+            inner_dest = self.scale_rect(inner, design_size)
+            if padded_dest.width <= 0 or padded_dest.height <= 0:
+                continue
+
+            # Scale into the cached target rather than a new surface; the padding
+            # it overwrites is redone by the next full present anyway
+            target_rect = padded_dest.move(-self.offset[0], -self.offset[1])
+            pygame.transform.smoothscale(render_surface.subsurface(padded), padded_dest.size,
+                                         target.subsurface(target_rect))
+            area = inner_dest.move(-self.offset[0], -self.offset[1])
+            screen_rects.append(screen.blit(target, inner_dest, area))
+        return screen_rects
+
+
+PRESENTERS = {
+    PRESENT_NATIVE: Presenter,
+    PRESENT_SCALED: ScaledPresenter,
+    PRESENT_INTEGER: IntegerPresenter,
+    PRESENT_SMOOTH: SmoothPresenter,
+}
+
+
+def scaled_display_available():
+    """Check if this pygame can let SDL scale the display (pygame.SCALED)"""
+    return hasattr(pygame, "SCALED")
+
+
+def choose_present_mode(quality, screen_size, design_size, allow_scaled=False):
+    """Pick the cheapest presentation mode that meets a quality setting
+
+    Modes from cheapest: native, SDL scaled, integer nearest-neighbour, smoothscale.
+    QUALITY_FAST takes the cheapest mode even if it leaves wider borders,
+    QUALITY_SHARP keeps whole pixels, and anything else fills the screen with
+    filtered scaling like the original renderer.
+    """
+    if tuple(screen_size) == tuple(design_size):
+        return PRESENT_NATIVE
+
+    factor = min(screen_size[0] // design_size[0], screen_size[1] // design_size[1])
+    fills = (screen_size[0] == design_size[0] * factor and
+             screen_size[1] == design_size[1] * factor)
+
+    if quality == QUALITY_SHARP:
+        # Whole pixels when the screen is big enough, otherwise it has to shrink
+        return PRESENT_INTEGER if factor >= 1 else PRESENT_SMOOTH
+
+    if factor >= 1 and fills:
+        # An exact whole-number fit fills the screen without any filtering
+        return PRESENT_INTEGER
+    if allow_scaled and scaled_display_available():
+        return PRESENT_SCALED
+    if quality == QUALITY_FAST and factor >= 1:
+        return PRESENT_INTEGER
+    return PRESENT_SMOOTH
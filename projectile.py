@@ -1,6 +1,13 @@
 import pygame
 import math
 
+# Pre-drawn circles keyed by (color, size)
+_SPRITES = {}
+
+def clear_projectile_sprites():
+    """Forget the pre-drawn circles, e.g. after the display format changes"""
+    _SPRITES.clear()
+
 class Projectile:
     def __init__(self, x, y, target_x, target_y, speed=10, damage=10, size=5, color=(255, 255, 0)):
         self.x = x
@@ -22,10 +29,18 @@ class Projectile:
         # Create a rect for collision detection
         self.rect = pygame.Rect(x - size/2, y - size/2, size, size)
         
+        # Position at the start of the last update, for swept collision
+        self.prev_x = x
+        self.prev_y = y
+        
         # Track lifetime to remove old projectiles
         self.lifetime = 120  # frames (2 seconds at 60 FPS)
         
     def update(self):
+        # Remember where this frame's movement started
+        self.prev_x = self.x
+        self.prev_y = self.y
+        
         # Move the projectile
         self.x += self.dx
         self.y += self.dy
@@ -40,6 +55,38 @@ class Projectile:
         # Return True if the projectile should be removed
         return self.lifetime <= 0
         
+    def get_swept_rect(self):
+        """Get a rect covering the whole path moved during the last update"""
+        start = pygame.Rect(self.prev_x - self.size/2, self.prev_y - self.size/2,
+                            self.size, self.size)
+        return self.rect.union(start)
+        
+    def get_segment(self):
+        """Get the last update's movement as (start x, start y, end x, end y, half size)"""
+        return self.prev_x, self.prev_y, self.x, self.y, self.size / 2
+        
+    def get_sprite(self):
+        """Get a pre-drawn circle for this projectile's color and size"""
+        key = (self.color, self.size)
+        sprite = _SPRITES.get(key)
+        if sprite is None:
+            # Projectiles are solid, so a color key blits much faster than per-pixel alpha
+            colorkey = (0, 0, 0) if tuple(self.color) != (0, 0, 0) else (255, 0, 255)
+            sprite = pygame.Surface((self.size * 2 + 1, self.size * 2 + 1))
+            sprite.fill(colorkey)
+            pygame.draw.circle(sprite, self.color, (self.size, self.size), self.size)
+            sprite.set_colorkey(colorkey, pygame.RLEACCEL)
+            _SPRITES[key] = sprite
+        return sprite
+        
+    def get_sprite_position(self, alpha=1.0):
+        """Get where the top left of the sprite goes, alpha of the way through the last update"""
+        x, y = self.x, self.y
+        if alpha != 1.0:
+            x = self.prev_x + (x - self.prev_x) * alpha
+            y = self.prev_y + (y - self.prev_y) * alpha
+        return int(x) - self.size, int(y) - self.size
+        
     def draw(self, screen):
-        # Draw the projectile as a small circle
-        pygame.draw.circle(screen, self.color, (int(self.x), int(self.y)), self.size)
+        # Draw the projectile as a small circle and return the area drawn
+        return screen.blit(self.get_sprite(), self.get_sprite_position())
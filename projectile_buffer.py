@@ -0,0 +1,184 @@
+# projectile_buffer.py
+import pygame
+from constants import PROJECTILE_CAPACITY, PROJECTILE_OWNER_PLAYER
+
+# NumPy is optional - the buffer is only used when it is installed
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+
+class ProjectileBuffer:
+    """Fixed-capacity projectile store that keeps every projectile in NumPy arrays
+
+    Live projectiles always occupy slots [0, count) in the order they were
+    fired; removals compact the arrays so that stays true.
+    """
+
+    def __init__(self, capacity=PROJECTILE_CAPACITY, color=(255, 255, 0)):
+        if np is None:
+            raise ImportError("ProjectileBuffer requires numpy")
+
+        self.capacity = capacity
+        self.color = color
+        self.warned_color = False  # Warned about a projectile of another color
+        self.count = 0
+
+        self.x = np.zeros(capacity)
+        self.y = np.zeros(capacity)
+        self.prev_x = np.zeros(capacity)
+        self.prev_y = np.zeros(capacity)
+        self.dx = np.zeros(capacity)
+        self.dy = np.zeros(capacity)
+        self.lifetime = np.zeros(capacity, dtype=np.int32)
+        self.damage = np.zeros(capacity)
+        self.size = np.zeros(capacity, dtype=np.int32)
+        self.owner = np.zeros(capacity, dtype=np.int8)
+
+        # Pre-drawn projectile sprites by size
+        self.sprites = {}
+
+    @staticmethod
+    def available():
+        """Check if the projectile buffer can be used"""
+        return np is not None
+
+    def __len__(self):
+        return self.count
+
+    def clear(self):
+        """Remove every projectile"""
+        self.count = 0
+
+    def spawn(self, x, y, dx, dy, damage, size=5, lifetime=120, owner=PROJECTILE_OWNER_PLAYER):
+        """Add a projectile, returns its slot or None if the buffer is full"""
+        if self.count >= self.capacity:
+            return None
+
+        slot = self.count
+        self.x[slot] = self.prev_x[slot] = x
+        self.y[slot] = self.prev_y[slot] = y
+        self.dx[slot] = dx
+        self.dy[slot] = dy
+        self.damage[slot] = damage
+        self.size[slot] = size
+        self.lifetime[slot] = lifetime
+        self.owner[slot] = owner
+        self.count += 1
+        return slot
+
+    def add(self, projectile, owner=PROJECTILE_OWNER_PLAYER):
+        """Copy a Projectile object into the buffer"""
+        if projectile.color != self.color and not self.warned_color:
+            # Once per buffer - this is the spawn path
+            print("Warning: ProjectileBuffer draws every projectile in one color")
+            self.warned_color = True
+        return self.spawn(projectile.x, projectile.y, projectile.dx, projectile.dy,
+                          projectile.damage, projectile.size, projectile.lifetime, owner)
+
+    def update(self, width, height):
+        """Move every projectile and drop expired or off-screen ones"""
+        n = self.count
+        if n == 0:
+            return
+
+        x, y = self.x[:n], self.y[:n]
+        self.prev_x[:n] = x
+        self.prev_y[:n] = y
+        x += self.dx[:n]
+        y += self.dy[:n]
+        self.lifetime[:n] -= 1
+
+        alive = ((self.lifetime[:n] > 0) &
+                 (x >= 0) & (x <= width) & (y >= 0) & (y <= height))
+        if not alive.all():
+            self._compact(alive)
+
+    def remove(self, slots):
+        """Remove the projectiles in the given slots"""
+        if not slots:
+            return
+        keep = np.ones(self.count, dtype=bool)
+        keep[list(slots)] = False
+        self._compact(keep)
+
+    def _compact(self, keep):
+        """Pack the projectiles flagged in keep to the front, preserving order"""
+        n = self.count
+        kept = int(keep.sum())
+        for array in (self.x, self.y, self.prev_x, self.prev_y, self.dx, self.dy,
+                      self.lifetime, self.damage, self.size, self.owner):
+            array[:kept] = array[:n][keep]
+        self.count = kept
+
+    def get_segment(self, slot):
+        """Get a projectile's last movement as (start x, start y, end x, end y, half size)"""
+        return (float(self.prev_x[slot]), float(self.prev_y[slot]),
+                float(self.x[slot]), float(self.y[slot]), float(self.size[slot]) / 2)
+
+    def swept_rects(self):
+        """Get (slot, rect) pairs covering each projectile's path in the last update"""
+        n = self.count
+        if n == 0:
+            return []
+
+        # Same truncation as building a Rect at each end of the path
+        half = self.size[:n] / 2
+        start_left = np.trunc(self.prev_x[:n] - half)
+        start_top = np.trunc(self.prev_y[:n] - half)
+        end_left = np.trunc(self.x[:n] - half)
+        end_top = np.trunc(self.y[:n] - half)
+        left = np.minimum(start_left, end_left)
+        top = np.minimum(start_top, end_top)
+        width = np.maximum(start_left, end_left) - left + self.size[:n]
+        height = np.maximum(start_top, end_top) - top + self.size[:n]
+
+        Rect = pygame.Rect
+        return [(slot, Rect(l, t, w, h)) for slot, (l, t, w, h) in
+                enumerate(zip(left.tolist(), top.tolist(), width.tolist(), height.tolist()))]
+
+    def _get_sprite(self, size):
+        """Get the pre-drawn circle sprite for a projectile size"""
+        sprite = self.sprites.get(size)
+        if sprite is None:
+            # Projectiles are solid, so a color key blits much faster than per-pixel alpha
+            key = (0, 0, 0) if self.color != (0, 0, 0) else (255, 0, 255)
+            sprite = pygame.Surface((size * 2 + 1, size * 2 + 1))
+            sprite.fill(key)
+            pygame.draw.circle(sprite, self.color, (size, size), size)
+            sprite.set_colorkey(key, pygame.RLEACCEL)
+            self.sprites[size] = sprite
+        return sprite
+
+    def positions(self, alpha=1.0):
+        """Get (x, y) arrays of live projectiles, alpha of the way through the last update"""
+        n = self.count
+        if alpha == 1.0:
+            return self.x[:n], self.y[:n]
+        prev_x = self.prev_x[:n]
+        prev_y = self.prev_y[:n]
+        return (prev_x + (self.x[:n] - prev_x) * alpha,
+                prev_y + (self.y[:n] - prev_y) * alpha)
+
+    def draw(self, screen, alpha=1.0):
+        """Draw every projectile with one blits call per projectile size"""
+        n = self.count
+        if n == 0:
+            return
+        xs, ys = self.positions(alpha)
+
+        sizes = self.size[:n]
+        first_size = int(sizes[0])
+        if (sizes == first_size).all():
+            groups = [(first_size, slice(0, n))]
+        else:
+            groups = [(size, sizes == size) for size in np.unique(sizes).tolist()]
+
+        for size, selection in groups:
+            sprite = self._get_sprite(size)
+            positions = np.empty((len(sizes[selection]), 2), dtype=np.int32)
+            positions[:, 0] = xs[selection]
+            positions[:, 1] = ys[selection]
+            positions -= size
+            screen.blits([(sprite, position) for position in positions.tolist()], doreturn=False)
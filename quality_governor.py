@@ -0,0 +1,98 @@
+# quality_governor.py
+from collections import deque
+import pygame
+from constants import (
+    QUALITY_LEVELS, QUALITY_WINDOW_FRAMES, QUALITY_PERCENTILE,
+    QUALITY_LOWER_MS, QUALITY_RAISE_MS,
+    QUALITY_LOWER_COOLDOWN_FRAMES, QUALITY_RAISE_COOLDOWN_FRAMES
+)
+
+
+class QualityGovernor:
+    """Picks a quality level from a rolling percentile of measured frame times
+
+    Quality drops a level when the percentile goes over lower_ms and rises a
+    level when it stays under raise_ms. After any change the window starts
+    over, and raising waits longer than lowering, so a level that was only
+    just too slow isn't tried again straight away.
+    """
+
+    def __init__(self, levels=QUALITY_LEVELS, window=QUALITY_WINDOW_FRAMES,
+                 percentile=QUALITY_PERCENTILE, lower_ms=QUALITY_LOWER_MS,
+                 raise_ms=QUALITY_RAISE_MS,
+                 lower_cooldown=QUALITY_LOWER_COOLDOWN_FRAMES,
+                 raise_cooldown=QUALITY_RAISE_COOLDOWN_FRAMES, verbose=True):
+        self.levels = levels
+        self.percentile = percentile
+        self.lower_ms = lower_ms
+        self.raise_ms = raise_ms
+        self.lower_cooldown = lower_cooldown
+        self.raise_cooldown = raise_cooldown
+        self.verbose = verbose
+
+        self.samples = deque(maxlen=window)
+        self.index = 0  # Current level, 0 is the best
+        self.frames_since_change = 0
+
+        # (seconds, old level name, new level name, reason) for every change
+        self.changes = []
+
+    @property
+    def level(self):
+        """Get the settings of the current quality level"""
+        return self.levels[self.index]
+
+    def reset(self):
+        """Forget the measured frames, keeping the current level"""
+        self.samples.clear()
+        self.frames_since_change = 0
+
+    def frame_time(self):
+        """Get the percentile frame time (ms) of the window, or None until it is full"""
+        samples = self.samples
+        if len(samples) < samples.maxlen:
+            return None
+        ordered = sorted(samples)
+        return ordered[min(len(ordered) - 1, len(ordered) * self.percentile // 100)]
+
+    def record(self, frame_ms, now_ms=None):
+        """Add one frame's time, returning the new level if quality changed, else None"""
+        self.samples.append(frame_ms)
+        self.frames_since_change += 1
+
+        # Only judge a full window measured entirely at the current level
+        measured = self.frame_time()
+        if measured is None:
+            return None
+
+        if (measured > self.lower_ms and self.index < len(self.levels) - 1
+                and self.frames_since_change >= self.lower_cooldown):
+            reason = (f"{self.percentile}th percentile frame time {measured:.1f} ms "
+                      f"over {self.lower_ms:.1f} ms")
+            return self.set_level(self.index + 1, reason, now_ms)
+
+        if (measured < self.raise_ms and self.index > 0
+                and self.frames_since_change >= self.raise_cooldown):
+            reason = (f"{self.percentile}th percentile frame time {measured:.1f} ms "
+                      f"under {self.raise_ms:.1f} ms")
+            return self.set_level(self.index - 1, reason, now_ms)
+        return None
+
+    def set_level(self, index, reason="set by hand", now_ms=None):
+        """Switch to a level, logging when and why, and return its settings"""
+        index = max(0, min(index, len(self.levels) - 1))
+        if index == self.index:
+            return self.level
+        if now_ms is None:
+            now_ms = pygame.time.get_ticks()
+
+        old = self.levels[self.index]["name"]
+        new = self.levels[index]["name"]
+        change = "lowered" if index > self.index else "raised"
+        self.index = index
+        self.changes.append((now_ms / 1000, old, new, reason))
+        self.reset()
+
+        if self.verbose:
+            print(f"Quality {change} from {old} to {new} at {now_ms / 1000:.1f} s: {reason}")
+        return self.level
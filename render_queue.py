@@ -0,0 +1,71 @@
+# render_queue.py
+from constants import RENDER_QUEUE_SORT_TEXTURES
+
+
+def _texture_key(entry):
+    return id(entry[0])
+
+
+class RenderQueue:
+    """Collects sprite blits for a frame and draws them layer by layer
+
+    Entities submit (surface, position) entries - or (surface, position, area)
+    for texture atlas regions - to a layer instead of drawing themselves.
+    flush() draws layers lowest first, each with one blits() call, optionally
+    with entries sorted so blits of the same surface run back to back.
+    """
+
+    def __init__(self, sort_textures=RENDER_QUEUE_SORT_TEXTURES):
+        self.layers = {}  # Layer -> [(surface, position[, area])], lists reused every frame
+        self.sort_textures = sort_textures
+
+        # Stats from the last flush, for tuning
+        self.last_entry_count = 0
+        self.last_batch_count = 0
+
+    def submit(self, surface, position, layer, area=None):
+        """Queue one sprite blit, optionally of just an area of the surface"""
+        entries = self.layers.get(layer)
+        if entries is None:
+            entries = self.layers[layer] = []
+        if area is None:
+            entries.append((surface, position))
+        else:
+            entries.append((surface, position, area))
+            
+    def submit_region(self, region, position, layer):
+        """Queue a blit of a texture atlas region"""
+        self.submit(region.page, position, layer, region.rect)
+
+    def submit_many(self, entries, layer):
+        """Queue a list of (surface, position) or (surface, position, area) blits"""
+        queued = self.layers.get(layer)
+        if queued is None:
+            queued = self.layers[layer] = []
+        queued.extend(entries)
+
+    def clear(self):
+        """Drop everything queued without drawing it"""
+        for entries in self.layers.values():
+            entries.clear()
+
+    def flush(self, target):
+        """Draw and empty every layer, returning the rects drawn"""
+        drawn = []
+        entry_count = 0
+        batch_count = 0
+        for layer in sorted(self.layers):
+            entries = self.layers[layer]
+            if not entries:
+                continue
+            if self.sort_textures:
+                # Stable sort, so sprites sharing a surface keep their relative order
+                entries.sort(key=_texture_key)
+            drawn.extend(target.blits(entries))
+            entry_count += len(entries)
+            batch_count += 1
+            entries.clear()
+
+        self.last_entry_count = entry_count
+        self.last_batch_count = batch_count
+        return drawn
@@ -0,0 +1,71 @@
+# spatial_grid.py
+class SpatialGrid:
+    """Uniform spatial hash that buckets objects by the cell their center falls in"""
+
+    def __init__(self, cell_size):
+        self.cell_size = cell_size
+        self.cells = {}
+        # Remember which cell each object is stored in so moves can be incremental
+        self.object_cells = {}
+
+    def _cell_for(self, x, y):
+        """Get the cell key for a world position"""
+        return (int(x // self.cell_size), int(y // self.cell_size))
+
+    def clear(self):
+        """Remove every object from the grid"""
+        self.cells.clear()
+        self.object_cells.clear()
+
+    def insert(self, obj, x, y):
+        """Add an object to the grid at the given center position"""
+        cell = self._cell_for(x, y)
+        self.cells.setdefault(cell, []).append(obj)
+        self.object_cells[id(obj)] = cell
+
+    def remove(self, obj):
+        """Remove an object from the grid if it is stored"""
+        cell = self.object_cells.pop(id(obj), None)
+        if cell is None:
+            return
+
+        bucket = self.cells[cell]
+        bucket.remove(obj)
+        if not bucket:
+            del self.cells[cell]
+
+    def move(self, obj, x, y):
+        """Update an object's position, only touching buckets if it changed cell"""
+        cell = self._cell_for(x, y)
+        old_cell = self.object_cells.get(id(obj))
+        if old_cell == cell:
+            return
+
+        if old_cell is not None:
+            self.remove(obj)
+        self.cells.setdefault(cell, []).append(obj)
+        self.object_cells[id(obj)] = cell
+
+    def rebuild(self, objects):
+        """Re-bucket a full list of objects that expose x, y and size"""
+        self.clear()
+        for obj in objects:
+            self.insert(obj, obj.x + obj.size/2, obj.y + obj.size/2)
+
+    def query(self, x, y, radius):
+        """Get every object in the cells that overlap a circle around (x, y)"""
+        min_cx, min_cy = self._cell_for(x - radius, y - radius)
+        max_cx, max_cy = self._cell_for(x + radius, y + radius)
+
+        nearby = []
+        cells = self.cells
+        for cx in range(min_cx, max_cx + 1):
+            for cy in range(min_cy, max_cy + 1):
+                bucket = cells.get((cx, cy))
+                if bucket:
+                    nearby.extend(bucket)
+        return nearby
+
+    def __len__(self):
+        return len(self.object_cells)
+
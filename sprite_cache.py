@@ -0,0 +1,67 @@
+# sprite_cache.py
+from collections import OrderedDict
+import pygame
+from constants import SPRITE_CACHE_SIZE, SPRITE_ALPHA_LEVELS
+
+
+class CircleSpriteCache:
+    """LRU cache of pre-drawn translucent circles for fading effects
+
+    Sprites are keyed by (radius, color, alpha bucket); alpha is quantized to
+    alpha_levels buckets so effects fading every frame reuse a few sprites.
+    """
+
+    def __init__(self, max_entries=SPRITE_CACHE_SIZE, alpha_levels=SPRITE_ALPHA_LEVELS):
+        self.max_entries = max_entries
+        self.alpha_levels = alpha_levels
+        self.sprites = OrderedDict()
+
+        # Counters for tuning the quantization and cache size
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def __len__(self):
+        return len(self.sprites)
+
+    def clear(self):
+        """Drop every cached sprite"""
+        self.sprites.clear()
+
+    def reset_stats(self):
+        """Zero the hit, miss and eviction counters"""
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def alpha_bucket(self, alpha):
+        """Quantize an alpha value (0-255) to its bucket"""
+        return round(max(0, min(alpha, 255)) * (self.alpha_levels - 1) / 255)
+
+    def bucket_alpha(self, bucket):
+        """Get the alpha value a bucket is drawn with"""
+        return round(bucket * 255 / (self.alpha_levels - 1))
+
+    def get(self, radius, color, bucket):
+        """Get the sprite for a circle, drawing it on a miss"""
+        key = (radius, color, bucket)
+        sprite = self.sprites.get(key)
+        if sprite is not None:
+            self.hits += 1
+            self.sprites.move_to_end(key)
+            return sprite
+
+        self.misses += 1
+        sprite = pygame.Surface((radius * 2, radius * 2), pygame.SRCALPHA)
+        pygame.draw.circle(sprite, (*color[:3], self.bucket_alpha(bucket)), (radius, radius), radius)
+        self.sprites[key] = sprite
+
+        # Evict the least recently used sprite once over the limit
+        if len(self.sprites) > self.max_entries:
+            self.sprites.popitem(last=False)
+            self.evictions += 1
+        return sprite
+
+    def get_circle(self, radius, color, alpha):
+        """Get the sprite for a circle with an unquantized radius and alpha"""
+        return self.get(int(radius), tuple(color[:3]), self.alpha_bucket(alpha))
@@ -0,0 +1,74 @@
+# surface_format.py
+import pygame
+
+# RLE encoding happens on the first blit; until then only RLEACCELOK is set
+_RLE_FLAGS = pygame.RLEACCEL | getattr(pygame, "RLEACCELOK", 0)
+
+
+def display_ready():
+    """Check if a display mode is set, which convert() and convert_alpha() need"""
+    return pygame.display.get_init() and pygame.display.get_surface() is not None
+
+
+def display_formats():
+    """Get 1x1 (opaque, per-pixel alpha) surfaces in the formats the display blits fastest"""
+    return (pygame.Surface((1, 1)).convert(),
+            pygame.Surface((1, 1), pygame.SRCALPHA).convert_alpha())
+
+
+def _same_format(surface, reference):
+    return (surface.get_bitsize() == reference.get_bitsize() and
+            surface.get_masks() == reference.get_masks())
+
+
+def normalize_surface(surface, formats=None, rle=True):
+    """Get a surface in the display's pixel format, with RLE acceleration where it helps
+
+    Sprites with a color key or per-pixel alpha are RLE encoded, which skips
+    their transparent runs when blitting; leave rle off for surfaces that get
+    drawn into. Returns the same surface when it was already in the right format.
+    """
+    opaque_format, alpha_format = formats or display_formats()
+    has_alpha = surface.get_flags() & pygame.SRCALPHA
+    if has_alpha:
+        if not _same_format(surface, alpha_format):
+            surface = surface.convert_alpha()
+    elif not _same_format(surface, opaque_format):
+        # convert() keeps the color key
+        surface = surface.convert()
+
+    if rle and not surface.get_flags() & _RLE_FLAGS:
+        if has_alpha:
+            surface.set_alpha(surface.get_alpha(), pygame.RLEACCEL)
+        elif surface.get_colorkey() is not None:
+            surface.set_colorkey(surface.get_colorkey(), pygame.RLEACCEL)
+    return surface
+
+
+def describe_slow_format(surface, formats=None, rle=True):
+    """Say why a surface blits slower than it could, or None if it's fine"""
+    opaque_format, alpha_format = formats or display_formats()
+    has_alpha = surface.get_flags() & pygame.SRCALPHA
+    if not _same_format(surface, alpha_format if has_alpha else opaque_format):
+        return f"{surface.get_bitsize()}-bit {'alpha' if has_alpha else 'opaque'}, not in display format"
+    if rle and not surface.get_flags() & _RLE_FLAGS:
+        if has_alpha:
+            return "per-pixel alpha without RLE"
+        if surface.get_colorkey() is not None:
+            return "color key without RLE"
+    return None
+
+
+def find_slow_surfaces(named_surfaces, formats=None):
+    """List (name, size, reason) for surfaces in slow formats
+
+    named_surfaces is an iterable of (name, surface, rle) where rle says
+    whether the surface is a sprite that should be RLE encoded.
+    """
+    formats = formats or display_formats()
+    slow = []
+    for name, surface, rle in named_surfaces:
+        reason = describe_slow_format(surface, formats, rle)
+        if reason:
+            slow.append((name, surface.get_size(), reason))
+    return slow
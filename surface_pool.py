@@ -0,0 +1,57 @@
+# surface_pool.py
+import pygame
+from constants import SURFACE_POOL_MAX_FREE
+
+
+class SurfacePool:
+    """Hands out reusable scratch surfaces by (size, flags)
+
+    Surfaces from acquire() are only valid until end_frame(), which takes them
+    all back for the next frame.
+    """
+
+    def __init__(self, max_free=SURFACE_POOL_MAX_FREE):
+        self.max_free = max_free  # Spare surfaces kept per (size, flags)
+        self.free = {}  # (size, flags) -> [surfaces]
+        self.in_use = []  # (key, surface) handed out this frame
+
+        # New surfaces created, so steady-state frames can be checked for zero
+        self.frame_allocations = 0
+        self.last_frame_allocations = 0
+        self.total_allocations = 0
+
+    def acquire(self, size, flags=0):
+        """Get a cleared surface for use during this frame"""
+        key = ((int(size[0]), int(size[1])), flags)
+        spare = self.free.get(key)
+        if spare:
+            surface = spare.pop()
+            # Undo whatever the last user set up; per-pixel alpha surfaces
+            # stop blending entirely with set_alpha(None)
+            surface.set_alpha(255 if flags & pygame.SRCALPHA else None)
+            surface.set_colorkey(None)
+            surface.fill((0, 0, 0, 0))
+        else:
+            surface = pygame.Surface(key[0], flags)
+            self.frame_allocations += 1
+            self.total_allocations += 1
+
+        self.in_use.append((key, surface))
+        return surface
+
+    def end_frame(self):
+        """Take back every surface handed out this frame"""
+        for key, surface in self.in_use:
+            spare = self.free.get(key)
+            if spare is None:
+                spare = self.free[key] = []
+            if len(spare) < self.max_free:
+                spare.append(surface)
+        self.in_use = []
+
+        self.last_frame_allocations = self.frame_allocations
+        self.frame_allocations = 0
+
+    def clear(self):
+        """Drop every spare surface, e.g. after the display mode changes"""
+        self.free = {}
@@ -0,0 +1,72 @@
+# text_cache.py
+from collections import OrderedDict
+from constants import TEXT_CACHE_MAX_BYTES
+
+
+class TextCache:
+    """LRU cache of rendered text surfaces, bounded by their total pixel memory
+
+    Keyed by (font name, text, color, antialias) so each string is rasterized
+    once and reused every frame it stays on screen.
+    """
+
+    def __init__(self, max_bytes=TEXT_CACHE_MAX_BYTES):
+        self.max_bytes = max_bytes
+        self.surfaces = OrderedDict()  # Key -> (surface, size in bytes)
+        self.bytes = 0
+
+        # Counters for checking that menus and HUDs stop re-rendering
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def __len__(self):
+        return len(self.surfaces)
+
+    def clear(self):
+        """Drop every cached surface"""
+        self.surfaces.clear()
+        self.bytes = 0
+
+    def reset_stats(self):
+        """Zero the hit, miss and eviction counters"""
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def forget_font(self, font_name):
+        """Drop every surface rendered with a font, e.g. after it is reloaded"""
+        for key in [key for key in self.surfaces if key[0] == font_name]:
+            self.bytes -= self.surfaces.pop(key)[1]
+
+    def get(self, font_name, text, color, antialias=True):
+        """Get a cached text surface, or None if it hasn't been rendered yet"""
+        key = (font_name, text, tuple(color), antialias)
+        entry = self.surfaces.get(key)
+        if entry is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        self.surfaces.move_to_end(key)
+        return entry[0]
+
+    def add(self, font_name, text, color, antialias, surface):
+        """Cache a rendered text surface"""
+        size = surface.get_width() * surface.get_height() * surface.get_bytesize()
+
+        # A surface too big for the whole cache is never kept
+        if size > self.max_bytes:
+            return
+
+        key = (font_name, text, tuple(color), antialias)
+        old = self.surfaces.pop(key, None)
+        if old is not None:
+            self.bytes -= old[1]
+        self.surfaces[key] = (surface, size)
+        self.bytes += size
+
+        # Evict the least recently used surfaces until back under the limit
+        while self.bytes > self.max_bytes:
+            _, (_, evicted_size) = self.surfaces.popitem(last=False)
+            self.bytes -= evicted_size
+            self.evictions += 1
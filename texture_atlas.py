@@ -0,0 +1,201 @@
+# texture_atlas.py
+import pygame
+from constants import ATLAS_PAGE_SIZE, ATLAS_PADDING
+from surface_format import display_ready, normalize_surface
+
+
+def pack_rects(sizes, page_size, padding=ATLAS_PADDING):
+    """Place rects on pages by shelf packing, returning [(page, x, y)] in the order given
+
+    Rects go in tallest first, left to right along shelves (rows). A rect
+    goes on the first shelf with room, else starts a new shelf below the
+    last one, else starts a new page. padding is left between rects.
+    """
+    page_width, page_height = page_size
+    placements = [None] * len(sizes)
+    pages = []  # Per page: [next shelf y, [[shelf y, shelf height, next x], ...]]
+
+    order = sorted(range(len(sizes)), key=lambda index: (-sizes[index][1], -sizes[index][0]))
+    for index in order:
+        width, height = sizes[index]
+        if width > page_width or height > page_height:
+            raise ValueError(f"{width}x{height} rect doesn't fit a "
+                             f"{page_width}x{page_height} atlas page")
+
+        placement = None
+        for page_index, (_, shelves) in enumerate(pages):
+            # Shelves only get shorter, since rects come tallest first
+            for shelf in shelves:
+                if height <= shelf[1] and shelf[2] + width <= page_width:
+                    placement = (page_index, shelf[2], shelf[0])
+                    shelf[2] += width + padding
+                    break
+            if placement is not None:
+                break
+
+        if placement is None:
+            # Start a shelf on the first page with room below its shelves
+            for page_index, page in enumerate(pages):
+                if page[0] + height <= page_height:
+                    break
+            else:
+                pages.append([0, []])
+                page_index = len(pages) - 1
+            page = pages[page_index]
+            page[1].append([page[0], height, width + padding])
+            placement = (page_index, 0, page[0])
+            page[0] += height + padding
+
+        placements[index] = placement
+    return placements
+
+
+def slice_sheet(sheet, frame_size, count=None, margin=0, spacing=0):
+    """Cut a sprite sheet into frames, left to right and top to bottom
+
+    Frames are subsurfaces sharing the sheet's pixels. margin is the border
+    around the sheet and spacing the gap between frames; count stops early
+    on sheets whose last row isn't full.
+    """
+    frame_width, frame_height = frame_size
+    columns = (sheet.get_width() - 2 * margin + spacing) // (frame_width + spacing)
+    rows = (sheet.get_height() - 2 * margin + spacing) // (frame_height + spacing)
+    if columns <= 0 or rows <= 0:
+        raise ValueError(f"No {frame_width}x{frame_height} frames fit a "
+                         f"{sheet.get_width()}x{sheet.get_height()} sheet")
+
+    frames = []
+    for row in range(rows):
+        for column in range(columns):
+            if count is not None and len(frames) >= count:
+                return frames
+            frames.append(sheet.subsurface((margin + column * (frame_width + spacing),
+                                            margin + row * (frame_height + spacing),
+                                            frame_width, frame_height)))
+    return frames
+
+
+class AtlasRegion:
+    """A sprite's rect on an atlas page"""
+    __slots__ = ("name", "page", "rect", "_surface")
+
+    def __init__(self, name, page, rect):
+        self.name = name
+        self.page = page
+        self.rect = rect
+        self._surface = None
+
+    def get_size(self):
+        return self.rect.size
+
+    def blit_entry(self, position):
+        """Get a (page, position, area) entry for blits() or the render queue"""
+        return (self.page, position, self.rect)
+
+    @property
+    def surface(self):
+        """A subsurface sharing the page's pixels, for code that needs a plain surface"""
+        if self._surface is None:
+            self._surface = self.page.subsurface(self.rect)
+        return self._surface
+
+
+class TextureAtlas:
+    """Sprites packed onto a few large surfaces (pages), looked up by name
+
+    Opaque and transparent sprites go on separate pages, so opaque ones keep
+    blitting without alpha. Pages are never RLE encoded: blitting a region
+    out of an RLE surface means skipping through its encoded rows, and
+    subsurfaces of one are decoded on every blit.
+    """
+
+    def __init__(self, page_size=ATLAS_PAGE_SIZE, padding=ATLAS_PADDING):
+        self.page_size = page_size
+        self.padding = padding
+        self.pages = []
+        self.regions = {}  # Name -> AtlasRegion
+
+    def __contains__(self, name):
+        return name in self.regions
+
+    def __len__(self):
+        return len(self.regions)
+
+    def get(self, name):
+        """Get the region for a sprite, or None"""
+        return self.regions.get(name)
+
+    def build(self, surfaces):
+        """Pack a dict of name -> surface onto fresh pages, returning the regions"""
+        self.pages = []
+        self.regions = {}
+
+        opaque = {}
+        transparent = {}
+        for name, surface in surfaces.items():
+            if surface.get_flags() & pygame.SRCALPHA or surface.get_colorkey() is not None:
+                transparent[name] = surface
+            else:
+                opaque[name] = surface
+
+        self._build_pages(opaque, 0)
+        self._build_pages(transparent, pygame.SRCALPHA)
+        return self.regions
+
+    def _build_pages(self, surfaces, flags):
+        """Pack one group of sprites onto new pages of the given surface flags"""
+        if not surfaces:
+            return
+        names = list(surfaces)
+        placements = pack_rects([surfaces[name].get_size() for name in names],
+                                self.page_size, self.padding)
+
+        # Pages are cropped to what's packed on them, so the last one isn't mostly empty
+        extents = {}
+        for name, (page_index, x, y) in zip(names, placements):
+            width, height = surfaces[name].get_size()
+            right, bottom = extents.get(page_index, (0, 0))
+            extents[page_index] = (max(right, x + width), max(bottom, y + height))
+
+        pages = {}
+        for page_index, size in sorted(extents.items()):
+            page = pygame.Surface(size, flags)
+            if flags & pygame.SRCALPHA:
+                page.fill((0, 0, 0, 0))
+            pages[page_index] = page
+
+        for name, (page_index, x, y) in zip(names, placements):
+            surface = surfaces[name]
+            page = pages[page_index]
+            if not flags:
+                page.blit(surface, (x, y))
+                continue
+            if surface.get_colorkey() is not None and not surface.get_flags() & pygame.SRCALPHA:
+                # Turn the color key into transparent pixels first
+                keyed = pygame.Surface(surface.get_size(), pygame.SRCALPHA)
+                keyed.fill((0, 0, 0, 0))
+                keyed.blit(surface, (0, 0))
+                surface = keyed
+            # Onto a clear page, taking the max copies pixels and alpha exactly
+            page.blit(surface, (x, y), special_flags=pygame.BLEND_RGBA_MAX)
+
+        first_page = len(self.pages)
+        for page_index in sorted(pages):
+            page = pages[page_index]
+            if display_ready():
+                page = normalize_surface(page, rle=False)
+            self.pages.append(page)
+
+        for name, (page_index, x, y) in zip(names, placements):
+            self.regions[name] = AtlasRegion(name, self.pages[first_page + page_index],
+                                             pygame.Rect((x, y), surfaces[name].get_size()))
+
+    def page_bytes(self):
+        """Get the pixel memory used by every page"""
+        return sum(page.get_pitch() * page.get_height() for page in self.pages)
+
+    def fill_ratio(self):
+        """Get the share of page area covered by sprites"""
+        area = sum(page.get_width() * page.get_height() for page in self.pages)
+        used = sum(region.rect.width * region.rect.height for region in self.regions.values())
+        return used / area if area else 0.0
@@ -0,0 +1,116 @@
+# transform_cache.py
+import math
+from collections import OrderedDict
+import pygame
+from constants import TRANSFORM_CACHE_MAX_BYTES, TRANSFORM_ANGLE_STEPS
+from surface_format import display_ready, normalize_surface
+
+
+class TransformCache:
+    """LRU cache of scaled and rotated copies of source surfaces
+
+    Keyed by (source surface, size, angle bucket), so every sprite showing
+    the same image at the same size and rounded angle shares one surface.
+    Bounded by the total pixel memory of the cached copies.
+    """
+
+    def __init__(self, max_bytes=TRANSFORM_CACHE_MAX_BYTES, angle_steps=TRANSFORM_ANGLE_STEPS):
+        self.max_bytes = max_bytes
+        self.angle_steps = angle_steps  # Rotation buckets per full turn
+        self.surfaces = OrderedDict()  # Key -> (surface, size in bytes, source)
+        self.bytes = 0
+
+        # Counters for checking that spawns and facing changes reuse surfaces
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def __len__(self):
+        return len(self.surfaces)
+
+    def clear(self):
+        """Drop every cached surface"""
+        self.surfaces.clear()
+        self.bytes = 0
+
+    def reset_stats(self):
+        """Zero the hit, miss and eviction counters"""
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def forget(self, source):
+        """Drop every copy made from a source surface, e.g. after it is replaced"""
+        for key in [key for key in self.surfaces if key[0] == id(source)]:
+            self.bytes -= self.surfaces.pop(key)[1]
+
+    def angle_bucket(self, degrees):
+        """Round an angle in degrees to the nearest rotation bucket"""
+        return round(degrees * self.angle_steps / 360) % self.angle_steps
+
+    def bucket_degrees(self, bucket):
+        """Get the angle in degrees a rotation bucket is drawn at"""
+        return bucket * 360 / self.angle_steps
+
+    def get(self, source, size=None, degrees=0):
+        """Get source scaled to size (default: its own size) and rotated counterclockwise"""
+        size = source.get_size() if size is None else (int(size[0]), int(size[1]))
+        bucket = self.angle_bucket(degrees) if degrees else 0
+        if not bucket and size == source.get_size():
+            # Nothing to do, and no point caching the source itself
+            return source
+
+        # The id is only safe as a key while the entry keeps the source alive
+        key = (id(source), size, bucket)
+        entry = self.surfaces.get(key)
+        if entry is not None:
+            self.hits += 1
+            self.surfaces.move_to_end(key)
+            return entry[0]
+        self.misses += 1
+
+        surface = source
+        if size != source.get_size():
+            # Scale before rotating so each size is resampled from the original
+            surface = self.get(source, size) if bucket else pygame.transform.scale(source, size)
+        if bucket:
+            surface = pygame.transform.rotate(surface, self.bucket_degrees(bucket))
+        if display_ready():
+            # Copies are only ever blitted, so store them in the fastest format
+            surface = normalize_surface(surface)
+
+        self.add(key, surface, source)
+        return surface
+
+    def add(self, key, surface, source):
+        """Cache a transformed surface"""
+        size = surface.get_width() * surface.get_height() * surface.get_bytesize()
+
+        # A surface too big for the whole cache is never kept
+        if size > self.max_bytes:
+            return
+
+        old = self.surfaces.pop(key, None)
+        if old is not None:
+            self.bytes -= old[1]
+        self.surfaces[key] = (surface, size, source)
+        self.bytes += size
+
+        # Evict the least recently used surfaces until back under the limit
+        while self.bytes > self.max_bytes:
+            _, (_, evicted_size, _) = self.surfaces.popitem(last=False)
+            self.bytes -= evicted_size
+            self.evictions += 1
+
+
+# Shared by every sprite, so instances of one enemy type reuse the same surfaces
+transform_cache = TransformCache()
+
+
+def facing_degrees(direction, forward_degrees=-90):
+    """Get the counterclockwise rotation (degrees) that turns a sprite toward direction
+
+    Both are screen angles (y down): direction in radians, and forward_degrees
+    the way the sprite art faces, where -90 is up.
+    """
+    return forward_degrees - math.degrees(direction)
@@ -5,15 +5,22 @@ from constants import (
     BUTTON_TEXT_COLOR, WHITE
 )
 
+def render_text(font, text, color, assets=None):
+    """Render widget text, through the assets text cache when font is a font name"""
+    if assets is not None:
+        return assets.render_text(font, text, color)
+    return font.render(text, True, color)
+
 class Button:
     def __init__(self, x, y, width, height, text, font, 
                  normal_color=BUTTON_NORMAL_COLOR,
                  hover_color=BUTTON_HOVER_COLOR,
                  text_color=BUTTON_TEXT_COLOR,
-                 action=None):
+                 action=None, assets=None):
         self.rect = pygame.Rect(x, y, width, height)
         self.text = text
-        self.font = font
+        self.font = font  # Font name if assets is given, otherwise a pygame Font
+        self.assets = assets
         self.normal_color = normal_color
         self.hover_color = hover_color
         self.text_color = text_color
@@ -35,10 +42,18 @@ class Button:
         pygame.draw.rect(screen, WHITE, self.rect, 2)
         
         # Draw text
-        text_surf = self.font.render(self.text, True, self.text_color)
+        text_surf = render_text(self.font, self.text, self.text_color, self.assets)
         text_rect = text_surf.get_rect(center=self.rect.center)
         screen.blit(text_surf, text_rect)
         
+    def render_key(self):
+        """Get everything that affects how the button looks, to spot changes"""
+        return (self.text, self.is_hovered, tuple(self.rect))
+        
+    def get_rect(self):
+        """Get the area the button draws"""
+        return self.rect.copy()
+        
     def handle_event(self, event):
         """Handle mouse click events"""
         if event.type == pygame.MOUSEBUTTONDOWN:
@@ -47,19 +62,103 @@ class Button:
         return None
 
 class TextBox:
-    def __init__(self, x, y, text, font, color=WHITE):
+    def __init__(self, x, y, text, font, color=WHITE, assets=None):
         self.x = x
         self.y = y
         self.text = text
-        self.font = font
+        self.font = font  # Font name if assets is given, otherwise a pygame Font
         self.color = color
+        self.assets = assets
         
     def draw(self, screen):
         """Draw the text on the screen"""
-        text_surf = self.font.render(self.text, True, self.color)
+        text_surf = render_text(self.font, self.text, self.color, self.assets)
         text_rect = text_surf.get_rect(center=(self.x, self.y))
         screen.blit(text_surf, text_rect)
         
     def update_text(self, new_text):
         """Update the text content"""
         self.text = new_text
+        
+    def render_key(self):
+        """Get everything that affects how the text looks, to spot changes"""
+        return (self.text, tuple(self.color), self.x, self.y)
+        
+    def get_rect(self):
+        """Get the area the text draws"""
+        text_surf = render_text(self.font, self.text, self.color, self.assets)
+        return text_surf.get_rect(center=(self.x, self.y))
+
+class RetainedPanel:
+    """A mostly static screen kept composed on a cached surface
+    
+    Each refresh() redraws only the widgets whose render_key() changed since
+    the last one, so showing the screen costs one blit per frame.
+    """
+    def __init__(self, size, draw_background):
+        self.size = size
+        self.draw_background = draw_background  # Draws the backdrop onto a surface
+        self.widgets = []
+        self.surface = None
+        self.valid = False
+        self.keys = []  # Render key of each widget when last drawn
+        self.rects = []  # Area of each widget when last drawn
+        
+        # Widget redraws, for checking that idle frames draw nothing
+        self.redraw_count = 0
+        
+    def add(self, widget):
+        """Add a widget, drawn over the ones added before it"""
+        self.widgets.append(widget)
+        self.invalidate()
+        return widget
+        
+    def invalidate(self):
+        """Compose the whole panel again on the next refresh"""
+        self.valid = False
+        
+    def release(self):
+        """Drop the cached surface, e.g. after the display format changes"""
+        self.surface = None
+        self.valid = False
+        
+    def refresh(self):
+        """Bring the cached surface up to date and return the areas redrawn"""
+        if self.surface is None or not self.valid:
+            if self.surface is None or self.surface.get_size() != tuple(self.size):
+                self.surface = pygame.Surface(self.size)
+            self.draw_background(self.surface)
+            for widget in self.widgets:
+                widget.draw(self.surface)
+            self.keys = [widget.render_key() for widget in self.widgets]
+            self.rects = [widget.get_rect() for widget in self.widgets]
+            self.redraw_count += len(self.widgets)
+            self.valid = True
+            return [self.surface.get_rect()]
+        
+        # Areas to repaint: where changed widgets were and where they are now
+        dirty = []
+        for index, widget in enumerate(self.widgets):
+            key = widget.render_key()
+            if key != self.keys[index]:
+                rect = widget.get_rect()
+                dirty.append(rect.union(self.rects[index]))
+                self.keys[index] = key
+                self.rects[index] = rect
+        
+        # Repaint each area in full, so overlapping widgets keep their order
+        surface = self.surface
+        for area in dirty:
+            surface.set_clip(area)
+            self.draw_background(surface)
+            for index, widget in enumerate(self.widgets):
+                if self.rects[index].colliderect(area):
+                    widget.draw(surface)
+                    self.redraw_count += 1
+            surface.set_clip(None)
+        return dirty
+        
+    def draw(self, screen):
+        """Draw the panel, updating any changed widgets first"""
+        self.refresh()
+        return screen.blit(self.surface, (0, 0))